@@ -0,0 +1,54 @@
+"""add model change tracking
+
+Revision ID: 0195bc12ea15
+Revises: fcfa15c0c711
+Create Date: 2025-12-03 16:21:49.730412
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0195bc12ea15"
+down_revision = "fcfa15c0c711"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "model_dirty_cell",
+        sa.Column("change_id", sa.BigInteger(), nullable=False),
+        sa.Column("model_name", sa.Text(), nullable=False),
+        sa.Column("model_version", sa.Text(), nullable=False),
+        sa.Column("date_id", sa.Integer(), nullable=False),
+        sa.Column("dma_id", sa.Integer(), nullable=False),
+        sa.Column("platform_id", sa.Integer(), nullable=True),
+        sa.Column("source", sa.Text(), nullable=False),
+        sa.Column("detected_at", sa.DateTime(timezone=False), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("change_id", name="model_dirty_cell_pkey"),
+    )
+    op.create_index(
+        "ix_model_dirty_cell_model_dma",
+        "model_dirty_cell",
+        ["model_name", "model_version", "dma_id"],
+        unique=False,
+    )
+
+    op.create_table(
+        "model_run_watermark",
+        sa.Column("model_name", sa.Text(), nullable=False),
+        sa.Column("model_version", sa.Text(), nullable=False),
+        sa.Column("last_ingested_at", sa.DateTime(timezone=False), nullable=True),
+        sa.Column("last_log_id", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=False), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("model_name", "model_version", name="model_run_watermark_pk"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("model_run_watermark")
+    op.drop_index("ix_model_dirty_cell_model_dma", table_name="model_dirty_cell")
+    op.drop_table("model_dirty_cell")
@@ -0,0 +1,187 @@
+"""partition fact tables by month
+
+Revision ID: 2a504fd7abf4
+Revises: 342b49ac31e2
+Create Date: 2025-11-19 10:02:47.551930
+
+"""
+from __future__ import annotations
+
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "2a504fd7abf4"
+down_revision = "342b49ac31e2"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+FACT_INDEXES = {
+    "fact_marketing_daily": [
+        ("ix_fact_marketing_daily_platform_date", ["platform_id", "date_id"], "btree"),
+        ("ix_fact_marketing_daily_dma_date", ["dma_id", "date_id"], "btree"),
+        ("ix_fact_marketing_daily_campaign_date", ["campaign_id", "date_id"], "btree"),
+        ("brin_fact_marketing_daily_date", ["date_id"], "brin"),
+    ],
+    "fact_shopify_daily": [
+        ("ix_fact_shopify_daily_city_date", ["city_id", "date_id"], "btree"),
+        ("ix_fact_shopify_daily_region_date", ["region_id", "date_id"], "btree"),
+        ("brin_fact_shopify_daily_date", ["date_id"], "brin"),
+    ],
+}
+
+
+def _fact_marketing_daily_columns() -> list[sa.SchemaItem]:
+    return [
+        sa.Column("fact_id", sa.BigInteger(), nullable=False),
+        sa.Column("platform_id", sa.Integer(), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("campaign_id", sa.Integer(), nullable=False),
+        sa.Column("adset_id", sa.Integer(), nullable=False),
+        sa.Column("ad_id", sa.Integer(), nullable=False),
+        sa.Column("date_id", sa.Integer(), nullable=False),
+        sa.Column("attribution_id", sa.Integer(), nullable=True),
+        sa.Column("country_id", sa.Integer(), nullable=True),
+        sa.Column("region_id", sa.Integer(), nullable=True),
+        sa.Column("dma_id", sa.Integer(), nullable=True),
+        sa.Column("currency_code", sa.Text(), nullable=True),
+        sa.Column("spend", sa.Numeric(), nullable=True),
+        sa.Column("impressions", sa.BigInteger(), nullable=True),
+        sa.Column("clicks", sa.BigInteger(), nullable=True),
+        sa.Column("conversions", sa.BigInteger(), nullable=True),
+        sa.Column("conversion_value", sa.Numeric(), nullable=True),
+        sa.Column("video_view_time", sa.BigInteger(), nullable=True),
+        sa.Column("frequency", sa.Numeric(), nullable=True),
+        sa.Column("reach", sa.BigInteger(), nullable=True),
+        sa.Column("add_to_cart", sa.BigInteger(), nullable=True),
+        sa.ForeignKeyConstraint(["account_id"], ["dim_account.account_id"], name="fact_marketing_daily_account_id_fkey"),
+        sa.ForeignKeyConstraint(["ad_id"], ["dim_ad.ad_id"], name="fact_marketing_daily_ad_id_fkey"),
+        sa.ForeignKeyConstraint(["adset_id"], ["dim_adset_or_adgroup.adset_id"], name="fact_marketing_daily_adset_id_fkey"),
+        sa.ForeignKeyConstraint(
+            ["attribution_id"], ["dim_attribution.attribution_id"], name="fact_marketing_daily_attribution_id_fkey"
+        ),
+        sa.ForeignKeyConstraint(["campaign_id"], ["dim_campaign.campaign_id"], name="fact_marketing_daily_campaign_id_fkey"),
+        sa.ForeignKeyConstraint(["country_id"], ["dim_country.country_id"], name="fact_marketing_daily_country_id_fkey"),
+        sa.ForeignKeyConstraint(["date_id"], ["dim_date.date_id"], name="fact_marketing_daily_date_id_fkey"),
+        sa.ForeignKeyConstraint(["dma_id"], ["dim_dma.dma_id"], name="fact_marketing_daily_dma_id_fkey"),
+        sa.ForeignKeyConstraint(["platform_id"], ["dim_platform.platform_id"], name="fact_marketing_daily_platform_id_fkey"),
+        sa.ForeignKeyConstraint(["region_id"], ["dim_region.region_id"], name="fact_marketing_daily_region_id_fkey"),
+    ]
+
+
+def _fact_shopify_daily_columns() -> list[sa.SchemaItem]:
+    return [
+        sa.Column("fact_id", sa.BigInteger(), nullable=False),
+        sa.Column("date_id", sa.Integer(), nullable=False),
+        sa.Column("country_id", sa.Integer(), nullable=False),
+        sa.Column("region_id", sa.Integer(), nullable=False),
+        sa.Column("city_id", sa.Integer(), nullable=False),
+        sa.Column("postal_id", sa.Integer(), nullable=False),
+        sa.Column("currency_code", sa.Text(), nullable=True),
+        sa.Column("sessions", sa.BigInteger(), nullable=True),
+        sa.Column("orders", sa.BigInteger(), nullable=True),
+        sa.Column("revenue", sa.Numeric(), nullable=True),
+        sa.Column("add_to_cart", sa.BigInteger(), nullable=True),
+        sa.ForeignKeyConstraint(["city_id"], ["dim_city.city_id"], name="fact_shopify_daily_city_id_fkey"),
+        sa.ForeignKeyConstraint(["country_id"], ["dim_country.country_id"], name="fact_shopify_daily_country_id_fkey"),
+        sa.ForeignKeyConstraint(["date_id"], ["dim_date.date_id"], name="fact_shopify_daily_date_id_fkey"),
+        sa.ForeignKeyConstraint(["postal_id"], ["dim_postal.postal_id"], name="fact_shopify_daily_postal_id_fkey"),
+        sa.ForeignKeyConstraint(["region_id"], ["dim_region.region_id"], name="fact_shopify_daily_region_id_fkey"),
+    ]
+
+
+FACT_COLUMNS = {
+    "fact_marketing_daily": _fact_marketing_daily_columns,
+    "fact_shopify_daily": _fact_shopify_daily_columns,
+}
+
+
+def _add_months(year: int, month: int, months: int) -> tuple[int, int]:
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def _month_range(first: tuple[int, int], last: tuple[int, int]):
+    current = first
+    while current <= last:
+        yield current
+        current = _add_months(*current, 1)
+
+
+def _swap_in_legacy(table: str) -> None:
+    legacy = f"{table}_legacy"
+    for name, _columns, _using in FACT_INDEXES[table]:
+        op.drop_index(name, table_name=table, if_exists=True)
+    op.rename_table(table, legacy)
+    op.execute(f"ALTER INDEX {table}_pkey RENAME TO {legacy}_pkey")
+    op.execute(f"ALTER SEQUENCE {table}_fact_id_seq OWNED BY NONE")
+
+
+def _drop_legacy(table: str) -> None:
+    op.execute(f"INSERT INTO {table} SELECT * FROM {table}_legacy")
+    op.drop_table(f"{table}_legacy")
+    op.execute(f"ALTER SEQUENCE {table}_fact_id_seq OWNED BY {table}.fact_id")
+    for name, columns, using in FACT_INDEXES[table]:
+        op.create_index(name, table, columns, unique=False, postgresql_using=using)
+
+
+def _partition_table(table: str) -> None:
+    _swap_in_legacy(table)
+    op.create_table(
+        table,
+        *FACT_COLUMNS[table](),
+        sa.PrimaryKeyConstraint("fact_id", "date_id", name=f"{table}_pkey"),
+        postgresql_partition_by="RANGE (date_id)",
+    )
+    op.execute(
+        f"ALTER TABLE {table} ALTER COLUMN fact_id"
+        f" SET DEFAULT nextval('{table}_fact_id_seq'::regclass)"
+    )
+
+    # Cover every month already present in the legacy heap plus a few ahead.
+    today = date.today()
+    first = (today.year, today.month)
+    last = _add_months(today.year, today.month, MONTHS_AHEAD)
+    oldest, newest = op.get_bind().execute(
+        sa.text(f"SELECT min(date_id), max(date_id) FROM {table}_legacy")
+    ).one()
+    if oldest is not None:
+        first = min(first, (oldest // 10000, oldest // 100 % 100))
+        last = max(last, (newest // 10000, newest // 100 % 100))
+    for year, month in _month_range(first, last):
+        next_year, next_month = _add_months(year, month, 1)
+        op.execute(
+            f"CREATE TABLE {table}_p{year:04d}{month:02d} PARTITION OF {table}"
+            f" FOR VALUES FROM ({year * 10000 + month * 100 + 1})"
+            f" TO ({next_year * 10000 + next_month * 100 + 1})"
+        )
+
+    _drop_legacy(table)
+
+
+def _unpartition_table(table: str) -> None:
+    _swap_in_legacy(table)
+    op.create_table(
+        table,
+        *FACT_COLUMNS[table](),
+        sa.PrimaryKeyConstraint("fact_id", name=f"{table}_pkey"),
+    )
+    op.execute(
+        f"ALTER TABLE {table} ALTER COLUMN fact_id"
+        f" SET DEFAULT nextval('{table}_fact_id_seq'::regclass)"
+    )
+    _drop_legacy(table)
+
+
+def upgrade() -> None:
+    for table in FACT_COLUMNS:
+        _partition_table(table)
+
+
+def downgrade() -> None:
+    for table in FACT_COLUMNS:
+        _unpartition_table(table)
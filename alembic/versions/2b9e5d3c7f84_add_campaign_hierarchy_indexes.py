@@ -0,0 +1,33 @@
+"""add campaign hierarchy indexes
+
+Revision ID: 2b9e5d3c7f84
+Revises: a41c8e27d5f9
+Create Date: 2025-12-22 11:08:36.904715
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "2b9e5d3c7f84"
+down_revision = "a41c8e27d5f9"
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns) — (parent id, id) pairs serve keyset pages under a parent.
+HIERARCHY_INDEXES = [
+    ("ix_dim_campaign_account_campaign", "dim_campaign", ["account_id", "campaign_id"]),
+    ("ix_dim_adset_campaign_adset", "dim_adset_or_adgroup", ["campaign_id", "adset_id"]),
+    ("ix_dim_ad_adset_ad", "dim_ad", ["adset_id", "ad_id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in HIERARCHY_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(HIERARCHY_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,76 @@
+"""enforce yyyymmdd date keys
+
+Revision ID: 342b49ac31e2
+Revises: d939f7d10a90
+Create Date: 2026-01-08 10:17:42.630915
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "342b49ac31e2"
+down_revision = "d939f7d10a90"
+branch_labels = None
+depends_on = None
+
+# The fact partitions, rollups and every date window assume ``date_id`` is the
+# ``yyyymmdd`` rendering of ``date_actual``; this migration makes that true and
+# keeps it true. ``extract`` on a date is immutable, unlike ``to_char``.
+SMART_KEY = (
+    "(extract(year FROM date_actual) * 10000 + extract(month FROM date_actual) * 100"
+    " + extract(day FROM date_actual))::integer"
+)
+CHECK_NAME = "ck_dim_date_date_id_yyyymmdd"
+
+
+def _rekey(bind: sa.engine.Connection) -> None:
+    """Rewrite surrogate ``date_id`` values, and every foreign key pointing at them, to ``yyyymmdd``."""
+
+    references = bind.execute(
+        sa.text(
+            "SELECT c.conname, c.conrelid::regclass::text, a.attname, pg_get_constraintdef(c.oid)"
+            " FROM pg_constraint c"
+            " JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1]"
+            " WHERE c.contype = 'f' AND c.confrelid = 'dim_date'::regclass"
+        )
+    ).all()
+    op.execute(
+        "CREATE TEMP TABLE tmp_date_id_map ON COMMIT DROP AS"
+        f" SELECT date_id AS old_id, {SMART_KEY} AS new_id FROM dim_date WHERE date_id <> {SMART_KEY}"
+    )
+    for name, table, _column, _definition in references:
+        op.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"')
+    for _name, table, column, _definition in references:
+        op.execute(
+            f'UPDATE {table} AS t SET "{column}" = m.new_id'
+            f' FROM tmp_date_id_map m WHERE t."{column}" = m.old_id'
+        )
+    op.execute("UPDATE dim_date AS d SET date_id = m.new_id FROM tmp_date_id_map m WHERE d.date_id = m.old_id")
+    for name, table, _column, definition in references:
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition}')
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    duplicates = bind.execute(
+        sa.text("SELECT date_actual FROM dim_date GROUP BY date_actual HAVING count(*) > 1 ORDER BY 1 LIMIT 5")
+    ).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            "dim_date has several rows for the same day (e.g. "
+            + ", ".join(day.isoformat() for day in duplicates)
+            + "); merge them before converting date_id to yyyymmdd keys."
+        )
+
+    mismatched = bind.execute(sa.text(f"SELECT count(*) FROM dim_date WHERE date_id <> {SMART_KEY}")).scalar_one()
+    if mismatched:
+        _rekey(bind)
+    op.create_check_constraint(CHECK_NAME, "dim_date", f"date_id = {SMART_KEY}")
+
+
+def downgrade() -> None:
+    # Keys stay in yyyymmdd form; only the guarantee is dropped.
+    op.drop_constraint(CHECK_NAME, "dim_date", type_="check")
@@ -0,0 +1,25 @@
+"""track map_city_dma version
+
+Revision ID: 4e8a2c6f1b93
+Revises: 71b2e4c9d0a8
+Create Date: 2026-01-11 10:22:37.516204
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4e8a2c6f1b93"
+down_revision = "71b2e4c9d0a8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Backs the interval index of app.services.geo_allocation_service.
+    op.execute("SELECT track_table_version('map_city_dma')")
+
+
+def downgrade() -> None:
+    op.execute("SELECT untrack_table_version('map_city_dma')")
@@ -0,0 +1,45 @@
+"""add export job table
+
+Revision ID: 5c1e9a7f3b20
+Revises: b04e1a1dd137
+Create Date: 2025-12-12 09:21:40.518204
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "5c1e9a7f3b20"
+down_revision = "b04e1a1dd137"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "export_job",
+        sa.Column("job_id", sa.Text(), nullable=False),
+        sa.Column("dataset", sa.Text(), nullable=False),
+        sa.Column("format", sa.Text(), nullable=False),
+        sa.Column("gzip", sa.Boolean(), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=False),
+        sa.Column("status", sa.Text(), server_default=sa.text("'pending'"), nullable=False),
+        sa.Column("s3_bucket", sa.Text(), nullable=True),
+        sa.Column("s3_key", sa.Text(), nullable=True),
+        sa.Column("bytes_written", sa.BigInteger(), nullable=True),
+        sa.Column("parts_uploaded", sa.BigInteger(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=False), server_default=sa.text("now()"), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=False), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=False), nullable=True),
+        sa.PrimaryKeyConstraint("job_id", name="export_job_pkey"),
+    )
+    op.create_index("ix_export_job_status_created", "export_job", ["status", "created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_export_job_status_created", table_name="export_job")
+    op.drop_table("export_job")
@@ -0,0 +1,54 @@
+"""add model run
+
+Revision ID: 5c1f7a9e2b64
+Revises: e7dad1c9bb51
+Create Date: 2026-01-09 14:05:31.772809
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "5c1f7a9e2b64"
+down_revision = "e7dad1c9bb51"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "model_run",
+        sa.Column("run_id", sa.BigInteger(), nullable=False),
+        sa.Column("model_name", sa.Text(), nullable=False),
+        sa.Column("model_version", sa.Text(), nullable=False),
+        sa.Column("start_date_id", sa.Integer(), nullable=False),
+        sa.Column("end_date_id", sa.Integer(), nullable=False),
+        sa.Column("platforms", sa.Integer(), nullable=False),
+        sa.Column("dmas", sa.Integer(), nullable=False),
+        sa.Column("days", sa.Integer(), nullable=False),
+        sa.Column("workers", sa.Integer(), nullable=False),
+        sa.Column("rows_written", sa.BigInteger(), nullable=False),
+        sa.Column("fit_seconds", sa.Numeric(), nullable=False),
+        sa.Column(
+            "shard_timings",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default=sa.text("'[]'::jsonb"),
+            nullable=False,
+        ),
+        sa.Column("finished_at", sa.DateTime(timezone=False), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("run_id", name="model_run_pkey"),
+    )
+    op.create_index(
+        "ix_model_run_model_finished",
+        "model_run",
+        ["model_name", "model_version", "finished_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_model_run_model_finished", table_name="model_run")
+    op.drop_table("model_run")
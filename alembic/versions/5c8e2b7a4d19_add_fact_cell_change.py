@@ -0,0 +1,39 @@
+"""add fact cell change log
+
+Revision ID: 5c8e2b7a4d19
+Revises: 9a4c7e1d2f60
+Create Date: 2026-01-13 10:42:07.218354
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "5c8e2b7a4d19"
+down_revision = "9a4c7e1d2f60"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fact_cell_change",
+        sa.Column("change_id", sa.BigInteger(), nullable=False),
+        sa.Column("log_id", sa.BigInteger(), nullable=False),
+        sa.Column("platform_id", sa.Integer(), nullable=False),
+        sa.Column("date_id", sa.Integer(), nullable=False),
+        sa.Column("dma_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("change_id", name="fact_cell_change_pkey"),
+    )
+    op.create_index("ix_fact_cell_change_log", "fact_cell_change", ["log_id"], unique=False)
+    op.create_index(
+        "ix_stg_shopify_daily_city_ingested_at", "stg_shopify_daily_city", ["_ingested_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stg_shopify_daily_city_ingested_at", table_name="stg_shopify_daily_city")
+    op.drop_index("ix_fact_cell_change_log", table_name="fact_cell_change")
+    op.drop_table("fact_cell_change")
@@ -0,0 +1,27 @@
+"""add export job heartbeat
+
+Revision ID: 71b2e4c9d0a8
+Revises: a3d86e0f4c17
+Create Date: 2026-01-10 15:47:12.904551
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "71b2e4c9d0a8"
+down_revision = "a3d86e0f4c17"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("export_job", sa.Column("heartbeat_at", sa.DateTime(timezone=False), nullable=True))
+    # Jobs left running before the upgrade have no heartbeat; treat their start as one.
+    op.execute("UPDATE export_job SET heartbeat_at = started_at WHERE status = 'running'")
+
+
+def downgrade() -> None:
+    op.drop_column("export_job", "heartbeat_at")
@@ -0,0 +1,32 @@
+"""add map city dma window index
+
+Revision ID: 7d2f6b9e4a13
+Revises: e3a8c4d6b1f7
+Create Date: 2025-12-18 10:42:11.508317
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7d2f6b9e4a13"
+down_revision = "e3a8c4d6b1f7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves city + date window lookups; dma_id and dma_share are included so
+    # allocation joins are index-only.
+    op.create_index(
+        "ix_map_city_dma_city_window",
+        "map_city_dma",
+        ["city_id", "effective_start_date", "effective_end_date"],
+        unique=False,
+        postgresql_include=["dma_id", "dma_share"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_map_city_dma_city_window", table_name="map_city_dma")
@@ -0,0 +1,37 @@
+"""add default fact partitions
+
+Revision ID: 8f0c7e18803d
+Revises: 2b9e5d3c7f84
+Create Date: 2026-01-08 11:02:19.384467
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "8f0c7e18803d"
+down_revision = "2b9e5d3c7f84"
+branch_labels = None
+depends_on = None
+
+FACT_TABLES = ("fact_marketing_daily", "fact_shopify_daily")
+
+
+def upgrade() -> None:
+    # Rows for months without a partition land here instead of failing the
+    # insert; partition maintenance moves them into their month later.
+    for table in FACT_TABLES:
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for table in FACT_TABLES:
+        if bind.execute(sa.text(f"SELECT EXISTS (SELECT 1 FROM {table}_default)")).scalar_one():
+            raise RuntimeError(
+                f"{table}_default still holds rows; run partition maintenance to move them"
+                " into monthly partitions before downgrading."
+            )
+        op.execute(f"DROP TABLE {table}_default")
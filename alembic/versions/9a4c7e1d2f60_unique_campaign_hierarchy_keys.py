@@ -0,0 +1,96 @@
+"""unique campaign hierarchy keys
+
+Revision ID: 9a4c7e1d2f60
+Revises: d2a7c5e9f316
+Create Date: 2026-01-12 09:14:26.380517
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9a4c7e1d2f60"
+down_revision = "d2a7c5e9f316"
+branch_labels = None
+depends_on = None
+
+# (table, key column, parent column, external id column, referencing (table, column) pairs), parents first.
+HIERARCHY = (
+    (
+        "dim_campaign",
+        "campaign_id",
+        "account_id",
+        "external_campaign_id",
+        (
+            ("dim_adset_or_adgroup", "campaign_id"),
+            ("fact_marketing_daily", "campaign_id"),
+            ("agg_marketing_weekly", "campaign_id"),
+            ("agg_marketing_monthly", "campaign_id"),
+        ),
+    ),
+    (
+        "dim_adset_or_adgroup",
+        "adset_id",
+        "campaign_id",
+        "external_adset_id",
+        (("dim_ad", "adset_id"), ("fact_marketing_daily", "adset_id")),
+    ),
+    ("dim_ad", "ad_id", "adset_id", "external_ad_id", (("fact_marketing_daily", "ad_id"),)),
+)
+
+UNIQUE_INDEXES = (
+    ("ux_dim_campaign_account_external", "dim_campaign", ["account_id", "external_campaign_id"]),
+    ("ux_dim_adset_campaign_external", "dim_adset_or_adgroup", ["campaign_id", "external_adset_id"]),
+    ("ux_dim_ad_adset_external", "dim_ad", ["adset_id", "external_ad_id"]),
+)
+
+# Columns identifying a fact row's grain; rows sharing all of them are duplicates.
+FACT_GRAIN = (
+    "platform_id",
+    "account_id",
+    "campaign_id",
+    "adset_id",
+    "ad_id",
+    "date_id",
+    "attribution_id",
+    "country_id",
+    "region_id",
+    "dma_id",
+    "currency_code",
+)
+
+
+def upgrade() -> None:
+    # Concurrent syncs could insert the same campaign, ad set or ad twice.
+    # Fold every duplicate into its lowest id, children and facts included,
+    # before the keys become unique. Merging campaigns can duplicate their
+    # ad sets (and those their ads), hence parents first.
+    for table, key, parent, external, references in HIERARCHY:
+        op.execute(
+            f"CREATE TEMP TABLE merge_{table} ON COMMIT DROP AS"
+            f" SELECT {key} AS dup_id, min({key}) OVER (PARTITION BY {parent}, {external}) AS keep_id"
+            f" FROM {table} WHERE {external} IS NOT NULL"
+        )
+        op.execute(f"DELETE FROM merge_{table} WHERE dup_id = keep_id")
+        for ref_table, ref_column in references:
+            op.execute(
+                f"UPDATE {ref_table} r SET {ref_column} = m.keep_id"
+                f" FROM merge_{table} m WHERE r.{ref_column} = m.dup_id"
+            )
+        op.execute(f"DELETE FROM {table} t USING merge_{table} m WHERE t.{key} = m.dup_id")
+
+    # Facts written through duplicate dimensions were multiplied; keep one per grain.
+    same_grain = " AND ".join(f"d.{column} IS NOT DISTINCT FROM k.{column}" for column in FACT_GRAIN)
+    op.execute(
+        "DELETE FROM fact_marketing_daily d USING fact_marketing_daily k"
+        f" WHERE d.ad_id IN (SELECT keep_id FROM merge_dim_ad) AND {same_grain} AND k.fact_id < d.fact_id"
+    )
+
+    for name, table, columns in UNIQUE_INDEXES:
+        op.create_index(name, table, columns, unique=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(UNIQUE_INDEXES):
+        op.drop_index(name, table_name=table)
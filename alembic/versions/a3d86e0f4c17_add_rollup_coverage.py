@@ -0,0 +1,34 @@
+"""add rollup coverage
+
+Revision ID: a3d86e0f4c17
+Revises: 5c1f7a9e2b64
+Create Date: 2026-01-10 10:22:07.516334
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a3d86e0f4c17"
+down_revision = "5c1f7a9e2b64"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Starts empty: dashboards keep reading the daily facts until the rollups
+    # are backfilled (app.tasks.maintenance.backfill_rollups) or refreshed.
+    op.create_table(
+        "rollup_coverage",
+        sa.Column("grain", sa.Text(), nullable=False),
+        sa.Column("start_date_id", sa.Integer(), nullable=False),
+        sa.Column("end_date_id", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=False), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("grain", name="rollup_coverage_pkey"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rollup_coverage")
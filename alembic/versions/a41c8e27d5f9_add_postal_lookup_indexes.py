@@ -0,0 +1,41 @@
+"""add postal lookup indexes
+
+Revision ID: a41c8e27d5f9
+Revises: 7d2f6b9e4a13
+Create Date: 2025-12-19 14:27:53.162840
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a41c8e27d5f9"
+down_revision = "7d2f6b9e4a13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_map_postal_city_state_postal_code",
+        "map_postal_city_state",
+        ["postal_code"],
+        unique=False,
+    )
+    # Keeps the city_id backfill to the rows still unresolved.
+    op.create_index(
+        "ix_map_postal_city_state_unresolved",
+        "map_postal_city_state",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("city_id IS NULL"),
+    )
+    op.create_index("ix_dim_postal_city_code", "dim_postal", ["city_id", "postal_code"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dim_postal_city_code", table_name="dim_postal")
+    op.drop_index("ix_map_postal_city_state_unresolved", table_name="map_postal_city_state")
+    op.drop_index("ix_map_postal_city_state_postal_code", table_name="map_postal_city_state")
@@ -0,0 +1,47 @@
+"""add marketing rollup tables
+
+Revision ID: b04e1a1dd137
+Revises: 0195bc12ea15
+Create Date: 2025-12-10 11:48:13.092657
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "b04e1a1dd137"
+down_revision = "0195bc12ea15"
+branch_labels = None
+depends_on = None
+
+ROLLUP_TABLES = ("agg_marketing_weekly", "agg_marketing_monthly")
+
+
+def upgrade() -> None:
+    for table in ROLLUP_TABLES:
+        op.create_table(
+            table,
+            sa.Column("rollup_id", sa.BigInteger(), nullable=False),
+            sa.Column("period_start_id", sa.Integer(), nullable=False),
+            sa.Column("period_end_id", sa.Integer(), nullable=False),
+            sa.Column("platform_id", sa.Integer(), nullable=False),
+            sa.Column("campaign_id", sa.Integer(), nullable=False),
+            sa.Column("dma_id", sa.Integer(), nullable=True),
+            sa.Column("spend", sa.Numeric(), nullable=True),
+            sa.Column("impressions", sa.BigInteger(), nullable=True),
+            sa.Column("clicks", sa.BigInteger(), nullable=True),
+            sa.Column("conversions", sa.BigInteger(), nullable=True),
+            sa.Column("conversion_value", sa.Numeric(), nullable=True),
+            sa.PrimaryKeyConstraint("rollup_id", name=f"{table}_pkey"),
+        )
+        op.create_index(f"ix_{table}_period_platform", table, ["period_start_id", "platform_id"], unique=False)
+        op.create_index(f"ix_{table}_dma_period", table, ["dma_id", "period_start_id"], unique=False)
+
+
+def downgrade() -> None:
+    for table in reversed(ROLLUP_TABLES):
+        op.drop_index(f"ix_{table}_dma_period", table_name=table)
+        op.drop_index(f"ix_{table}_period_platform", table_name=table)
+        op.drop_table(table)
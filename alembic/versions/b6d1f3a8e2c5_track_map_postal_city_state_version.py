@@ -0,0 +1,25 @@
+"""track map_postal_city_state version
+
+Revision ID: b6d1f3a8e2c5
+Revises: 4e8a2c6f1b93
+Create Date: 2026-01-11 14:05:48.271930
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b6d1f3a8e2c5"
+down_revision = "4e8a2c6f1b93"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Backs the postal index of app.services.postal_resolution_service.
+    op.execute("SELECT track_table_version('map_postal_city_state')")
+
+
+def downgrade() -> None:
+    op.execute("SELECT untrack_table_version('map_postal_city_state')")
@@ -0,0 +1,29 @@
+"""track metric availability versions
+
+Revision ID: d2a7c5e9f316
+Revises: b6d1f3a8e2c5
+Create Date: 2026-01-11 16:38:19.604327
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d2a7c5e9f316"
+down_revision = "b6d1f3a8e2c5"
+branch_labels = None
+depends_on = None
+
+# Tables behind app.repositories.metric_availability.MetricAvailabilityCache.
+TRACKED_TABLES = ("metric_availability", "dim_platform")
+
+
+def upgrade() -> None:
+    for table in TRACKED_TABLES:
+        op.execute(f"SELECT track_table_version('{table}')")
+
+
+def downgrade() -> None:
+    for table in TRACKED_TABLES:
+        op.execute(f"SELECT untrack_table_version('{table}')")
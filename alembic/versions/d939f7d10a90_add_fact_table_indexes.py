@@ -0,0 +1,53 @@
+"""add fact table indexes
+
+Revision ID: d939f7d10a90
+Revises: db000f00160b
+Create Date: 2025-11-12 09:14:32.418205
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d939f7d10a90"
+down_revision = "db000f00160b"
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns, access method)
+FACT_INDEXES = [
+    ("ix_fact_marketing_daily_platform_date", "fact_marketing_daily", ["platform_id", "date_id"], "btree"),
+    ("ix_fact_marketing_daily_dma_date", "fact_marketing_daily", ["dma_id", "date_id"], "btree"),
+    ("ix_fact_marketing_daily_campaign_date", "fact_marketing_daily", ["campaign_id", "date_id"], "btree"),
+    ("brin_fact_marketing_daily_date", "fact_marketing_daily", ["date_id"], "brin"),
+    ("ix_fact_shopify_daily_city_date", "fact_shopify_daily", ["city_id", "date_id"], "btree"),
+    ("ix_fact_shopify_daily_region_date", "fact_shopify_daily", ["region_id", "date_id"], "btree"),
+    ("brin_fact_shopify_daily_date", "fact_shopify_daily", ["date_id"], "brin"),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns, using in FACT_INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_using=using,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _columns, _using in reversed(FACT_INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
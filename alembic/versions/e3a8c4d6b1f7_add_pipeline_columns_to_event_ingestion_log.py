@@ -0,0 +1,36 @@
+"""add pipeline columns to event ingestion log
+
+Revision ID: e3a8c4d6b1f7
+Revises: 5c1e9a7f3b20
+Create Date: 2025-12-15 16:05:27.341982
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "e3a8c4d6b1f7"
+down_revision = "5c1e9a7f3b20"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("event_ingestion_log", sa.Column("run_id", sa.Text(), nullable=True))
+    op.add_column("event_ingestion_log", sa.Column("step", sa.Text(), nullable=True))
+    op.add_column("event_ingestion_log", sa.Column("date_id", sa.Integer(), nullable=True))
+    op.create_index(
+        "ix_event_ingestion_log_run_step",
+        "event_ingestion_log",
+        ["run_id", "step", "platform_id", "date_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_ingestion_log_run_step", table_name="event_ingestion_log")
+    op.drop_column("event_ingestion_log", "date_id")
+    op.drop_column("event_ingestion_log", "step")
+    op.drop_column("event_ingestion_log", "run_id")
@@ -0,0 +1,105 @@
+"""add table version tracking
+
+Revision ID: e7dad1c9bb51
+Revises: 8f0c7e18803d
+Create Date: 2026-01-09 09:36:52.118046
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "e7dad1c9bb51"
+down_revision = "8f0c7e18803d"
+branch_labels = None
+depends_on = None
+
+# Dimensions behind app.repositories.dimension_cache.DimensionCache.
+TRACKED_TABLES = ("dim_account", "dim_campaign", "map_platform_dma", "dim_dma")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "table_version",
+        sa.Column("table_name", sa.Text(), nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.Column("rewrite_version", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=False), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("table_name", name="table_version_pkey"),
+    )
+
+    # Statement-level triggers bump the table's row in the writing transaction,
+    # so the counters are transactional and replicate with the data they
+    # describe. ``version`` moves on every change, ``rewrite_version`` only on
+    # updates, deletes and truncates. Statements that touched no rows are
+    # skipped so no-op upserts do not serialise on the version row.
+    op.execute(
+        """
+        CREATE FUNCTION bump_table_version() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            -- Nested so truncate triggers, which have no transition table,
+            -- never plan the query over ``changed_rows``.
+            IF TG_OP <> 'TRUNCATE' THEN
+                IF NOT EXISTS (SELECT 1 FROM changed_rows) THEN
+                    RETURN NULL;
+                END IF;
+            END IF;
+            INSERT INTO table_version AS v (table_name, version, rewrite_version)
+            VALUES (TG_TABLE_NAME, 1, CASE WHEN TG_OP = 'INSERT' THEN 0 ELSE 1 END)
+            ON CONFLICT (table_name) DO UPDATE
+            SET version = v.version + 1,
+                rewrite_version = v.rewrite_version + EXCLUDED.rewrite_version,
+                updated_at = now();
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    # Transition tables allow one event per trigger, hence four per table.
+    op.execute(
+        """
+        CREATE FUNCTION track_table_version(tbl regclass) RETURNS void LANGUAGE plpgsql AS $$
+        DECLARE
+            name text := (SELECT relname FROM pg_class WHERE oid = tbl);
+        BEGIN
+            EXECUTE format('CREATE TRIGGER %I AFTER INSERT ON %s REFERENCING NEW TABLE AS changed_rows'
+                           ' FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()', name || '_version_ins', tbl);
+            EXECUTE format('CREATE TRIGGER %I AFTER UPDATE ON %s REFERENCING NEW TABLE AS changed_rows'
+                           ' FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()', name || '_version_upd', tbl);
+            EXECUTE format('CREATE TRIGGER %I AFTER DELETE ON %s REFERENCING OLD TABLE AS changed_rows'
+                           ' FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()', name || '_version_del', tbl);
+            EXECUTE format('CREATE TRIGGER %I AFTER TRUNCATE ON %s'
+                           ' FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()', name || '_version_trunc', tbl);
+            INSERT INTO table_version (table_name) VALUES (name) ON CONFLICT DO NOTHING;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION untrack_table_version(tbl regclass) RETURNS void LANGUAGE plpgsql AS $$
+        DECLARE
+            name text := (SELECT relname FROM pg_class WHERE oid = tbl);
+            suffix text;
+        BEGIN
+            FOREACH suffix IN ARRAY ARRAY['ins', 'upd', 'del', 'trunc'] LOOP
+                EXECUTE format('DROP TRIGGER IF EXISTS %I ON %s', name || '_version_' || suffix, tbl);
+            END LOOP;
+            DELETE FROM table_version WHERE table_name = name;
+        END
+        $$
+        """
+    )
+    for table in TRACKED_TABLES:
+        op.execute(f"SELECT track_table_version('{table}')")
+
+
+def downgrade() -> None:
+    for table in TRACKED_TABLES:
+        op.execute(f"SELECT untrack_table_version('{table}')")
+    op.execute("DROP FUNCTION untrack_table_version(regclass)")
+    op.execute("DROP FUNCTION track_table_version(regclass)")
+    op.execute("DROP FUNCTION bump_table_version()")
+    op.drop_table("table_version")
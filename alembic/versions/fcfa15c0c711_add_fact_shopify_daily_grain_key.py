@@ -0,0 +1,29 @@
+"""add fact_shopify_daily grain key
+
+Revision ID: fcfa15c0c711
+Revises: 2a504fd7abf4
+Create Date: 2025-11-26 14:37:05.206118
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "fcfa15c0c711"
+down_revision = "2a504fd7abf4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Natural key for the staging promotion upsert; includes the partition key.
+    op.create_unique_constraint(
+        "ux_fact_shopify_daily_grain",
+        "fact_shopify_daily",
+        ["date_id", "city_id", "postal_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("ux_fact_shopify_daily_grain", "fact_shopify_daily", type_="unique")
@@ -0,0 +1,39 @@
+"""Shared FastAPI dependencies."""
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError
+
+from app.core.security import decode_access_token
+from app.schemas.auth import CurrentUser
+
+_bearer = HTTPBearer(auto_error=False)
+
+_UNAUTHORIZED = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials.",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(_bearer),
+) -> CurrentUser:
+    """Authenticate the request from its bearer token alone.
+
+    Identity and ``is_active`` come from the token claims (verified once, then
+    served from the claims cache), so no user row is loaded per request.
+    Deactivation therefore takes effect when the user's current token expires.
+    """
+
+    if credentials is None:
+        raise _UNAUTHORIZED
+    try:
+        claims = decode_access_token(credentials.credentials)
+        # Claims were signed by us, so skip re-validating them on every request.
+        user = CurrentUser.model_construct(id=int(claims["sub"]), email=claims["email"], is_active=claims["act"])
+    except (JWTError, KeyError, ValueError):
+        raise _UNAUTHORIZED from None
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user.")
+    return user
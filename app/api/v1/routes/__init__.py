@@ -1,5 +1,5 @@
 """Version 1 route modules grouped by feature area."""
 
-from . import dashboard, hello, user
+from . import auth, campaigns, dashboard, exports, hello, user
 
-__all__ = ["dashboard", "hello", "user"]
+__all__ = ["auth", "campaigns", "dashboard", "exports", "hello", "user"]
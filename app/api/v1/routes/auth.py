@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.db.session import get_db
+from app.schemas.auth import CurrentUser, LoginRequest, Token
+from app.services.user_service import UserService
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+@router.post("/login", response_model=Token)
+async def login(payload: LoginRequest, db: AsyncSession = Depends(get_db)):
+    return await UserService(db).login(payload.email, payload.password)
+
+@router.get("/me", response_model=CurrentUser)
+async def read_current_user(user: CurrentUser = Depends(get_current_user)):
+    return user
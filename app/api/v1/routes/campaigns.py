@@ -0,0 +1,36 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.db.session import get_read_db
+from app.schemas.campaign import AdPage, AdsetPage, CampaignPage, CampaignTree, ListingParams
+from app.services.campaign_service import CampaignService
+
+router = APIRouter(tags=["campaigns"], dependencies=[Depends(get_current_user)])
+
+@router.get("/campaigns", response_model=CampaignPage)
+async def list_campaigns(
+    params: ListingParams = Depends(),
+    account_id: int | None = Query(None, description="Restrict to a single ad account"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await CampaignService(db).list_campaigns(params, account_id=account_id)
+
+@router.get("/campaigns/{campaign_id}/adsets", response_model=AdsetPage)
+async def list_adsets(campaign_id: int, params: ListingParams = Depends(), db: AsyncSession = Depends(get_read_db)):
+    return await CampaignService(db).list_adsets(campaign_id, params)
+
+@router.get("/campaigns/{campaign_id}/tree", response_model=CampaignTree)
+async def get_campaign_tree(
+    campaign_id: int,
+    start_date: date | None = Query(None, description="First day (inclusive) of the spend window"),
+    end_date: date | None = Query(None, description="Last day (inclusive) of the spend window"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await CampaignService(db).campaign_tree(campaign_id, start_date=start_date, end_date=end_date)
+
+@router.get("/adsets/{adset_id}/ads", response_model=AdPage)
+async def list_ads(adset_id: int, params: ListingParams = Depends(), db: AsyncSession = Depends(get_read_db)):
+    return await CampaignService(db).list_ads(adset_id, params)
@@ -1,10 +1,32 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+from app.api.deps import get_current_user
+from app.core.cache import ResponseCache, get_response_cache
+from app.db.session import get_read_db, read_session_factory
+from app.schemas.batch import BatchRequest, BatchResponse
+from app.schemas.dashboard import DashboardFilters, DashboardStats
+from app.services.batch_service import BatchService
+from app.services.dashboard_service import DashboardService
 
-@router.get("/stats")
-def get_stats():
-    return {"visitors": 1234, "sales": 5678}
+router = APIRouter(prefix="/dashboard", tags=["dashboard"], dependencies=[Depends(get_current_user)])
+
+@router.get("/stats", response_model=DashboardStats)
+async def get_stats(
+    filters: DashboardFilters = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(read_session_factory),
+    cache: ResponseCache = Depends(get_response_cache),
+):
+    return await DashboardService(db, cache, session_factory).get_stats(filters)
+
+@router.post("/batch", response_model=BatchResponse)
+async def run_batch(
+    payload: BatchRequest,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(read_session_factory),
+    cache: ResponseCache = Depends(get_response_cache),
+):
+    return await BatchService(session_factory, cache).run(payload)
 
 @router.get("/reports")
 def get_reports():
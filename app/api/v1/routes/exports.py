@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.deps import get_current_user
+from app.db.session import get_db, read_session_factory
+from app.schemas.export import ExportJobOut, ExportRequest
+from app.services.export_job_service import ExportJobService
+from app.services.export_service import ExportService
+
+router = APIRouter(prefix="/exports", tags=["exports"], dependencies=[Depends(get_current_user)])
+
+@router.get("/facts")
+async def export_facts(
+    request: ExportRequest = Depends(),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(read_session_factory),
+):
+    service = ExportService(session_factory)
+    service.validate(request)
+    return StreamingResponse(
+        service.stream(request),
+        media_type=service.media_type(request),
+        headers={"Content-Disposition": f'attachment; filename="{service.filename(request)}"'},
+    )
+
+@router.post("/jobs", response_model=ExportJobOut, status_code=status.HTTP_202_ACCEPTED)
+async def create_export_job(payload: ExportRequest, db: AsyncSession = Depends(get_db)):
+    return await ExportJobService(db).create(payload)
+
+@router.get("/jobs/{job_id}", response_model=ExportJobOut)
+async def get_export_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    return await ExportJobService(db).get(job_id)
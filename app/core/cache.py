@@ -0,0 +1,136 @@
+"""Redis-backed response cache for read-only analytics endpoints."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.core.loop_scope import LoopScoped
+
+logger = logging.getLogger(__name__)
+
+_GENERATION_KEY = "respcache:generation"
+
+# Failures the cache degrades on rather than raises: Redis protocol errors,
+# socket and timeout errors from the connection itself, and RuntimeErrors such
+# as a pooled connection being used from another event loop.
+CACHE_ERRORS = (RedisError, OSError, RuntimeError)
+
+
+def make_cache_key(namespace: str, params: Mapping[str, Any], *, version: Any = None) -> str:
+    """Build a cache key from normalized query parameters.
+
+    ``None`` values are dropped and keys sorted so equivalent requests map onto
+    the same entry regardless of parameter order or omitted defaults.
+    """
+
+    normalized = {key: value for key, value in sorted(params.items()) if value is not None}
+    payload = json.dumps({"params": normalized, "version": version}, sort_keys=True, default=str)
+    digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    return f"respcache:{namespace}:{digest}"
+
+
+class ResponseCache:
+    """JSON response cache with TTL, generation-based invalidation and coalescing.
+
+    Every key embeds a generation counter stored in Redis; :meth:`invalidate`
+    bumps it so all previously cached responses become unreachable at once and
+    simply age out. Concurrent misses for the same key within this process share
+    a single computation, so ``compute`` must not depend on the first caller's
+    request state (open its own session). Cache failures degrade to computing
+    the response; they never fail the caller.
+    """
+
+    def __init__(self, client: aioredis.Redis | None, ttl_seconds: int) -> None:
+        self._client = client
+        self._ttl = ttl_seconds
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._client is not None
+
+    async def _generation(self) -> int:
+        value = await self._client.get(_GENERATION_KEY)
+        return int(value or 0)
+
+    async def get_or_compute(
+        self, key: str, compute: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        if not self.enabled:
+            return await compute()
+
+        try:
+            key = f"{key}:g{await self._generation()}"
+            cached = await self._client.get(key)
+        except CACHE_ERRORS:
+            logger.warning("Response cache unavailable; computing %s directly", key, exc_info=True)
+            return await compute()
+        if cached is not None:
+            try:
+                return json.loads(cached)
+            except ValueError:
+                logger.warning("Discarding undecodable cached response %s", key, exc_info=True)
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._compute_and_store(key, compute))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(inflight)
+
+    async def _compute_and_store(
+        self, key: str, compute: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        value = await compute()
+        try:
+            await self._client.set(key, json.dumps(value, default=str), ex=self._ttl)
+        except CACHE_ERRORS:
+            logger.warning("Failed to store cached response %s", key, exc_info=True)
+        return value
+
+    async def invalidate(self) -> None:
+        """Invalidate every cached response, e.g. after an ingestion run completes."""
+
+        if not self.enabled:
+            return
+        try:
+            await self._client.incr(_GENERATION_KEY)
+        except CACHE_ERRORS:
+            logger.warning("Failed to invalidate response cache", exc_info=True)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+
+
+def _new_response_cache() -> ResponseCache:
+    settings = get_settings()
+    client = aioredis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+    return ResponseCache(client, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+# The Redis connection pool and the in-flight futures belong to the loop that
+# created them, so each Celery task (one ``asyncio.run`` each) gets its own cache.
+_caches: LoopScoped[ResponseCache] = LoopScoped(_new_response_cache)
+
+
+async def get_response_cache() -> ResponseCache:
+    """Return the running loop's response cache (usable as a FastAPI dependency)."""
+
+    return _caches.get()
+
+
+async def close_response_cache() -> None:
+    """Close the running loop's Redis connections, if its cache was created."""
+
+    cache = _caches.pop()
+    if cache is not None:
+        await cache.aclose()
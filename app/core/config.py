@@ -1,15 +1,26 @@
 from functools import lru_cache
 from pathlib import Path
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
 
+class PlatformApiSettings(BaseModel):
+    """Connection details for one ad platform's reporting API."""
+
+    base_url: str
+    access_token: str | None = None
+    requests_per_second: float = Field(5.0, description="Sustained request rate allowed by the platform.")
+    burst: int = Field(10, description="Requests that may be issued back-to-back before throttling.")
+    page_size: int = 500
+
+
 class Settings(BaseSettings):
-    model_config = SettingsConfigDict(env_file=PROJECT_ROOT / ".env", extra="ignore")
+    # ``null`` sets an optional setting to None, e.g. DB_STATEMENT_TIMEOUT_MS=null.
+    model_config = SettingsConfigDict(env_file=PROJECT_ROOT / ".env", extra="ignore", env_parse_none_str="null")
 
     APP_NAME: str = "My FastAPI"
     ENV: str = "dev"
@@ -28,14 +39,258 @@ class Settings(BaseSettings):
             " environment."
         ),                                                        
     )        
+    DATABASE_READ_URL: str | None = Field(
+        None,
+        description="Read replica connection string for analytics reads; reads use the primary when unset.",
+    )
+    REPLICA_MAX_LAG_SECONDS: float = Field(
+        30.0,
+        description="Replica reads fall back to the primary while replication lag exceeds this.",
+    )
+    REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = Field(
+        5.0,
+        description="How often replication lag is re-measured.",
+    )
+    DB_ECHO: bool = Field(
+        False,
+        description="Log every SQL statement. Independent of DEBUG so it is never on by accident.",
+    )
+    DB_POOL_SIZE: int = Field(
+        20,
+        description="Persistent connections kept by the write (primary) engine's pool.",
+    )
+    DB_MAX_OVERFLOW: int = Field(
+        10,
+        description="Extra connections the write engine may open beyond DB_POOL_SIZE under load.",
+    )
+    DB_READ_POOL_SIZE: int = Field(
+        20,
+        description="Persistent connections kept by the read (analytics) engine's pool.",
+    )
+    DB_READ_MAX_OVERFLOW: int = Field(
+        20,
+        description="Extra connections the read engine may open beyond DB_READ_POOL_SIZE under load.",
+    )
+    DB_POOL_TIMEOUT_SECONDS: float = Field(
+        10.0,
+        description="Seconds to wait for a pooled connection before failing the request.",
+    )
+    DB_POOL_RECYCLE_SECONDS: int = Field(
+        1800,
+        description="Reconnect pooled connections older than this, ahead of server/proxy idle timeouts.",
+    )
+    DB_STATEMENT_CACHE_SIZE: int = Field(
+        100,
+        description=(
+            "asyncpg prepared statement cache size per connection. Set to 0 behind"
+            " PgBouncer in transaction pooling mode."
+        ),
+    )
+    DB_STATEMENT_TIMEOUT_MS: int | None = Field(
+        30_000,
+        description="Server-side statement_timeout for the write engine; null uses the server default.",
+    )
+    DB_READ_STATEMENT_TIMEOUT_MS: int | None = Field(
+        120_000,
+        description="Server-side statement_timeout for the read engine (analytics scans, exports); null as above.",
+    )
+    DB_SERVER_SETTINGS: dict[str, str] = Field(
+        default_factory=dict,
+        description="Additional Postgres run-time parameters sent on connect by both engines, as JSON.",
+    )
     JWT_SECRET: str = Field(
         ...,
         description="Secret used to sign JWT access tokens.",
     )
     JWT_ALG: str = "HS256"                                                                
     ACCESS_TOKEN_EXPIRE_MIN: int = 60
+    TOKEN_CACHE_SIZE: int = Field(
+        10_000,
+        description="Decoded access tokens kept in the per-process verification cache.",
+    )
+    BCRYPT_ROUNDS: int = Field(
+        12,
+        description=(
+            "bcrypt cost factor for new password hashes. Existing hashes are upgraded"
+            " on the next successful login after it changes."
+        ),
+    )
+    PASSWORD_HASH_WORKERS: int = Field(
+        4,
+        description="Threads available for password hashing/verification; bounds the CPU a login burst can use.",
+    )
     CORS_ORIGINS: list[str] = ["http://localhost:3000"]
 
+    METRICS_ENABLED: bool = Field(
+        True,
+        description="Expose Prometheus metrics at /metrics.",
+    )
+    WORKER_METRICS_PORT: int | None = Field(
+        None,
+        description="Port on which Celery workers serve Prometheus metrics; disabled when unset.",
+    )
+
+    REDIS_URL: str | None = Field(
+        None,
+        description="Redis connection URL. Response caching is disabled when unset.",
+    )
+    RESPONSE_CACHE_TTL_SECONDS: int = Field(
+        300,
+        description="Lifetime of cached analytics responses in seconds.",
+    )
+
+    DASHBOARD_USE_ROLLUPS: bool = Field(
+        True,
+        description=(
+            "Answer whole-week/month dashboard windows from the weekly/monthly rollup"
+            " tables when rollup_coverage shows they were built for the whole window;"
+            " other windows read the daily facts."
+        ),
+    )
+    BATCH_MAX_QUERIES: int = Field(
+        16,
+        description="Maximum named queries accepted by one POST /dashboard/batch request.",
+    )
+    BATCH_MAX_CONCURRENCY: int = Field(
+        4,
+        description=(
+            "Queries of one batch run concurrently, each on its own pooled read session;"
+            " keep well below DB_READ_POOL_SIZE + DB_READ_MAX_OVERFLOW."
+        ),
+    )
+    DASHBOARD_PRUNE_UNAVAILABLE_METRICS: bool = Field(
+        True,
+        description=(
+            "Skip dashboard metrics and platforms that metric_availability marks as"
+            " not reported at the query's location level."
+        ),
+    )
+
+    INGEST_CHUNK_SIZE: int = Field(
+        50_000,
+        description="Rows parsed and COPY'd per chunk by the staging loaders.",
+    )
+
+    ATTRIBUTION_WORKERS: int = Field(
+        1,
+        description="Worker processes used to fit attribution models; DMAs are sharded across them.",
+    )
+
+    ATTRIBUTION_CHANGE_LAG_SECONDS: int = Field(
+        900,
+        description=(
+            "Changes stamped less than this long ago are left for the next incremental"
+            " attribution refresh. Staging timestamps and ingestion log ids are assigned"
+            " before their transaction commits, so this must exceed the longest ingestion"
+            " transaction or its rows can fall behind an already advanced watermark."
+        ),
+    )
+
+    EXPORT_BATCH_SIZE: int = Field(
+        10_000,
+        description="Rows fetched from the server-side cursor and encoded per export batch.",
+    )
+    EXPORT_S3_BUCKET: str | None = Field(
+        None,
+        description="Bucket receiving background export files. Export jobs are rejected when unset.",
+    )
+    EXPORT_S3_PREFIX: str = Field(
+        "exports/",
+        description="Key prefix for background export files.",
+    )
+    EXPORT_S3_PART_SIZE: int = Field(
+        16 * 1024 * 1024,
+        description="Bytes buffered per S3 multipart upload part (S3 requires at least 5 MiB).",
+    )
+    EXPORT_URL_TTL_SECONDS: int = Field(
+        3600,
+        description="Lifetime of presigned download URLs handed out for finished export jobs.",
+    )
+    EXPORT_JOB_LEASE_SECONDS: int = Field(
+        300,
+        description=(
+            "A running export job whose worker has not renewed its heartbeat for this"
+            " long is considered abandoned and is requeued by the beat-scheduled sweep."
+        ),
+    )
+    S3_ENDPOINT_URL: str | None = Field(
+        None,
+        description="Override the S3 endpoint, e.g. for MinIO or a local S3 stand-in.",
+    )
+    AWS_REGION: str | None = Field(
+        None,
+        description="Region used for the S3 client; falls back to the AWS SDK defaults when unset.",
+    )
+
+    PLATFORM_APIS: dict[str, PlatformApiSettings] = Field(
+        default_factory=dict,
+        description=(
+            "Reporting API settings keyed by lower-cased dim_platform.name, as JSON,"
+            ' e.g. {"meta": {"base_url": "https://...", "access_token": "..."}}.'
+        ),
+    )
+    SYNC_CONCURRENCY: int = Field(
+        16,
+        description="Paginated report streams fetched concurrently per platform sync.",
+    )
+    SYNC_HTTP_MAX_CONNECTIONS: int = Field(
+        64,
+        description="Size of the shared HTTP connection pool used by platform syncs.",
+    )
+    SYNC_HTTP_TIMEOUT_SECONDS: float = Field(
+        30.0,
+        description="Per-request timeout for platform API calls.",
+    )
+    SYNC_MAX_RETRIES: int = Field(
+        5,
+        description="Retries for a platform API call that is throttled or fails transiently.",
+    )
+    SYNC_BACKOFF_SECONDS: float = Field(
+        0.5,
+        description="Base delay of the exponential (jittered) retry backoff.",
+    )
+
+    ETL_LOOKBACK_DAYS: int = Field(
+        28,
+        description="Trailing days (ending yesterday) re-synced and re-promoted by the nightly ETL.",
+    )
+    ETL_CHUNK_DAYS: int = Field(
+        7,
+        description="Days per fan-out task in the nightly ETL's sync and promote steps.",
+    )
+    ETL_NIGHTLY_HOUR: int = Field(
+        2,
+        description="Hour (UTC) at which Celery beat starts the nightly ETL.",
+    )
+    SHOPIFY_EXPORT_DIR: str | None = Field(
+        None,
+        description=(
+            "Drop directory for Shopify exports, laid out as <dir>/<account_id>/<file>."
+            " Files are moved into a processed/ subdirectory once staged."
+        ),
+    )
+
+    CELERY_BROKER_URL: str | None = Field(
+        None,
+        description="Celery broker URL. Defaults to REDIS_URL.",
+    )
+    CELERY_RESULT_BACKEND: str | None = Field(
+        None,
+        description="Celery result backend URL. Defaults to REDIS_URL.",
+    )
+
+    PARTITION_MONTHS_AHEAD: int = Field(
+        3,
+        description="Number of future monthly fact-table partitions kept pre-created.",
+    )
+    PARTITION_RETENTION_MONTHS: int = Field(
+        25,
+        description=(
+            "Monthly fact-table partitions older than this many months are detached"
+            " by the nightly partition maintenance task, and their rollups deleted."
+        ),
+    )
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -0,0 +1,46 @@
+"""HTTP client shared by outbound integrations, one per event loop."""
+from __future__ import annotations
+
+import httpx
+
+from app.core.config import get_settings
+from app.core.loop_scope import LoopScoped
+
+
+def _new_client() -> httpx.AsyncClient:
+    settings = get_settings()
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(settings.SYNC_HTTP_TIMEOUT_SECONDS),
+        limits=httpx.Limits(
+            max_connections=settings.SYNC_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SYNC_HTTP_MAX_CONNECTIONS,
+        ),
+        headers={"Accept": "application/json"},
+    )
+
+
+_clients: LoopScoped[httpx.AsyncClient] = LoopScoped(_new_client)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the running loop's shared ``httpx.AsyncClient``, creating it on first use.
+
+    One client means one connection pool, so keep-alive connections to each
+    platform are reused across accounts, pages and concurrent syncs. Its
+    connections belong to the loop, so each Celery task (one ``asyncio.run``
+    each) gets its own client and should close it before its loop ends.
+    """
+
+    client = _clients.get()
+    if client.is_closed:
+        _clients.pop()
+        client = _clients.get()
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the running loop's client, if it created one."""
+
+    client = _clients.pop()
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,37 @@
+"""Per-event-loop instances of objects that bind to the loop they are used on."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import Generic, TypeVar
+from weakref import WeakKeyDictionary
+
+T = TypeVar("T")
+
+
+class LoopScoped(Generic[T]):
+    """Lazily create one ``T`` per running event loop.
+
+    asyncio locks and futures, ``httpx`` clients and ``redis.asyncio``
+    connections belong to the loop they were first used on. The API runs a
+    single loop, but every Celery task body runs under its own
+    ``asyncio.run``, so a process-wide instance would be reused from a later,
+    different loop. Instances are weakly keyed by their loop and dropped with
+    it; :meth:`pop` hands one back for deterministic cleanup.
+    """
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self._factory = factory
+        self._instances: WeakKeyDictionary[asyncio.AbstractEventLoop, T] = WeakKeyDictionary()
+
+    def get(self) -> T:
+        loop = asyncio.get_running_loop()
+        instance = self._instances.get(loop)
+        if instance is None:
+            instance = self._instances[loop] = self._factory()
+        return instance
+
+    def pop(self) -> T | None:
+        """Forget and return the running loop's instance, if one was created."""
+
+        return self._instances.pop(asyncio.get_running_loop(), None)
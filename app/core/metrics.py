@@ -0,0 +1,183 @@
+"""Prometheus metrics for HTTP routes, the database pool, repository queries and ingestion."""
+from __future__ import annotations
+
+import functools
+import inspect
+import os
+import time
+from contextvars import ContextVar
+
+from fastapi import FastAPI
+from prometheus_client import CollectorRegistry, Counter, Histogram, multiprocess, start_http_server
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import REGISTRY, Collector
+from prometheus_fastapi_instrumentator import Instrumentator
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the pool.",
+    ["engine"],
+    buckets=_LATENCY_BUCKETS,
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_seconds",
+    "Statement execution latency, labelled by the repository method that issued it.",
+    ["engine", "repository", "method"],
+    buckets=_LATENCY_BUCKETS,
+)
+INGEST_RECORDS = Counter(
+    "ingest_records_total",
+    "Records read by ingestion jobs.",
+    ["source"],
+)
+INGEST_SECONDS = Counter(
+    "ingest_seconds_total",
+    "Wall-clock seconds spent in ingestion jobs; rate(records) / rate(seconds) is throughput.",
+    ["source"],
+)
+
+# (repository, method) of the repository coroutine currently issuing statements.
+_query_scope: ContextVar[tuple[str, str]] = ContextVar("query_scope", default=("none", "none"))
+
+_engines: dict[str, AsyncEngine] = {}
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that records how long each checkout waited."""
+
+    metrics_name = "default"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT_SECONDS.labels(self.metrics_name).observe(time.perf_counter() - started)
+
+
+class _PoolCollector(Collector):
+    """Reads pool occupancy at scrape time instead of tracking it per event."""
+
+    def collect(self):
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Connections currently checked out.", labels=["engine"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Connections open beyond pool_size.", labels=["engine"])
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size.", labels=["engine"])
+        for name, engine in _engines.items():
+            pool: Pool = engine.sync_engine.pool
+            if isinstance(pool, AsyncAdaptedQueuePool):
+                checked_out.add_metric([name], pool.checkedout())
+                overflow.add_metric([name], max(pool.overflow(), 0))
+                size.add_metric([name], pool.size())
+        yield checked_out
+        yield overflow
+        yield size
+
+
+REGISTRY.register(_PoolCollector())
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Time every statement on ``engine`` and publish its pool gauges under ``name``."""
+
+    pool = engine.sync_engine.pool
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        _engines[name] = engine
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        pool.metrics_name = name
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        repository, method = _query_scope.get()
+        DB_QUERY_SECONDS.labels(name, repository, method).observe(time.perf_counter() - started)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
+
+
+def _scoped(repository: str, method: str, func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = _query_scope.set((repository, method))
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _query_scope.reset(token)
+
+    return wrapper
+
+
+def _scoped_stream(repository: str, method: str, func):
+    # Only set the scope while the generator runs, never across its yields.
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        stream = func(*args, **kwargs)
+        try:
+            while True:
+                token = _query_scope.set((repository, method))
+                try:
+                    item = await stream.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    _query_scope.reset(token)
+                yield item
+        finally:
+            await stream.aclose()
+
+    return wrapper
+
+
+def instrument_repository(cls: type) -> type:
+    """Label statements issued from ``cls``'s public async methods with ``(class, method)``."""
+
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_"):
+            continue
+        if inspect.iscoroutinefunction(value):
+            setattr(cls, attr, _scoped(cls.__name__, attr, value))
+        elif inspect.isasyncgenfunction(value):
+            setattr(cls, attr, _scoped_stream(cls.__name__, attr, value))
+    return cls
+
+
+def record_ingestion(source: str, records: int, seconds: float) -> None:
+    INGEST_RECORDS.labels(source).inc(records)
+    INGEST_SECONDS.labels(source).inc(seconds)
+
+
+def add_metrics(app: FastAPI) -> None:
+    """Per-route latency histograms plus everything above, served at ``/metrics``."""
+
+    Instrumentator(
+        should_group_status_codes=True,
+        should_instrument_requests_inprogress=True,
+        inprogress_labels=True,
+        excluded_handlers=["/metrics", "/health/.*"],
+    ).instrument(app, latency_lowr_buckets=_LATENCY_BUCKETS).expose(app, include_in_schema=False)
+
+
+def start_metrics_server(port: int) -> None:
+    """Serve metrics from a non-HTTP process such as a Celery worker.
+
+    Prefork workers record metrics in child processes; with
+    ``PROMETHEUS_MULTIPROC_DIR`` set, the children's samples are aggregated here.
+    """
+
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    start_http_server(port, registry=registry)
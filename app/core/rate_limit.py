@@ -0,0 +1,58 @@
+"""Asynchronous token-bucket rate limiting for outbound API calls."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+from app.core.loop_scope import LoopScoped
+
+
+class TokenBucket:
+    """Token bucket allowing ``burst`` immediate calls and ``rate`` calls per second after that.
+
+    Waiters are served in arrival order: the lock is held while sleeping for a
+    token, so a burst of coroutines queues up instead of busy-polling.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1.")
+        self._rate = rate
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= 1
+
+    def penalize(self, seconds: float) -> None:
+        """Drain the bucket so no calls go out for ``seconds`` (e.g. after HTTP 429 ``Retry-After``)."""
+
+        self._refill()
+        self._tokens = min(self._tokens, 0.0) - seconds * self._rate
+
+
+# Buckets hold an asyncio.Lock, so they are kept per event loop: the API shares
+# one set for its lifetime, while each Celery task starts with full buckets.
+_buckets: LoopScoped[dict[str, TokenBucket]] = LoopScoped(dict)
+
+
+def get_token_bucket(name: str, rate: float, burst: int) -> TokenBucket:
+    """Return the running loop's bucket for ``name`` so concurrent syncs share one budget."""
+
+    buckets = _buckets.get()
+    bucket = buckets.get(name)
+    if bucket is None:
+        bucket = buckets[name] = TokenBucket(rate, burst)
+    return bucket
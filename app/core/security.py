@@ -1,6 +1,18 @@
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any
+
+from jose import jwt
 from passlib.context import CryptContext
 
-_password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")                   
+from app.core.config import get_settings
+
+_password_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=get_settings().BCRYPT_ROUNDS
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -13,3 +25,88 @@ def get_password_hash(password: str) -> str:
     """Hash ``password`` using a secure algorithm suitable for storage."""
 
     return _password_context.hash(password)
+
+
+@lru_cache
+def _hash_executor() -> ThreadPoolExecutor:
+    # bcrypt releases the GIL while hashing, so these threads run in parallel;
+    # the pool size caps how many cores a login/registration burst can take.
+    return ThreadPoolExecutor(
+        max_workers=get_settings().PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+    )
+
+
+async def _run_in_hash_executor(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor(), func, *args)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """:func:`verify_password` on the bounded hashing pool instead of the event loop."""
+
+    return await _run_in_hash_executor(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """:func:`get_password_hash` on the bounded hashing pool instead of the event loop."""
+
+    return await _run_in_hash_executor(get_password_hash, password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify and, when the stored hash uses an outdated cost factor, return a replacement hash."""
+
+    return await _run_in_hash_executor(_password_context.verify_and_update, plain_password, hashed_password)
+
+
+class TokenClaimsCache:
+    """Bounded LRU of decoded access-token claims keyed by the raw token.
+
+    A hit skips signature verification entirely; entries are only served until
+    the token's own ``exp``, so caching never extends a token's lifetime.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        claims = self._entries.get(token)
+        if claims is None:
+            return None
+        if claims["exp"] <= time.time():
+            del self._entries[token]
+            return None
+        self._entries.move_to_end(token)
+        return claims
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        self._entries[token] = claims
+        self._entries.move_to_end(token)
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+
+_claims_cache = TokenClaimsCache(get_settings().TOKEN_CACHE_SIZE)
+
+
+def create_access_token(subject: str, claims: dict[str, Any] | None = None) -> tuple[str, int]:
+    """Return a signed access token for ``subject`` and its lifetime in seconds."""
+
+    settings = get_settings()
+    expires_in = settings.ACCESS_TOKEN_EXPIRE_MIN * 60
+    now = int(time.time())
+    payload = {**(claims or {}), "sub": subject, "iat": now, "exp": now + expires_in}
+    return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALG), expires_in
+
+
+def decode_access_token(token: str) -> dict[str, Any]:
+    """Verify ``token`` and return its claims; raises :class:`jose.JWTError` when invalid or expired."""
+
+    claims = _claims_cache.get(token)
+    if claims is None:
+        settings = get_settings()
+        claims = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALG])
+        _claims_cache.put(token, claims)
+    return claims
@@ -0,0 +1,88 @@
+"""S3 helpers for writing large objects without buffering them in memory."""
+from __future__ import annotations
+
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+import aioboto3
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# S3 rejects non-final multipart parts smaller than this.
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class UploadResult:
+    bytes_written: int
+    parts: int
+
+
+@asynccontextmanager
+async def s3_client():
+    settings = get_settings()
+    session = aioboto3.Session()
+    async with session.client(
+        "s3", endpoint_url=settings.S3_ENDPOINT_URL, region_name=settings.AWS_REGION
+    ) as client:
+        yield client
+
+
+async def upload_stream(
+    client,
+    chunks: AsyncIterator[bytes],
+    *,
+    bucket: str,
+    key: str,
+    content_type: str,
+    part_size: int,
+) -> UploadResult:
+    """Upload an async byte stream as an S3 multipart upload, part by part.
+
+    At most one part is held in memory. A failure aborts the upload so S3 does
+    not retain (and bill for) orphaned parts.
+    """
+
+    part_size = max(part_size, MIN_PART_SIZE)
+    upload = await client.create_multipart_upload(Bucket=bucket, Key=key, ContentType=content_type)
+    upload_id = upload["UploadId"]
+    parts: list[dict] = []
+    buffer = bytearray()
+    written = 0
+
+    async def flush() -> None:
+        part_number = len(parts) + 1
+        response = await client.upload_part(
+            Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=part_number, Body=bytes(buffer)
+        )
+        parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        buffer.clear()
+
+    try:
+        async for chunk in chunks:
+            buffer.extend(chunk)
+            written += len(chunk)
+            if len(buffer) >= part_size:
+                await flush()
+        if buffer or not parts:
+            await flush()
+        await client.complete_multipart_upload(
+            Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+        )
+    except BaseException:
+        logger.exception("Aborting multipart upload of s3://%s/%s", bucket, key)
+        await client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        raise
+    return UploadResult(bytes_written=written, parts=len(parts))
+
+
+async def presigned_get_url(bucket: str, key: str, *, expires_in: int, filename: str | None = None) -> str:
+    params = {"Bucket": bucket, "Key": key}
+    if filename:
+        params["ResponseContentDisposition"] = f'attachment; filename="{filename}"'
+    async with s3_client() as client:
+        return await client.generate_presigned_url("get_object", Params=params, ExpiresIn=expires_in)
@@ -0,0 +1,244 @@
+"""Maintenance helpers for the monthly range-partitioned fact tables.
+
+``fact_marketing_daily`` and ``fact_shopify_daily`` are partitioned by
+``RANGE (date_id)`` with one partition per calendar month. ``date_id`` is the
+``yyyymmdd`` smart key of ``dim_date`` (enforced by a check constraint) so a
+month maps onto the half-open range ``[yyyymm01, next_yyyymm01)`` and
+partitions are named ``<table>_pYYYYMM``. Rows for a month without a partition
+land in ``<table>_default`` until maintenance moves them into their own.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from datetime import date, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_FACT_TABLES = ("fact_marketing_daily", "fact_shopify_daily")
+# Aggregates of fact_marketing_daily, keyed by period_start_id/period_end_id.
+ROLLUP_TABLES = ("agg_marketing_weekly", "agg_marketing_monthly")
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+def date_to_id(value: date) -> int:
+    """Return the ``dim_date.date_id`` smart key for ``value``."""
+
+    return value.year * 10000 + value.month * 100 + value.day
+
+
+def id_to_date(date_id: int) -> date:
+    """Inverse of :func:`date_to_id`."""
+
+    return date(date_id // 10000, date_id // 100 % 100, date_id % 100)
+
+
+def _add_months(year: int, month: int, months: int) -> tuple[int, int]:
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def partition_name(table: str, year: int, month: int) -> str:
+    return f"{table}_p{year:04d}{month:02d}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def partition_bounds(year: int, month: int) -> tuple[int, int]:
+    """Return the ``[lower, upper)`` ``date_id`` bounds of a monthly partition."""
+
+    next_year, next_month = _add_months(year, month, 1)
+    return year * 10000 + month * 100 + 1, next_year * 10000 + next_month * 100 + 1
+
+
+async def list_partitions(session: AsyncSession, table: str) -> list[tuple[int, int, str]]:
+    """Return ``(year, month, name)`` for every monthly partition attached to ``table``."""
+
+    result = await session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i"
+            " JOIN pg_class c ON c.oid = i.inhrelid"
+            " JOIN pg_class p ON p.oid = i.inhparent"
+            " WHERE p.relname = :table"
+        ),
+        {"table": table},
+    )
+    partitions = []
+    for (name,) in result:
+        match = _PARTITION_SUFFIX.search(name)
+        if match:
+            partitions.append((int(match.group(1)), int(match.group(2)), name))
+    return sorted(partitions)
+
+
+async def _create_partition(session: AsyncSession, table: str, year: int, month: int) -> str:
+    name = partition_name(table, year, month)
+    default = default_partition_name(table)
+    lower, upper = partition_bounds(year, month)
+    bounds = f"FOR VALUES FROM ({lower}) TO ({upper})"
+    in_default = await session.execute(
+        text(f'SELECT EXISTS (SELECT 1 FROM "{default}" WHERE date_id >= :lower AND date_id < :upper)'),
+        {"lower": lower, "upper": upper},
+    )
+    if not in_default.scalar_one():
+        await session.execute(text(f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" {bounds}'))
+        return name
+
+    # Postgres refuses a new partition whose range has rows in the default
+    # partition, so the month's rows are moved into a standalone table first.
+    await session.execute(
+        text(f'CREATE TABLE "{name}" (LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    )
+    await session.execute(
+        text(
+            f'WITH moved AS (DELETE FROM "{default}" WHERE date_id >= :lower AND date_id < :upper RETURNING *)'
+            f' INSERT INTO "{name}" SELECT * FROM moved'
+        ),
+        {"lower": lower, "upper": upper},
+    )
+    await session.execute(text(f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" {bounds}'))
+    return name
+
+
+async def ensure_monthly_partitions(
+    session: AsyncSession,
+    table: str,
+    *,
+    months_ahead: int = 3,
+    today: date | None = None,
+) -> list[str]:
+    """Create any missing partitions from the current month up to ``months_ahead``.
+
+    Months that already have rows in the default partition get their own
+    partition too, with those rows moved into it. Returns the names of the
+    partitions that were created.
+    """
+
+    today = today or date.today()
+    existing = {(year, month) for year, month, _ in await list_partitions(session, table)}
+    wanted = {_add_months(today.year, today.month, offset) for offset in range(months_ahead + 1)}
+    result = await session.execute(
+        text(f'SELECT DISTINCT date_id / 100 FROM "{default_partition_name(table)}"')
+    )
+    wanted.update((yyyymm // 100, yyyymm % 100) for yyyymm in result.scalars())
+
+    created = []
+    for year, month in sorted(wanted - existing):
+        created.append(await _create_partition(session, table, year, month))
+    return created
+
+
+async def ensure_date_dimension(session: AsyncSession, start_date: date, end_date: date) -> int:
+    """Insert the missing ``dim_date`` rows for every day of the window; returns rows inserted."""
+
+    result = await session.execute(
+        text(
+            "INSERT INTO dim_date (date_id, date_actual, week, month, quarter, year)"
+            " SELECT to_char(d, 'YYYYMMDD')::integer, d, extract(week FROM d), extract(month FROM d),"
+            "  extract(quarter FROM d), extract(year FROM d)"
+            " FROM (SELECT generate_series(CAST(:start AS date), CAST(:end AS date), interval '1 day')::date AS d) days"
+            " ON CONFLICT (date_id) DO NOTHING"
+        ),
+        {"start": start_date, "end": end_date},
+    )
+    return result.rowcount
+
+
+async def detach_expired_partitions(
+    session: AsyncSession,
+    table: str,
+    *,
+    retain_months: int,
+    today: date | None = None,
+    drop: bool = False,
+) -> list[str]:
+    """Detach (and optionally drop) partitions older than ``retain_months``.
+
+    Detaching is a catalog-only operation, so expiring a month of data does not
+    rewrite or vacuum the remaining partitions. Returns the affected partition names.
+    """
+
+    today = today or date.today()
+    cutoff = _add_months(today.year, today.month, -retain_months)
+    expired = []
+    for year, month, name in await list_partitions(session, table):
+        if (year, month) >= cutoff:
+            continue
+        await session.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+        if drop:
+            await session.execute(text(f'DROP TABLE "{name}"'))
+        expired.append(name)
+    return expired
+
+
+async def prune_expired_rollups(session: AsyncSession, before_date_id: int) -> int:
+    """Delete rollup periods starting before ``before_date_id``; returns rows deleted.
+
+    A period straddling the cutoff goes too, as part of it aggregates expired
+    days. ``rollup_coverage`` is trimmed to match, so the dashboard answers
+    windows reaching before the cutoff from the daily facts.
+    """
+
+    deleted = 0
+    for table in ROLLUP_TABLES:
+        result = await session.execute(
+            text(f'DELETE FROM "{table}" WHERE period_start_id < :cutoff'), {"cutoff": before_date_id}
+        )
+        deleted += result.rowcount
+    await session.execute(
+        text("DELETE FROM rollup_coverage WHERE end_date_id < :cutoff"), {"cutoff": before_date_id}
+    )
+    await session.execute(
+        text(
+            "UPDATE rollup_coverage SET start_date_id = :cutoff, updated_at = now()"
+            " WHERE start_date_id < :cutoff"
+        ),
+        {"cutoff": before_date_id},
+    )
+    return deleted
+
+
+async def maintain_fact_partitions(
+    session: AsyncSession,
+    *,
+    months_ahead: int,
+    retain_months: int,
+    drop_expired: bool = False,
+    today: date | None = None,
+) -> dict[str, dict[str, list[str]]]:
+    """Pre-create future partitions and expire old ones for every fact table.
+
+    ``dim_date`` is extended over the same months first, so facts for any day
+    inside the retained and pre-created range satisfy their foreign key. The
+    rollups of the expired months are pruned in the same transaction.
+    """
+
+    today = today or date.today()
+    first_year, first_month = _add_months(today.year, today.month, -retain_months)
+    last_year, last_month = _add_months(today.year, today.month, months_ahead + 1)
+    dates = await ensure_date_dimension(
+        session, date(first_year, first_month, 1), date(last_year, last_month, 1) - timedelta(days=1)
+    )
+    if dates:
+        logger.info("Added %d dim_date rows", dates)
+
+    report: dict[str, dict[str, list[str]]] = {}
+    for table in PARTITIONED_FACT_TABLES:
+        created = await ensure_monthly_partitions(
+            session, table, months_ahead=months_ahead, today=today
+        )
+        expired = await detach_expired_partitions(
+            session, table, retain_months=retain_months, today=today, drop=drop_expired
+        )
+        report[table] = {"created": created, "expired": expired}
+    pruned = await prune_expired_rollups(session, partition_bounds(first_year, first_month)[0])
+    if pruned:
+        logger.info("Deleted %d expired rollup rows", pruned)
+    await session.commit()
+    return report
@@ -0,0 +1,66 @@
+"""Replication-lag checks used to decide whether reads may go to the replica."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Zero when the replica is streaming and has replayed everything it received:
+# an idle primary sends no new transactions, so the last replay timestamp alone
+# would look like lag. A replica whose WAL receiver is down has nothing left to
+# replay either, so it is judged by the age of its last replayed transaction;
+# NULL (nothing replayed since startup) counts as unknown.
+_LAG_SQL = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()"
+    " AND EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN 0"
+    " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+    " END"
+)
+
+
+class ReplicaLagGuard:
+    """Cached replica-lag probe.
+
+    The lag is measured at most once per ``check_interval`` seconds and shared by
+    every caller in between, so routing a read costs nothing on the hot path.
+    An unreachable replica, or one whose lag cannot be measured, counts as lagging.
+    """
+
+    def __init__(self, engine: AsyncEngine, *, max_lag_seconds: float, check_interval: float) -> None:
+        self._engine = engine
+        self._max_lag = max_lag_seconds
+        self._interval = check_interval
+        self._lag: float | None = None
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    @property
+    def lag_seconds(self) -> float | None:
+        return self._lag
+
+    async def _measure(self) -> float | None:
+        try:
+            async with self._engine.connect() as connection:
+                lag = (await connection.execute(_LAG_SQL)).scalar_one()
+                return None if lag is None else float(lag)
+        except (SQLAlchemyError, OSError) as exc:
+            logger.warning("Replica lag check failed: %s", exc)
+            return None
+
+    async def healthy(self) -> bool:
+        if time.monotonic() - self._checked_at >= self._interval:
+            async with self._lock:
+                if time.monotonic() - self._checked_at >= self._interval:
+                    self._lag = await self._measure()
+                    self._checked_at = time.monotonic()
+                    if self._lag is None or self._lag > self._max_lag:
+                        logger.warning("Replica lag %s s over limit; reading from the primary", self._lag)
+        return self._lag is not None and self._lag <= self._max_lag
@@ -1,12 +1,103 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.core.metrics import InstrumentedAsyncQueuePool, instrument_engine
+from app.db.replica import ReplicaLagGuard
 
 settings = get_settings() 
-engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True, echo=settings.DEBUG)
+
+
+def _create_engine(
+    settings: Settings,
+    url: str,
+    *,
+    role: str,
+    pool_size: int,
+    max_overflow: int,
+    statement_timeout_ms: int | None,
+) -> AsyncEngine:
+    server_settings = {"application_name": f"{settings.APP_NAME}:{role}"[:63]}
+    if statement_timeout_ms is not None:
+        server_settings["statement_timeout"] = str(statement_timeout_ms)
+    server_settings.update(settings.DB_SERVER_SETTINGS)
+
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        pool_pre_ping=True,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        connect_args={
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": server_settings,
+        },
+    )
+    instrument_engine(engine, role)
+    return engine
+
+
+# Writes and OLTP reads share the primary pool; analytics scans and exports get
+# their own (on the replica when one is configured) so a burst of slow
+# aggregates cannot starve logins or ingestion.
+engine = _create_engine(
+    settings,
+    settings.DATABASE_URL,
+    role="primary",
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    statement_timeout_ms=settings.DB_STATEMENT_TIMEOUT_MS,
+)
+read_engine = _create_engine(
+    settings,
+    settings.DATABASE_READ_URL or settings.DATABASE_URL,
+    role="read",
+    pool_size=settings.DB_READ_POOL_SIZE,
+    max_overflow=settings.DB_READ_MAX_OVERFLOW,
+    statement_timeout_ms=settings.DB_READ_STATEMENT_TIMEOUT_MS,
+)
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+ReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False, class_=AsyncSession)
+
+replica_guard = (
+    ReplicaLagGuard(
+        read_engine,
+        max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+        check_interval=settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+    )
+    if settings.DATABASE_READ_URL
+    else None
+)
 
 
 async def get_db() -> AsyncSession:
     async with SessionLocal() as session: 
         yield session 
+
+
+async def read_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Return the session factory for analytics reads.
+
+    That is the replica while its lag is within ``REPLICA_MAX_LAG_SECONDS``,
+    otherwise the primary.
+    """
+
+    if replica_guard is None or await replica_guard.healthy():
+        return ReadSessionLocal
+    return SessionLocal
+
+
+async def get_read_db(
+    factory: async_sessionmaker[AsyncSession] = Depends(read_session_factory),
+) -> AsyncSession:
+    """Session for read-only analytics endpoints; writes must use :func:`get_db`.
+
+    Taking the factory as a dependency lets a route that also needs
+    :func:`read_session_factory` share the one lag check per request.
+    """
+
+    async with factory() as session:
+        yield session
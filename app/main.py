@@ -1,18 +1,41 @@
 # app/main.py
+import logging
+
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from app.api.v1.router import api_router  # <-- keep on one line
+from app.core.cache import close_response_cache
+from app.core.config import get_settings
+from app.core.http import close_http_client
+from app.core.metrics import add_metrics
+from app.db.session import read_session_factory
 from app.middlewares.cors import add_cors
+from app.repositories.metric_availability import get_metric_availability
+
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    if get_settings().DASHBOARD_PRUNE_UNAVAILABLE_METRICS:
+        # Warm the availability matrix; if the database is not reachable yet the
+        # first dashboard request loads it instead.
+        try:
+            async with (await read_session_factory())() as session:
+                await get_metric_availability().refresh(session, force=True)
+        except Exception:
+            logger.warning("Could not preload metric availability", exc_info=True)
     yield
+    await close_http_client()
+    await close_response_cache()
 
 def create_app() -> FastAPI:
     app = FastAPI(title="My FastAPI", version="1.0.0", lifespan=lifespan)
 
     add_cors(app, origins=["http://localhost:3000"])
 
+    if get_settings().METRICS_ENABLED:
+        add_metrics(app)
+
     # Versioned API
     app.include_router(api_router, prefix="/api/v1")
 
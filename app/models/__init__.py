@@ -1,6 +1,9 @@
 """Application ORM models."""
 
+from app.models.export import ExportJob
 from app.models.marketing import (
+    AggMarketingMonthly,
+    AggMarketingWeekly,
     DimAccount,
     DimAd,
     DimAdsetOrAdgroup,
@@ -14,6 +17,7 @@ from app.models.marketing import (
     DimPostal,
     DimRegion,
     EventIngestionLog,
+    FactCellChange,
     FactMarketingDaily,
     FactModelResults,
     FactShopifyDaily,
@@ -21,7 +25,12 @@ from app.models.marketing import (
     MapPlatformDMA,
     MapPostalCityState,
     MetricAvailability,
+    ModelDirtyCell,
+    ModelRun,
+    ModelRunWatermark,
+    RollupCoverage,
     StgShopifyDailyCity,
+    TableVersion,
 )
 from app.models.user import User
 
@@ -48,4 +57,13 @@ __all__ = [
     "MapPostalCityState",
     "MetricAvailability",
     "EventIngestionLog",
+    "FactCellChange",
+    "ModelDirtyCell",
+    "ModelRun",
+    "ModelRunWatermark",
+    "AggMarketingWeekly",
+    "AggMarketingMonthly",
+    "RollupCoverage",
+    "TableVersion",
+    "ExportJob",
 ]
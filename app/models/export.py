@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Index, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ExportJob(Base):
+    __tablename__ = "export_job"
+
+    job_id: Mapped[str] = mapped_column(Text, primary_key=True)
+    dataset: Mapped[str] = mapped_column(Text, nullable=False)
+    format: Mapped[str] = mapped_column(Text, nullable=False)
+    gzip: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    end_date: Mapped[date] = mapped_column(Date, nullable=False)
+    status: Mapped[str] = mapped_column(Text, nullable=False, server_default=text("'pending'"))
+    s3_bucket: Mapped[Optional[str]] = mapped_column(Text)
+    s3_key: Mapped[Optional[str]] = mapped_column(Text)
+    bytes_written: Mapped[Optional[int]] = mapped_column(BigInteger)
+    parts_uploaded: Mapped[Optional[int]] = mapped_column(BigInteger)
+    error_message: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=False), nullable=False, server_default=text("now()")
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False))
+    # Renewed by the worker while the job runs; a stale value means the worker died.
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False))
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False))
+
+    __table_args__ = (Index("ix_export_job_status_created", "status", "created_at"),)
@@ -8,6 +8,7 @@ from typing import Optional
 from sqlalchemy import (         
     BigInteger,
     Boolean,
+    CheckConstraint,
     Date,
     DateTime,
     ForeignKey,
@@ -64,6 +65,11 @@ class DimCampaign(Base):
     external_campaign_id: Mapped[Optional[str]] = mapped_column(Text)
     campaign_name: Mapped[Optional[str]] = mapped_column(Text)                                       
 
+    __table_args__ = (
+        Index("ix_dim_campaign_account_campaign", "account_id", "campaign_id"),
+        Index("ux_dim_campaign_account_external", "account_id", "external_campaign_id", unique=True),
+    )
+
 
 class DimAdsetOrAdgroup(Base):                                               
     __tablename__ = "dim_adset_or_adgroup"
@@ -73,6 +79,11 @@ class DimAdsetOrAdgroup(Base):
     external_adset_id: Mapped[Optional[str]] = mapped_column(Text)
     adset_name: Mapped[Optional[str]] = mapped_column(Text)
 
+    __table_args__ = (
+        Index("ix_dim_adset_campaign_adset", "campaign_id", "adset_id"),
+        Index("ux_dim_adset_campaign_external", "campaign_id", "external_adset_id", unique=True),
+    )
+
 
 class DimAd(Base):
     __tablename__ = "dim_ad"
@@ -82,6 +93,11 @@ class DimAd(Base):
     external_ad_id: Mapped[Optional[str]] = mapped_column(Text)
     ad_name: Mapped[Optional[str]] = mapped_column(Text)
 
+    __table_args__ = (
+        Index("ix_dim_ad_adset_ad", "adset_id", "ad_id"),
+        Index("ux_dim_ad_adset_external", "adset_id", "external_ad_id", unique=True),
+    )
+
 
 class DimAttribution(Base):
     __tablename__ = "dim_attribution"
@@ -124,6 +140,8 @@ class DimPostal(Base):
     city_id: Mapped[int] = mapped_column(ForeignKey("dim_city.city_id"), nullable=False)
     postal_code: Mapped[str] = mapped_column(Text, nullable=False)
 
+    __table_args__ = (Index("ix_dim_postal_city_code", "city_id", "postal_code"),)
+
 
 class DimDate(Base):          
     __tablename__ = "dim_date"
@@ -135,6 +153,15 @@ class DimDate(Base):
     quarter: Mapped[Optional[int]] = mapped_column(Integer)
     year: Mapped[Optional[int]] = mapped_column(Integer)
 
+    __table_args__ = (
+        # date_id is the yyyymmdd smart key; fact partitions and date windows rely on it.
+        CheckConstraint(
+            "date_id = (extract(year FROM date_actual) * 10000 + extract(month FROM date_actual) * 100"
+            " + extract(day FROM date_actual))::integer",
+            name="ck_dim_date_date_id_yyyymmdd",
+        ),
+    )
+
 
 class FactMarketingDaily(Base):                               
     __tablename__ = "fact_marketing_daily"             
@@ -145,7 +172,7 @@ class FactMarketingDaily(Base):
     campaign_id: Mapped[int] = mapped_column(ForeignKey("dim_campaign.campaign_id"), nullable=False)
     adset_id: Mapped[int] = mapped_column(ForeignKey("dim_adset_or_adgroup.adset_id"), nullable=False)
     ad_id: Mapped[int] = mapped_column(ForeignKey("dim_ad.ad_id"), nullable=False)
-    date_id: Mapped[int] = mapped_column(ForeignKey("dim_date.date_id"), nullable=False)
+    date_id: Mapped[int] = mapped_column(ForeignKey("dim_date.date_id"), primary_key=True)
     attribution_id: Mapped[Optional[int]] = mapped_column(ForeignKey("dim_attribution.attribution_id"))
     country_id: Mapped[Optional[int]] = mapped_column(ForeignKey("dim_country.country_id"))
     region_id: Mapped[Optional[int]] = mapped_column(ForeignKey("dim_region.region_id"))
@@ -159,14 +186,23 @@ class FactMarketingDaily(Base):
     video_view_time: Mapped[Optional[int]] = mapped_column(BigInteger)
     frequency: Mapped[Optional[Decimal]] = mapped_column(Numeric)
     reach: Mapped[Optional[int]] = mapped_column(BigInteger)
-    add_to_cart: Mapped[Optional[int]] = mapped_column(BigInteger) 
+    add_to_cart: Mapped[Optional[int]] = mapped_column(BigInteger)
+
+    __table_args__ = (
+        Index("ix_fact_marketing_daily_platform_date", "platform_id", "date_id"),
+        Index("ix_fact_marketing_daily_dma_date", "dma_id", "date_id"),
+        Index("ix_fact_marketing_daily_campaign_date", "campaign_id", "date_id"),
+        Index("brin_fact_marketing_daily_date", "date_id", postgresql_using="brin"),
+        # Monthly RANGE partitions are managed by app.db.partitions.
+        {"postgresql_partition_by": "RANGE (date_id)"},
+    )
 
 
 class FactShopifyDaily(Base): 
     __tablename__ = "fact_shopify_daily"
 
     fact_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
-    date_id: Mapped[int] = mapped_column(ForeignKey("dim_date.date_id"), nullable=False)
+    date_id: Mapped[int] = mapped_column(ForeignKey("dim_date.date_id"), primary_key=True)
     country_id: Mapped[int] = mapped_column(ForeignKey("dim_country.country_id"), nullable=False)
     region_id: Mapped[int] = mapped_column(ForeignKey("dim_region.region_id"), nullable=False)
     city_id: Mapped[int] = mapped_column(ForeignKey("dim_city.city_id"), nullable=False)
@@ -177,6 +213,14 @@ class FactShopifyDaily(Base):
     revenue: Mapped[Optional[Decimal]] = mapped_column(Numeric)
     add_to_cart: Mapped[Optional[int]] = mapped_column(BigInteger)
 
+    __table_args__ = (
+        UniqueConstraint("date_id", "city_id", "postal_id", name="ux_fact_shopify_daily_grain"),
+        Index("ix_fact_shopify_daily_city_date", "city_id", "date_id"),
+        Index("ix_fact_shopify_daily_region_date", "region_id", "date_id"),
+        Index("brin_fact_shopify_daily_date", "date_id", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (date_id)"},
+    )
+
 
 class FactModelResults(Base):           
     __tablename__ = "fact_model_results"
@@ -251,6 +295,7 @@ class StgShopifyDailyCity(Base):
             "city_name_norm",
             name="stg_shopify_daily_city_pk",
         ),
+        Index("ix_stg_shopify_daily_city_ingested_at", "_ingested_at"),
     )
 
 
@@ -286,6 +331,13 @@ class MapCityDMA(Base):
             "effective_end_date",
             name="map_city_dma_city_window_unique",
         ),
+        Index(
+            "ix_map_city_dma_city_window",
+            "city_id",
+            "effective_start_date",
+            "effective_end_date",
+            postgresql_include=["dma_id", "dma_share"],
+        ),
     )
 
 
@@ -298,6 +350,11 @@ class MapPostalCityState(Base):
     state_code: Mapped[str] = mapped_column(Text, nullable=False)
     city_id: Mapped[Optional[int]] = mapped_column(ForeignKey("dim_city.city_id"))
 
+    __table_args__ = (
+        Index("ix_map_postal_city_state_postal_code", "postal_code"),
+        Index("ix_map_postal_city_state_unresolved", "id", postgresql_where=text("city_id IS NULL")),
+    )
+
 
 class MetricAvailability(Base):
     __tablename__ = "metric_availability"
@@ -321,3 +378,144 @@ class EventIngestionLog(Base):
     status: Mapped[str] = mapped_column(Text, nullable=False)
     error_message: Mapped[Optional[str]] = mapped_column(Text)
     duration_seconds: Mapped[Optional[Decimal]] = mapped_column(Numeric)
+    # Pipeline bookkeeping: which run/step wrote the row and the first day of its date chunk.
+    run_id: Mapped[Optional[str]] = mapped_column(Text)
+    step: Mapped[Optional[str]] = mapped_column(Text)
+    date_id: Mapped[Optional[int]] = mapped_column(Integer)
+
+    __table_args__ = (
+        Index("ix_event_ingestion_log_run_step", "run_id", "step", "platform_id", "date_id"),
+    )
+
+
+class ModelDirtyCell(Base):
+    __tablename__ = "model_dirty_cell"
+
+    change_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    model_name: Mapped[str] = mapped_column(Text, nullable=False)
+    model_version: Mapped[str] = mapped_column(Text, nullable=False)
+    date_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    dma_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    platform_id: Mapped[Optional[int]] = mapped_column(Integer)
+    source: Mapped[str] = mapped_column(Text, nullable=False)
+    detected_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=False), nullable=False, server_default=text("now()")
+    )
+
+    __table_args__ = (Index("ix_model_dirty_cell_model_dma", "model_name", "model_version", "dma_id"),)
+
+
+class FactCellChange(Base):
+    """A platform x DMA-day whose facts a sync actually changed, keyed by that sync's log entry."""
+
+    __tablename__ = "fact_cell_change"
+
+    change_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    log_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    platform_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    date_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    dma_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (Index("ix_fact_cell_change_log", "log_id"),)
+
+
+class ModelRunWatermark(Base):
+    __tablename__ = "model_run_watermark"
+
+    model_name: Mapped[str] = mapped_column(Text, nullable=False)
+    model_version: Mapped[str] = mapped_column(Text, nullable=False)
+    last_ingested_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False))
+    last_log_id: Mapped[Optional[int]] = mapped_column(BigInteger)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=False), nullable=False, server_default=text("now()")
+    )
+
+    __table_args__ = (
+        PrimaryKeyConstraint("model_name", "model_version", name="model_run_watermark_pk"),
+    )
+
+
+class ModelRun(Base):
+    """One attribution fit: its scope, output size and per-shard fit timings."""
+
+    __tablename__ = "model_run"
+
+    run_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    model_name: Mapped[str] = mapped_column(Text, nullable=False)
+    model_version: Mapped[str] = mapped_column(Text, nullable=False)
+    start_date_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    end_date_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    platforms: Mapped[int] = mapped_column(Integer, nullable=False)
+    dmas: Mapped[int] = mapped_column(Integer, nullable=False)
+    days: Mapped[int] = mapped_column(Integer, nullable=False)
+    workers: Mapped[int] = mapped_column(Integer, nullable=False)
+    rows_written: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    fit_seconds: Mapped[Decimal] = mapped_column(Numeric, nullable=False)
+    # One entry per DMA shard (axis positions, DMA id range and seconds);
+    # empty for single-process fits.
+    shard_timings: Mapped[list] = mapped_column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
+    finished_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=False), nullable=False, server_default=text("now()")
+    )
+
+    __table_args__ = (Index("ix_model_run_model_finished", "model_name", "model_version", "finished_at"),)
+
+
+class _MarketingRollupColumns:
+    """Shared layout of the ``fact_marketing_daily`` rollups at platform × campaign × DMA grain."""
+
+    rollup_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    period_start_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    period_end_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    platform_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    campaign_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    dma_id: Mapped[Optional[int]] = mapped_column(Integer)
+    spend: Mapped[Optional[Decimal]] = mapped_column(Numeric)
+    impressions: Mapped[Optional[int]] = mapped_column(BigInteger)
+    clicks: Mapped[Optional[int]] = mapped_column(BigInteger)
+    conversions: Mapped[Optional[int]] = mapped_column(BigInteger)
+    conversion_value: Mapped[Optional[Decimal]] = mapped_column(Numeric)
+
+
+class AggMarketingWeekly(_MarketingRollupColumns, Base):
+    __tablename__ = "agg_marketing_weekly"
+
+    __table_args__ = (
+        Index("ix_agg_marketing_weekly_period_platform", "period_start_id", "platform_id"),
+        Index("ix_agg_marketing_weekly_dma_period", "dma_id", "period_start_id"),
+    )
+
+
+class AggMarketingMonthly(_MarketingRollupColumns, Base):
+    __tablename__ = "agg_marketing_monthly"
+
+    __table_args__ = (
+        Index("ix_agg_marketing_monthly_period_platform", "period_start_id", "platform_id"),
+        Index("ix_agg_marketing_monthly_dma_period", "dma_id", "period_start_id"),
+    )
+
+
+class RollupCoverage(Base):
+    """Contiguous ``date_id`` range each rollup grain has been built for."""
+
+    __tablename__ = "rollup_coverage"
+
+    grain: Mapped[str] = mapped_column(Text, primary_key=True)
+    start_date_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    end_date_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=False), nullable=False, server_default=text("now()")
+    )
+
+
+class TableVersion(Base):
+    """Change counters bumped by the ``track_table_version`` triggers of small lookup tables."""
+
+    __tablename__ = "table_version"
+
+    table_name: Mapped[str] = mapped_column(Text, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+    rewrite_version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=False), nullable=False, server_default=text("now()")
+    )
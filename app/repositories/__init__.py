@@ -1,5 +1,38 @@
 """Repository layer for encapsulating database access."""
 
+from app.repositories.attribution import AttributionRepository
+from app.repositories.campaign import CampaignRepository
+from app.repositories.change_tracking import ChangeTrackingRepository
+from app.repositories.dashboard import DashboardRepository
+from app.repositories.dimension_cache import DimensionCache, get_dimension_cache
+from app.repositories.export import ExportJobRepository, ExportRepository
+from app.repositories.geo_allocation import GeoAllocationRepository
+from app.repositories.ingestion_log import IngestionLogRepository
+from app.repositories.metric_availability import MetricAvailabilityCache, get_metric_availability
+from app.repositories.platform_load import PlatformLoadRepository
+from app.repositories.postal import PostalRepository
+from app.repositories.rollups import RollupRepository
+from app.repositories.staging import StagingRepository
+from app.repositories.table_version import TableVersionRepository
 from app.repositories.user import UserRepository
 
-__all__ = ["UserRepository"]
+__all__ = [
+    "AttributionRepository",
+    "CampaignRepository",
+    "ChangeTrackingRepository",
+    "DashboardRepository",
+    "DimensionCache",
+    "ExportJobRepository",
+    "ExportRepository",
+    "GeoAllocationRepository",
+    "IngestionLogRepository",
+    "MetricAvailabilityCache",
+    "PlatformLoadRepository",
+    "PostalRepository",
+    "RollupRepository",
+    "StagingRepository",
+    "TableVersionRepository",
+    "UserRepository",
+    "get_dimension_cache",
+    "get_metric_availability",
+]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import date
+
+import numpy as np
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import instrument_repository
+from app.models.marketing import FactMarketingDaily, ModelRun
+from app.repositories.columnar import rows_to_columns
+from app.repositories.dashboard import date_id_window
+
+RESULTS_LOAD_TABLE = "tmp_fact_model_results"
+
+# Column order of the records handed to ``upsert_results``.
+RESULT_COLUMNS = (
+    "platform_id",
+    "dma_id",
+    "date_id",
+    "predicted_sales",
+    "attributed_sales",
+    "effect_size",
+    "confidence_interval",
+    "feature_importances",
+)
+
+
+@instrument_repository
+class AttributionRepository:
+    """Columnar reads of model inputs and bulk writes of ``fact_model_results`` and ``model_run``."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def load_spend(
+        self,
+        start_date: date,
+        end_date: date,
+        *,
+        dma_ids: Sequence[int] | None = None,
+        platform_ids: Sequence[int] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(platform_id, dma_id, date_id, spend)`` column arrays aggregated in SQL."""
+
+        fmd = FactMarketingDaily
+        stmt = (
+            select(fmd.platform_id, fmd.dma_id, fmd.date_id, func.coalesce(func.sum(fmd.spend), 0))
+            .where(date_id_window(fmd.date_id, start_date, end_date), fmd.dma_id.is_not(None))
+            .group_by(fmd.platform_id, fmd.dma_id, fmd.date_id)
+        )
+        if dma_ids is not None:
+            stmt = stmt.where(fmd.dma_id.in_(dma_ids))
+        if platform_ids is not None:
+            stmt = stmt.where(fmd.platform_id.in_(platform_ids))
+        rows = (await self._session.execute(stmt)).all()
+        return rows_to_columns(rows, (np.int64, np.int64, np.int64, np.float64))
+
+    async def upsert_results(self, model_name: str, model_version: str, records: Iterable[tuple]) -> int:
+        """COPY result ``records`` (ordered as :data:`RESULT_COLUMNS`) and upsert on ``ux_model_result``."""
+
+        await self._session.execute(
+            text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {RESULTS_LOAD_TABLE} ("
+                " platform_id integer, dma_id integer, date_id integer,"
+                " predicted_sales double precision, attributed_sales double precision,"
+                " effect_size double precision, confidence_interval text, feature_importances text"
+                ") ON COMMIT DROP"
+            )
+        )
+        connection = await self._session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            RESULTS_LOAD_TABLE, records=records, columns=RESULT_COLUMNS
+        )
+        result = await self._session.execute(
+            text(
+                "INSERT INTO fact_model_results (model_name, model_version, platform_id, dma_id,"
+                " date_id, predicted_sales, attributed_sales, effect_size, confidence_interval,"
+                " feature_importances)"
+                " SELECT :model_name, :model_version, platform_id, dma_id, date_id,"
+                " predicted_sales, attributed_sales, effect_size,"
+                " confidence_interval::jsonb, feature_importances::jsonb"
+                f" FROM {RESULTS_LOAD_TABLE}"
+                " ON CONFLICT ON CONSTRAINT ux_model_result DO UPDATE SET"
+                " run_timestamp = now(),"
+                " predicted_sales = EXCLUDED.predicted_sales,"
+                " attributed_sales = EXCLUDED.attributed_sales,"
+                " effect_size = EXCLUDED.effect_size,"
+                " confidence_interval = EXCLUDED.confidence_interval,"
+                " feature_importances = EXCLUDED.feature_importances"
+            ),
+            {"model_name": model_name, "model_version": model_version},
+        )
+        await self._session.execute(text(f"TRUNCATE {RESULTS_LOAD_TABLE}"))
+        return result.rowcount
+
+    async def record_run(self, values: Mapping[str, object]) -> int:
+        """Insert a ``model_run`` row and return its ``run_id``."""
+
+        result = await self._session.execute(insert(ModelRun).values(**values).returning(ModelRun.run_id))
+        return result.scalar_one()
+
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import date
+
+from sqlalchemy import RowMapping, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.metrics import instrument_repository
+from app.models.marketing import DimAd, DimAdsetOrAdgroup, DimCampaign, FactMarketingDaily
+from app.repositories.dashboard import date_id_window
+
+SPEND_METRICS = ("spend", "impressions", "clicks", "conversions", "conversion_value")
+
+
+def _spend_columns(source=FactMarketingDaily) -> list:
+    return [func.coalesce(func.sum(getattr(source, name)), 0).label(name) for name in SPEND_METRICS]
+
+
+@instrument_repository
+class CampaignRepository:
+    """Keyset-paginated reads over the campaign → ad set → ad hierarchy.
+
+    Pages are ``id > :after ORDER BY id LIMIT :limit`` under the parent, served
+    by the ``(parent_id, id)`` indexes, so every page costs the same however
+    deep the client has paged.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def list_campaigns(
+        self, *, account_id: int | None = None, after: int | None = None, limit: int = 100
+    ) -> Sequence[DimCampaign]:
+        stmt = select(DimCampaign).order_by(DimCampaign.campaign_id).limit(limit)
+        if account_id is not None:
+            stmt = stmt.where(DimCampaign.account_id == account_id)
+        if after is not None:
+            stmt = stmt.where(DimCampaign.campaign_id > after)
+        result = await self._session.execute(stmt)
+        return result.scalars().all()
+
+    async def list_adsets(
+        self, campaign_id: int, *, after: int | None = None, limit: int = 100
+    ) -> Sequence[DimAdsetOrAdgroup]:
+        stmt = (
+            select(DimAdsetOrAdgroup)
+            .where(DimAdsetOrAdgroup.campaign_id == campaign_id)
+            .order_by(DimAdsetOrAdgroup.adset_id)
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(DimAdsetOrAdgroup.adset_id > after)
+        result = await self._session.execute(stmt)
+        return result.scalars().all()
+
+    async def list_ads(self, adset_id: int, *, after: int | None = None, limit: int = 100) -> Sequence[DimAd]:
+        stmt = select(DimAd).where(DimAd.adset_id == adset_id).order_by(DimAd.ad_id).limit(limit)
+        if after is not None:
+            stmt = stmt.where(DimAd.ad_id > after)
+        result = await self._session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_campaign(self, campaign_id: int) -> DimCampaign | None:
+        return await self._session.get(DimCampaign, campaign_id)
+
+    async def get_adset(self, adset_id: int) -> DimAdsetOrAdgroup | None:
+        return await self._session.get(DimAdsetOrAdgroup, adset_id)
+
+    async def spend_by(
+        self,
+        key: InstrumentedAttribute,
+        ids: Sequence[int],
+        start_date: date,
+        end_date: date,
+        *,
+        campaign_id: int | None = None,
+    ) -> dict[int, RowMapping]:
+        """Aggregate spend metrics for a page of ids in one grouped query.
+
+        ``key`` is the ``fact_marketing_daily`` column the ids belong to.
+        Passing the owning ``campaign_id`` for ad set and ad pages lets the
+        ``(campaign_id, date_id)`` index narrow the scan.
+        """
+
+        if not ids:
+            return {}
+        stmt = (
+            select(key.label("id"), *_spend_columns())
+            .where(key.in_(ids), date_id_window(FactMarketingDaily.date_id, start_date, end_date))
+            .group_by(key)
+        )
+        if campaign_id is not None:
+            stmt = stmt.where(FactMarketingDaily.campaign_id == campaign_id)
+        result = await self._session.execute(stmt)
+        return {row["id"]: row for row in result.mappings()}
+
+    async def campaign_tree(
+        self,
+        campaign_id: int,
+        *,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> Sequence[RowMapping]:
+        """Return the campaign's ad sets and ads as one flat, ordered result.
+
+        One row per ad (or per ad set without ads), ordered by ``adset_id``
+        then ``ad_id``. With a window, per-ad spend is aggregated in the same
+        statement and left-joined on, so the whole hierarchy is one round trip.
+        """
+
+        stmt = (
+            select(
+                DimAdsetOrAdgroup.adset_id,
+                DimAdsetOrAdgroup.external_adset_id,
+                DimAdsetOrAdgroup.adset_name,
+                DimAd.ad_id,
+                DimAd.external_ad_id,
+                DimAd.ad_name,
+            )
+            .select_from(DimAdsetOrAdgroup)
+            .outerjoin(DimAd, DimAd.adset_id == DimAdsetOrAdgroup.adset_id)
+            .where(DimAdsetOrAdgroup.campaign_id == campaign_id)
+            .order_by(DimAdsetOrAdgroup.adset_id, DimAd.ad_id)
+        )
+        if start_date is not None and end_date is not None:
+            fmd = FactMarketingDaily
+            spend = (
+                select(fmd.ad_id, *_spend_columns())
+                .where(fmd.campaign_id == campaign_id, date_id_window(fmd.date_id, start_date, end_date))
+                .group_by(fmd.ad_id)
+                .subquery("ad_spend")
+            )
+            stmt = stmt.outerjoin(spend, spend.c.ad_id == DimAd.ad_id).add_columns(
+                *(spend.c[name] for name in SPEND_METRICS)
+            )
+        result = await self._session.execute(stmt)
+        return result.mappings().all()
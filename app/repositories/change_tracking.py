@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, distinct, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import instrument_repository
+from app.models.marketing import (
+    EventIngestionLog,
+    ModelDirtyCell,
+    ModelRunWatermark,
+    StgShopifyDailyCity,
+)
+
+
+@instrument_repository
+class ChangeTrackingRepository:
+    """Record which ``(date_id, dma_id, platform_id)`` cells changed since a model's last run."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_watermark(self, model_name: str, model_version: str) -> ModelRunWatermark | None:
+        result = await self._session.execute(
+            select(ModelRunWatermark)
+            .where(
+                ModelRunWatermark.model_name == model_name,
+                ModelRunWatermark.model_version == model_version,
+            )
+            .with_for_update()
+        )
+        return result.scalar_one_or_none()
+
+    async def current_high_water(self, lag: timedelta) -> tuple[datetime | None, int | None]:
+        """Return the newest staging ``_ingested_at`` and ingestion ``log_id`` at least ``lag`` old.
+
+        Both are stamped when the writing transaction starts, not when it
+        commits, so a newer value being visible does not mean every older one
+        is. Stopping ``lag`` short of now leaves in-flight transactions to a
+        later run instead of skipping them.
+        """
+
+        cutoff = func.now() - lag
+        ingested_at = (
+            select(func.max(StgShopifyDailyCity._ingested_at))
+            .where(StgShopifyDailyCity._ingested_at <= cutoff)
+            .scalar_subquery()
+        )
+        log_id = (
+            select(func.max(EventIngestionLog.log_id))
+            .where(EventIngestionLog.sync_timestamp <= cutoff)
+            .scalar_subquery()
+        )
+        result = await self._session.execute(select(ingested_at, log_id))
+        return tuple(result.one())
+
+    async def save_watermark(
+        self,
+        model_name: str,
+        model_version: str,
+        last_ingested_at: datetime | None,
+        last_log_id: int | None,
+    ) -> None:
+        await self._session.execute(
+            text(
+                "INSERT INTO model_run_watermark (model_name, model_version, last_ingested_at, last_log_id)"
+                " VALUES (:model_name, :model_version, :last_ingested_at, :last_log_id)"
+                " ON CONFLICT ON CONSTRAINT model_run_watermark_pk DO UPDATE SET"
+                " last_ingested_at = EXCLUDED.last_ingested_at,"
+                " last_log_id = EXCLUDED.last_log_id,"
+                " updated_at = now()"
+            ),
+            {
+                "model_name": model_name,
+                "model_version": model_version,
+                "last_ingested_at": last_ingested_at,
+                "last_log_id": last_log_id,
+            },
+        )
+
+    async def capture_shopify_changes(
+        self,
+        model_name: str,
+        model_version: str,
+        since: datetime | None,
+        until: datetime | None,
+    ) -> int:
+        """Mark DMA-days whose apportioned Shopify revenue was (re)staged in ``(since, until]``."""
+
+        if until is None:
+            return 0
+        result = await self._session.execute(
+            text(
+                "INSERT INTO model_dirty_cell (model_name, model_version, date_id, dma_id, platform_id, source)"
+                " SELECT DISTINCT :model_name, :model_version, d.date_id, m.dma_id, NULL::integer, 'shopify'"
+                " FROM stg_shopify_daily_city stg"
+                " JOIN dim_date d ON d.date_actual = stg.date_id"
+                " JOIN map_city_dma m ON m.city_id = stg.city_id"
+                "  AND stg.date_id BETWEEN m.effective_start_date AND m.effective_end_date"
+                " WHERE stg._ingested_at <= :until"
+                "  AND (CAST(:since AS timestamp) IS NULL OR stg._ingested_at > :since)"
+            ),
+            {"model_name": model_name, "model_version": model_version, "since": since, "until": until},
+        )
+        return result.rowcount
+
+    async def capture_platform_changes(
+        self,
+        model_name: str,
+        model_version: str,
+        since_log_id: int | None,
+        until_log_id: int | None,
+    ) -> int:
+        """Mark platform x DMA-days that syncs logged in ``(since_log_id, until_log_id]`` changed.
+
+        Syncs rewrite a trailing window wholesale but record in
+        ``fact_cell_change`` only the cells whose totals differ, so an
+        unchanged restatement marks nothing.
+        """
+
+        if until_log_id is None:
+            return 0
+        result = await self._session.execute(
+            text(
+                "INSERT INTO model_dirty_cell (model_name, model_version, date_id, dma_id, platform_id, source)"
+                " SELECT DISTINCT :model_name, :model_version, c.date_id, c.dma_id, c.platform_id, 'platform_sync'"
+                " FROM fact_cell_change c"
+                " WHERE c.log_id > :since AND c.log_id <= :until"
+            ),
+            {
+                "model_name": model_name,
+                "model_version": model_version,
+                "since": since_log_id or 0,
+                "until": until_log_id,
+            },
+        )
+        return result.rowcount
+
+    async def dirty_dmas(
+        self, model_name: str, model_version: str, start_date_id: int, end_date_id: int
+    ) -> tuple[list[int], int | None]:
+        """Return the DMAs with dirty cells inside the window and the highest ``change_id`` seen.
+
+        Cells outside ``[start_date_id, end_date_id]`` cannot change that
+        window's fit, so they do not pull their DMA into the refit.
+        """
+
+        in_window = ModelDirtyCell.date_id.between(start_date_id, end_date_id)
+        result = await self._session.execute(
+            select(
+                func.array_agg(distinct(ModelDirtyCell.dma_id)).filter(in_window),
+                func.max(ModelDirtyCell.change_id),
+            ).where(
+                ModelDirtyCell.model_name == model_name,
+                ModelDirtyCell.model_version == model_version,
+            )
+        )
+        dma_ids, last_change_id = result.one()
+        return sorted(dma_ids or []), last_change_id
+
+    async def clear_dirty(
+        self, model_name: str, model_version: str, up_to_change_id: int, through_date_id: int
+    ) -> None:
+        """Drop cells up to ``up_to_change_id`` dated on or before ``through_date_id``.
+
+        Later cells are kept for a refresh whose window reaches them.
+        """
+
+        await self._session.execute(
+            delete(ModelDirtyCell).where(
+                ModelDirtyCell.model_name == model_name,
+                ModelDirtyCell.model_version == model_version,
+                ModelDirtyCell.change_id <= up_to_change_id,
+                ModelDirtyCell.date_id <= through_date_id,
+            )
+        )
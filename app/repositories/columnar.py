@@ -0,0 +1,14 @@
+"""Helpers for repositories that hand query results to numpy code."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+
+def rows_to_columns(rows: Sequence[tuple], dtypes: tuple[type, ...]) -> tuple[np.ndarray, ...]:
+    """Transpose result ``rows`` into one array per column, typed by ``dtypes``."""
+
+    if not rows:
+        return tuple(np.empty(0, dtype=dtype) for dtype in dtypes)
+    return tuple(np.asarray(column, dtype=dtype) for column, dtype in zip(zip(*rows), dtypes))
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import date
+
+from sqlalchemy import ColumnElement, RowMapping, and_, func, literal, null, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import instrument_repository
+from app.db.partitions import date_to_id
+from app.models.marketing import (
+    DimDate,
+    EventIngestionLog,
+    FactMarketingDaily,
+    FactShopifyDaily,
+    MapCityDMA,
+)
+from app.repositories.metric_availability import MetricAvailabilityMatrix, location_level
+from app.repositories.rollups import RollupRepository, aligned_rollups, choose_rollup
+
+# Marketing metrics summed per platform by :meth:`DashboardRepository.aggregate_stats`.
+DASHBOARD_METRICS = ("spend", "impressions", "clicks", "conversions", "conversion_value")
+
+
+def date_id_window(column, start_date: date, end_date: date) -> ColumnElement[bool]:
+    """Return a sargable ``BETWEEN`` on ``column`` for the given calendar window.
+
+    ``date_id`` is the ``yyyymmdd`` smart key of ``dim_date``, so the bounds are
+    literal integers. Filtering the fact table directly (rather than joining
+    ``dim_date``) keeps the predicate usable by the ``date_id`` indexes and lets
+    the planner prune monthly partitions at plan time.
+    """
+
+    return column.between(date_to_id(start_date), date_to_id(end_date))
+
+
+@instrument_repository
+class DashboardRepository:
+    """Aggregate queries over the marketing and Shopify fact tables."""
+
+    def __init__(self, session: AsyncSession, *, use_rollups: bool = True) -> None:
+        self._session = session
+        self._use_rollups = use_rollups
+
+    async def aggregate_stats(
+        self,
+        start_date: date,
+        end_date: date,
+        *,
+        platform_id: int | None = None,
+        country_id: int | None = None,
+        region_id: int | None = None,
+        dma_id: int | None = None,
+        availability: MetricAvailabilityMatrix | None = None,
+    ) -> Sequence[RowMapping]:
+        """Return one row per platform with spend metrics and window-wide Shopify totals.
+
+        Both fact tables are aggregated inside the database in a single statement:
+        marketing facts are grouped by platform, Shopify facts are summed over the
+        same window/geography, and the one-row Shopify aggregate is left-joined to
+        the platform rows so revenue is present even when there is no spend.
+
+        With an availability matrix, metrics no platform in scope reports at
+        the query's location level are returned as constant zeros instead of
+        being summed, platforms reporting none of the metrics are filtered
+        out, and when nothing is left the marketing aggregate and its join
+        are dropped altogether.
+        """
+
+        metrics, silent = DASHBOARD_METRICS, []
+        if availability is not None:
+            level = location_level(country_id, region_id, dma_id)
+            scope = None if platform_id is None else [platform_id]
+            metrics = availability.reported_metrics(level, DASHBOARD_METRICS, scope)
+            silent = availability.silent_platforms(level, DASHBOARD_METRICS, scope)
+
+        # Whole-week/month windows without sub-DMA geography filters are answered
+        # from the coarsest rollup built for the whole window instead of the daily grain.
+        grain = None
+        if self._use_rollups and country_id is None and region_id is None:
+            candidates = aligned_rollups(start_date, end_date)
+            if candidates:
+                coverage = await RollupRepository(self._session).coverage(candidates)
+                grain = choose_rollup(start_date, end_date, coverage)
+        if grain is not None:
+            source = grain.model
+            marketing_filters = [
+                source.period_start_id >= date_to_id(start_date),
+                source.period_end_id <= date_to_id(end_date),
+            ]
+        else:
+            source = FactMarketingDaily
+            marketing_filters = [date_id_window(source.date_id, start_date, end_date)]
+            if country_id is not None:
+                marketing_filters.append(source.country_id == country_id)
+            if region_id is not None:
+                marketing_filters.append(source.region_id == region_id)
+        if platform_id is not None:
+            marketing_filters.append(source.platform_id == platform_id)
+        if silent:
+            marketing_filters.append(source.platform_id.not_in(silent))
+        if dma_id is not None:
+            marketing_filters.append(source.dma_id == dma_id)
+
+        marketing = (
+            select(
+                source.platform_id,
+                *(
+                    (func.coalesce(func.sum(getattr(source, name)), 0) if name in metrics else literal(0)).label(name)
+                    for name in DASHBOARD_METRICS
+                ),
+            )
+            .where(*marketing_filters)
+            .group_by(source.platform_id)
+            .cte("marketing")
+        )
+
+        fsd = FactShopifyDaily
+        revenue = fsd.revenue
+        orders = fsd.orders
+        shop_query = select().select_from(fsd)
+        shop_filters = [date_id_window(fsd.date_id, start_date, end_date)]
+        if country_id is not None:
+            shop_filters.append(fsd.country_id == country_id)
+        if region_id is not None:
+            shop_filters.append(fsd.region_id == region_id)
+        if dma_id is not None:
+            # Shopify facts are city-grained; apportion them to the DMA using the
+            # city share that was in effect on each fact date.
+            shop_query = shop_query.join(
+                MapCityDMA,
+                and_(MapCityDMA.city_id == fsd.city_id, MapCityDMA.dma_id == dma_id),
+            ).join(DimDate, DimDate.date_id == fsd.date_id)
+            shop_filters.append(
+                DimDate.date_actual.between(
+                    MapCityDMA.effective_start_date, MapCityDMA.effective_end_date
+                )
+            )
+            revenue = revenue * MapCityDMA.dma_share
+            orders = orders * MapCityDMA.dma_share
+
+        shop = (
+            shop_query.add_columns(
+                func.coalesce(func.sum(revenue), 0).label("revenue"),
+                func.coalesce(func.sum(orders), 0).label("orders"),
+            )
+            .where(*shop_filters)
+            .cte("shop")
+        )
+
+        if not metrics:
+            # No platform in scope can report anything here: Shopify totals only.
+            stmt = select(null().label("platform_id"), shop.c.revenue, shop.c.orders)
+            result = await self._session.execute(stmt)
+            return result.mappings().all()
+
+        stmt = (
+            select(
+                marketing.c.platform_id,
+                marketing.c.spend,
+                marketing.c.impressions,
+                marketing.c.clicks,
+                marketing.c.conversions,
+                marketing.c.conversion_value,
+                shop.c.revenue,
+                shop.c.orders,
+            )
+            .select_from(shop.outerjoin(marketing, true()))
+            .order_by(marketing.c.platform_id)
+        )
+        result = await self._session.execute(stmt)
+        return result.mappings().all()
+
+    async def latest_sync_marker(self, platform_id: int | None = None) -> int | None:
+        """Return the id of the newest ingestion log entry, optionally for one platform."""
+
+        stmt = select(func.max(EventIngestionLog.log_id))
+        if platform_id is not None:
+            stmt = stmt.where(EventIngestionLog.platform_id == platform_id)
+        result = await self._session.execute(stmt)
+        return result.scalar_one_or_none()
@@ -0,0 +1,166 @@
+"""In-process cache translating external identifiers into dimension surrogate keys."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.loop_scope import LoopScoped
+from app.core.metrics import instrument_repository
+from app.models.marketing import DimAccount, DimCampaign, DimDMA, MapPlatformDMA
+from app.repositories.table_version import TableVersionRepository
+
+
+@dataclass(frozen=True)
+class _DimensionSpec:
+    name: str
+    table: str
+    row_id: InstrumentedAttribute
+    keys: tuple[InstrumentedAttribute, ...]
+    value: InstrumentedAttribute
+
+
+_SPECS = (
+    _DimensionSpec(
+        "account",
+        "dim_account",
+        DimAccount.account_id,
+        (DimAccount.platform_id, DimAccount.external_account_id),
+        DimAccount.account_id,
+    ),
+    _DimensionSpec(
+        "campaign",
+        "dim_campaign",
+        DimCampaign.campaign_id,
+        (DimCampaign.account_id, DimCampaign.external_campaign_id),
+        DimCampaign.campaign_id,
+    ),
+    _DimensionSpec(
+        "platform_dma",
+        "map_platform_dma",
+        MapPlatformDMA.id,
+        (MapPlatformDMA.platform_id, MapPlatformDMA.platform_dma_label),
+        MapPlatformDMA.dma_id,
+    ),
+    _DimensionSpec("dma_code", "dim_dma", DimDMA.dma_id, (DimDMA.dma_code,), DimDMA.dma_id),
+)
+
+
+@dataclass
+class _Dimension:
+    spec: _DimensionSpec
+    lookup: dict[Hashable, int] = field(default_factory=dict)
+    max_row_id: int = 0
+    # (version, rewrite_version) from table_version at last load.
+    version: tuple[int, int] | None = None
+    hits: int = 0
+    misses: int = 0
+    full_loads: int = 0
+    incremental_loads: int = 0
+
+    def get(self, key: Hashable) -> int | None:
+        value = self.lookup.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+
+@instrument_repository
+class DimensionCache:
+    """Preloaded lookups for the small, hot dimension tables.
+
+    Staleness is detected with a single read of the trigger-maintained
+    ``table_version`` rows. When only inserts moved a table's version, rows
+    past the highest cached surrogate key are loaded incrementally; updates,
+    deletes or truncates trigger a full reload of that table. Version checks
+    are throttled to ``check_interval`` seconds. A miss is not proof that the
+    key is unknown (a lower key may commit after a higher one was loaded), so
+    callers fall back to the database for misses.
+    """
+
+    def __init__(self, check_interval: float = 5.0) -> None:
+        self._dimensions = {spec.name: _Dimension(spec) for spec in _SPECS}
+        self._check_interval = check_interval
+        self._checked_at = float("-inf")
+        self._locks: LoopScoped[asyncio.Lock] = LoopScoped(asyncio.Lock)
+
+    async def refresh(self, session: AsyncSession, *, force: bool = False) -> None:
+        """Bring every dimension up to date if its version counter changed."""
+
+        if not force and time.monotonic() - self._checked_at < self._check_interval:
+            return
+        async with self._locks.get():
+            if not force and time.monotonic() - self._checked_at < self._check_interval:
+                return
+            versions = await TableVersionRepository(session).versions([spec.table for spec in _SPECS])
+            for dimension in self._dimensions.values():
+                version = versions[dimension.spec.table]
+                if force or dimension.version is None or version[1] != dimension.version[1]:
+                    await self._load(session, dimension, full=True)
+                elif version[0] != dimension.version[0]:
+                    await self._load(session, dimension, full=False)
+                dimension.version = version
+            self._checked_at = time.monotonic()
+
+    async def _load(self, session: AsyncSession, dimension: _Dimension, *, full: bool) -> None:
+        spec = dimension.spec
+        # Lowest row id first: for keys that are not unique (``map_platform_dma``)
+        # the cache resolves to the same row as the SQL fallback.
+        stmt = select(spec.row_id, spec.value, *spec.keys).order_by(spec.row_id)
+        if full:
+            lookup: dict[Hashable, int] = {}
+            max_row_id = 0
+            dimension.full_loads += 1
+        else:
+            stmt = stmt.where(spec.row_id > dimension.max_row_id)
+            lookup = dict(dimension.lookup)
+            max_row_id = dimension.max_row_id
+            dimension.incremental_loads += 1
+
+        result = await session.execute(stmt)
+        for row_id, value, *keys in result:
+            lookup.setdefault(keys[0] if len(keys) == 1 else tuple(keys), value)
+            max_row_id = max(max_row_id, row_id)
+        # Swap in a complete mapping so concurrent readers never see a partial load.
+        dimension.lookup = lookup
+        dimension.max_row_id = max_row_id
+
+    def account_id(self, platform_id: int, external_account_id: str) -> int | None:
+        return self._dimensions["account"].get((platform_id, external_account_id))
+
+    def campaign_id(self, account_id: int, external_campaign_id: str) -> int | None:
+        return self._dimensions["campaign"].get((account_id, external_campaign_id))
+
+    def dma_id_for_label(self, platform_id: int, platform_dma_label: str) -> int | None:
+        return self._dimensions["platform_dma"].get((platform_id, platform_dma_label))
+
+    def dma_id_for_code(self, dma_code: str) -> int | None:
+        return self._dimensions["dma_code"].get(dma_code)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return size and hit/miss/reload counters per dimension."""
+
+        return {
+            name: {
+                "size": len(dimension.lookup),
+                "hits": dimension.hits,
+                "misses": dimension.misses,
+                "full_loads": dimension.full_loads,
+                "incremental_loads": dimension.incremental_loads,
+            }
+            for name, dimension in self._dimensions.items()
+        }
+
+
+@lru_cache
+def get_dimension_cache() -> DimensionCache:
+    return DimensionCache()
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Column, and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import instrument_repository
+from app.models.export import ExportJob
+from app.models.marketing import FactMarketingDaily, FactShopifyDaily
+from app.repositories.dashboard import date_id_window
+from app.schemas.export import ExportDataset
+
+EXPORT_MODELS = {
+    ExportDataset.marketing_daily: FactMarketingDaily,
+    ExportDataset.shopify_daily: FactShopifyDaily,
+}
+
+
+@instrument_repository
+class ExportRepository:
+    """Server-side-cursor reads of raw fact rows for bulk extracts."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    @staticmethod
+    def columns(dataset: ExportDataset) -> list[Column]:
+        return list(EXPORT_MODELS[dataset].__table__.columns)
+
+    async def stream_batches(
+        self,
+        dataset: ExportDataset,
+        start_date: date,
+        end_date: date,
+        *,
+        batch_size: int,
+    ) -> AsyncIterator[Sequence[tuple]]:
+        """Yield fixed-size batches of plain row tuples without buffering the result set.
+
+        ``AsyncSession.stream`` keeps a server-side cursor open and ``yield_per``
+        bounds how many rows are fetched from it at a time.
+        """
+
+        table = EXPORT_MODELS[dataset].__table__
+        stmt = (
+            select(*table.columns)
+            .where(date_id_window(table.c.date_id, start_date, end_date))
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self._session.stream(stmt)
+        async for partition in result.partitions(batch_size):
+            yield [tuple(row) for row in partition]
+
+
+@instrument_repository
+class ExportJobRepository:
+    """Data access layer for :class:`~app.models.export.ExportJob`."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get(self, job_id: str) -> ExportJob | None:
+        return await self._session.get(ExportJob, job_id)
+
+    async def create(self, job: ExportJob) -> ExportJob:
+        self._session.add(job)
+        await self._session.flush()
+        return job
+
+    async def claim(self, job_id: str, *, lease: timedelta) -> ExportJob | None:
+        """Atomically move a pending, failed or abandoned job to ``running``.
+
+        A running job is abandoned when its heartbeat is older than ``lease``.
+        Returns ``None`` when the job is live on another worker or finished, so
+        a redelivered task does not upload the same export twice. The returned
+        job's ``started_at`` identifies this claim for :meth:`heartbeat` and
+        :meth:`finish`.
+        """
+
+        result = await self._session.execute(
+            update(ExportJob)
+            .where(
+                ExportJob.job_id == job_id,
+                or_(
+                    ExportJob.status.in_(("pending", "failed")),
+                    and_(ExportJob.status == "running", ExportJob.heartbeat_at < func.now() - lease),
+                ),
+            )
+            .values(status="running", started_at=func.now(), heartbeat_at=func.now(), error_message=None)
+            .returning(ExportJob)
+            # The returned claim token must win over a copy already in the session.
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def heartbeat(self, job_id: str, started_at: datetime) -> bool:
+        """Renew the lease of the claim made at ``started_at``; ``False`` once it was taken over."""
+
+        result = await self._session.execute(
+            update(ExportJob)
+            .where(ExportJob.job_id == job_id, ExportJob.status == "running", ExportJob.started_at == started_at)
+            .values(heartbeat_at=func.now())
+            .returning(ExportJob.job_id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def abandoned(self, lease: timedelta) -> list[str]:
+        """Return running jobs whose lease expired and pending jobs no worker picked up within it."""
+
+        result = await self._session.execute(
+            select(ExportJob.job_id)
+            .where(
+                or_(
+                    and_(ExportJob.status == "running", ExportJob.heartbeat_at < func.now() - lease),
+                    and_(ExportJob.status == "pending", ExportJob.created_at < func.now() - lease),
+                )
+            )
+            .order_by(ExportJob.created_at)
+        )
+        return list(result.scalars())
+
+    async def finish(
+        self,
+        job_id: str,
+        *,
+        status: str,
+        bytes_written: int | None = None,
+        parts_uploaded: int | None = None,
+        error_message: str | None = None,
+        started_at: datetime | None = None,
+    ) -> bool:
+        """Record the job's outcome; with ``started_at``, only if that claim still owns the job."""
+
+        stmt = update(ExportJob).where(ExportJob.job_id == job_id)
+        if started_at is not None:
+            stmt = stmt.where(ExportJob.status == "running", ExportJob.started_at == started_at)
+        result = await self._session.execute(
+            stmt.values(
+                status=status,
+                bytes_written=bytes_written,
+                parts_uploaded=parts_uploaded,
+                error_message=error_message,
+                finished_at=func.now(),
+            ).execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import date
+
+import numpy as np
+from sqlalchemy import ARRAY, Date, Integer, and_, any_, bindparam, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import instrument_repository
+from app.models.marketing import DimDate, FactShopifyDaily, MapCityDMA
+from app.repositories.columnar import rows_to_columns
+from app.repositories.dashboard import date_id_window
+
+
+@instrument_repository
+class GeoAllocationRepository:
+    """Reads behind city → DMA revenue allocation, in memory or fully in SQL."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def load_intervals(self) -> tuple[np.ndarray, ...]:
+        """Return ``(city_id, start_day, end_day, dma_id, dma_share)``; days since 1970-01-01."""
+
+        epoch = literal(date(1970, 1, 1), Date)
+        stmt = select(
+            MapCityDMA.city_id,
+            MapCityDMA.effective_start_date - epoch,
+            MapCityDMA.effective_end_date - epoch,
+            MapCityDMA.dma_id,
+            MapCityDMA.dma_share,
+        )
+        rows = (await self._session.execute(stmt)).all()
+        return rows_to_columns(rows, (np.int64, np.int64, np.int64, np.int64, np.float64))
+
+    async def load_shopify_city_facts(
+        self, start_date: date, end_date: date, *, city_ids: Sequence[int] | None = None
+    ) -> tuple[np.ndarray, ...]:
+        """Return ``(city_id, date_id, revenue, orders)`` columns of ``fact_shopify_daily``.
+
+        ``city_ids`` travels as one array parameter, so any number of cities
+        can be selected.
+        """
+
+        fsd = FactShopifyDaily
+        stmt = select(
+            fsd.city_id,
+            fsd.date_id,
+            func.coalesce(fsd.revenue, 0),
+            func.coalesce(fsd.orders, 0),
+        ).where(date_id_window(fsd.date_id, start_date, end_date), fsd.city_id.is_not(None))
+        if city_ids is not None:
+            stmt = stmt.where(fsd.city_id == any_(bindparam("city_ids", list(city_ids), type_=ARRAY(Integer))))
+        rows = (await self._session.execute(stmt)).all()
+        return rows_to_columns(rows, (np.int64, np.int64, np.float64, np.float64))
+
+    async def allocate_shopify_sql(
+        self, start_date: date, end_date: date, *, dma_ids: Sequence[int] | None = None
+    ) -> tuple[np.ndarray, ...]:
+        """Set-based allocation: ``(dma_id, date_id, revenue, orders)`` apportioned in one query.
+
+        The window predicate is served by ``ix_map_city_dma_city_window``.
+        """
+
+        fsd = FactShopifyDaily
+        stmt = (
+            select(
+                MapCityDMA.dma_id,
+                fsd.date_id,
+                func.coalesce(func.sum(fsd.revenue * MapCityDMA.dma_share), 0),
+                func.coalesce(func.sum(fsd.orders * MapCityDMA.dma_share), 0),
+            )
+            .select_from(fsd)
+            .join(DimDate, DimDate.date_id == fsd.date_id)
+            .join(
+                MapCityDMA,
+                and_(
+                    MapCityDMA.city_id == fsd.city_id,
+                    MapCityDMA.effective_start_date <= DimDate.date_actual,
+                    MapCityDMA.effective_end_date >= DimDate.date_actual,
+                ),
+            )
+            .where(date_id_window(fsd.date_id, start_date, end_date))
+            .group_by(MapCityDMA.dma_id, fsd.date_id)
+            .order_by(MapCityDMA.dma_id, fsd.date_id)
+        )
+        if dma_ids is not None:
+            stmt = stmt.where(MapCityDMA.dma_id.in_(dma_ids))
+        rows = (await self._session.execute(stmt)).all()
+        return rows_to_columns(rows, (np.int64, np.int64, np.float64, np.float64))
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import instrument_repository
+from app.models.marketing import EventIngestionLog
+
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+
+
+@instrument_repository
+class IngestionLogRepository:
+    """Data access layer for :class:`~app.models.marketing.EventIngestionLog`."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def record(
+        self,
+        *,
+        platform_id: int | None,
+        records_fetched: int,
+        status: str,
+        duration_seconds: float,
+        error_message: str | None = None,
+        run_id: str | None = None,
+        step: str | None = None,
+        date_id: int | None = None,
+    ) -> EventIngestionLog:
+        entry = EventIngestionLog(
+            platform_id=platform_id,
+            records_fetched=records_fetched,
+            status=status,
+            error_message=error_message,
+            duration_seconds=Decimal(f"{duration_seconds:.3f}"),
+            run_id=run_id,
+            step=step,
+            date_id=date_id,
+        )
+        self._session.add(entry)
+        await self._session.flush()
+        return entry
+
+    async def has_succeeded(self, run_id: str, step: str, platform_id: int | None, date_id: int | None) -> bool:
+        """Return whether ``step`` already completed for this run's ``(platform_id, date_id)`` key."""
+
+        result = await self._session.execute(
+            select(EventIngestionLog.log_id)
+            .where(
+                EventIngestionLog.run_id == run_id,
+                EventIngestionLog.step == step,
+                EventIngestionLog.platform_id.is_not_distinct_from(platform_id),
+                EventIngestionLog.date_id.is_not_distinct_from(date_id),
+                EventIngestionLog.status == STATUS_SUCCESS,
+            )
+            .limit(1)
+        )
+        return result.scalar_one_or_none() is not None
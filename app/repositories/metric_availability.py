@@ -0,0 +1,162 @@
+"""In-process bitset matrix of which metrics each platform reports at each location level."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.loop_scope import LoopScoped
+from app.core.metrics import instrument_repository
+from app.models.marketing import DimPlatform, MetricAvailability
+from app.repositories.table_version import TableVersionRepository
+
+# Metric columns of ``fact_marketing_daily``; a metric's position is its bit.
+MARKETING_METRICS = (
+    "spend",
+    "impressions",
+    "clicks",
+    "conversions",
+    "conversion_value",
+    "video_view_time",
+    "frequency",
+    "reach",
+    "add_to_cart",
+)
+_BITS = {metric: 1 << bit for bit, metric in enumerate(MARKETING_METRICS)}
+_ALL = (1 << len(MARKETING_METRICS)) - 1
+
+# Tables the matrix is built from; both are tracked in ``table_version``.
+_TABLES = ("metric_availability", "dim_platform")
+
+LEVEL_COUNTRY = "country"
+LEVEL_REGION = "region"
+LEVEL_DMA = "dma"
+
+
+def location_level(country_id: int | None = None, region_id: int | None = None, dma_id: int | None = None) -> str:
+    """Return the finest location level a query filters on; unfiltered queries read at country level."""
+
+    if dma_id is not None:
+        return LEVEL_DMA
+    if region_id is not None:
+        return LEVEL_REGION
+    return LEVEL_COUNTRY
+
+
+def metric_mask(metrics: Iterable[str]) -> int:
+    mask = 0
+    for metric in metrics:
+        mask |= _BITS[metric]
+    return mask
+
+
+class MetricAvailabilityMatrix:
+    """Immutable ``(platform, level) -> bitset`` snapshot of ``metric_availability``.
+
+    A ``(platform, level)`` pair with no rows is unknown and treated as
+    reporting every metric; once a pair has rows, only the metrics recorded
+    with ``is_available`` are considered reported.
+    """
+
+    def __init__(self, platform_ids: Sequence[int], masks: dict[tuple[int, str], int]) -> None:
+        self._platform_ids = tuple(platform_ids)
+        self._masks = masks
+
+    @classmethod
+    def build(
+        cls, platform_ids: Sequence[int], rows: Iterable[tuple[int, str, str, bool]]
+    ) -> MetricAvailabilityMatrix:
+        masks: dict[tuple[int, str], int] = {}
+        for platform_id, level, metric, is_available in rows:
+            key = (platform_id, level.strip().lower())
+            bit = _BITS.get(metric.strip().lower())
+            mask = masks.setdefault(key, 0)
+            if bit is not None and is_available:
+                masks[key] = mask | bit
+        return cls(platform_ids, masks)
+
+    @property
+    def platform_ids(self) -> tuple[int, ...]:
+        return self._platform_ids
+
+    def mask(self, platform_id: int, level: str) -> int:
+        return self._masks.get((platform_id, level), _ALL)
+
+    def is_available(self, platform_id: int, level: str, metric: str) -> bool:
+        return bool(self.mask(platform_id, level) & _BITS[metric])
+
+    def reported_metrics(
+        self, level: str, metrics: Sequence[str], platform_ids: Sequence[int] | None = None
+    ) -> tuple[str, ...]:
+        """Return the subset of ``metrics`` at least one platform in scope can report."""
+
+        union = 0
+        for platform_id in self._platform_ids if platform_ids is None else platform_ids:
+            union |= self.mask(platform_id, level)
+        return tuple(metric for metric in metrics if union & _BITS[metric])
+
+    def silent_platforms(
+        self, level: str, metrics: Sequence[str], platform_ids: Sequence[int] | None = None
+    ) -> list[int]:
+        """Return the platforms in scope that report none of ``metrics`` at ``level``."""
+
+        wanted = metric_mask(metrics)
+        scope = self._platform_ids if platform_ids is None else platform_ids
+        return [platform_id for platform_id in scope if not self.mask(platform_id, level) & wanted]
+
+
+@instrument_repository
+class MetricAvailabilityCache:
+    """Keeps the current :class:`MetricAvailabilityMatrix`, reloaded when its tables change.
+
+    Like :class:`~app.repositories.dimension_cache.DimensionCache`, staleness
+    is detected from the trigger-maintained ``table_version`` rows of
+    ``metric_availability`` and ``dim_platform``, which replicate with the
+    data, checked at most every ``check_interval`` seconds. Both tables are
+    tiny, so any change reloads the whole matrix.
+    """
+
+    def __init__(self, check_interval: float = 30.0) -> None:
+        self._matrix: MetricAvailabilityMatrix | None = None
+        self._version: dict[str, tuple[int, int]] | None = None
+        self._check_interval = check_interval
+        self._checked_at = float("-inf")
+        self._locks: LoopScoped[asyncio.Lock] = LoopScoped(asyncio.Lock)
+
+    @property
+    def matrix(self) -> MetricAvailabilityMatrix | None:
+        return self._matrix
+
+    async def refresh(self, session: AsyncSession, *, force: bool = False) -> MetricAvailabilityMatrix:
+        if not force and time.monotonic() - self._checked_at < self._check_interval:
+            return self._matrix
+        async with self._locks.get():
+            if not force and time.monotonic() - self._checked_at < self._check_interval:
+                return self._matrix
+            version = await TableVersionRepository(session).versions(_TABLES)
+            if force or self._matrix is None or version != self._version:
+                self._matrix = await self._load(session)
+                self._version = version
+            self._checked_at = time.monotonic()
+        return self._matrix
+
+    async def _load(self, session: AsyncSession) -> MetricAvailabilityMatrix:
+        platform_ids = (await session.execute(select(DimPlatform.platform_id))).scalars().all()
+        rows = await session.execute(
+            select(
+                MetricAvailability.platform_id,
+                MetricAvailability.location_level,
+                MetricAvailability.metric_name,
+                MetricAvailability.is_available,
+            )
+        )
+        return MetricAvailabilityMatrix.build(platform_ids, rows.all())
+
+
+@lru_cache
+def get_metric_availability() -> MetricAvailabilityCache:
+    return MetricAvailabilityCache()
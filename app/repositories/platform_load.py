@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import date
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import instrument_repository
+from app.db.partitions import date_to_id
+from app.models.marketing import DimAccount, DimPlatform
+
+LOAD_TABLE = "tmp_platform_insights"
+
+# Column order of the records handed to ``copy_records``.
+LOAD_COLUMNS = (
+    "account_id",
+    "date_id",
+    "external_campaign_id",
+    "campaign_name",
+    "external_adset_id",
+    "adset_name",
+    "external_ad_id",
+    "ad_name",
+    "dma_label",
+    "dma_id",
+    "country_iso2",
+    "currency_code",
+    "spend",
+    "impressions",
+    "clicks",
+    "conversions",
+    "conversion_value",
+    "video_view_time",
+    "frequency",
+    "reach",
+    "add_to_cart",
+)
+
+METRIC_COLUMNS = LOAD_COLUMNS[LOAD_COLUMNS.index("spend"):]
+
+# Per platform x DMA-day row counts and metric sums of the facts a rewrite
+# removed and wrote, compared by ``record_changed_cells``.
+CELLS_TABLE = "tmp_fact_cells"
+
+
+@instrument_repository
+class PlatformLoadRepository:
+    """Bulk loading of platform report rows into ``fact_marketing_daily``.
+
+    Pages are COPY'd into a session-local temp table as they arrive; dimensions
+    and facts are then written from it with a handful of set-based statements.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def _driver_connection(self):
+        """Return the asyncpg connection backing the session's current transaction."""
+
+        connection = await self._session.connection()
+        raw = await connection.get_raw_connection()
+        return raw.driver_connection
+
+    async def get_platform(self, platform_id: int) -> DimPlatform | None:
+        return await self._session.get(DimPlatform, platform_id)
+
+    async def list_accounts(self, platform_id: int, account_ids: Sequence[int] | None = None) -> list[tuple[int, str]]:
+        stmt = select(DimAccount.account_id, DimAccount.external_account_id).where(
+            DimAccount.platform_id == platform_id, DimAccount.external_account_id.is_not(None)
+        )
+        if account_ids:
+            stmt = stmt.where(DimAccount.account_id.in_(account_ids))
+        result = await self._session.execute(stmt.order_by(DimAccount.account_id))
+        return [tuple(row) for row in result.all()]
+
+    async def create_load_table(self) -> None:
+        await self._session.execute(
+            text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {LOAD_TABLE} ("
+                " account_id integer NOT NULL,"
+                " date_id integer NOT NULL,"
+                " external_campaign_id text NOT NULL,"
+                " campaign_name text,"
+                " external_adset_id text NOT NULL,"
+                " adset_name text,"
+                " external_ad_id text NOT NULL,"
+                " ad_name text,"
+                " dma_label text,"
+                " dma_id integer,"
+                " country_iso2 text,"
+                " currency_code text,"
+                " spend numeric,"
+                " impressions bigint,"
+                " clicks bigint,"
+                " conversions bigint,"
+                " conversion_value numeric,"
+                " video_view_time bigint,"
+                " frequency numeric,"
+                " reach bigint,"
+                " add_to_cart bigint"
+                ") ON COMMIT DROP"
+            )
+        )
+
+    async def copy_records(self, records: Sequence[tuple]) -> int:
+        """Stream ``records`` (ordered as :data:`LOAD_COLUMNS`) into the load table via COPY."""
+
+        if not records:
+            return 0
+        driver = await self._driver_connection()
+        await driver.copy_records_to_table(LOAD_TABLE, records=records, columns=LOAD_COLUMNS)
+        return len(records)
+
+    async def upsert_hierarchy(self) -> None:
+        """Insert campaigns, ad sets and ads seen in the load table that are not yet dimensioned.
+
+        ``NOT EXISTS`` skips known keys cheaply; the unique keys with ``ON
+        CONFLICT DO NOTHING`` settle concurrent syncs inserting the same key.
+        """
+
+        await self._session.execute(
+            text(
+                "INSERT INTO dim_campaign (account_id, external_campaign_id, campaign_name)"
+                " SELECT DISTINCT ON (l.account_id, l.external_campaign_id)"
+                "  l.account_id, l.external_campaign_id, l.campaign_name"
+                f" FROM {LOAD_TABLE} l"
+                " WHERE NOT EXISTS (SELECT 1 FROM dim_campaign c"
+                "  WHERE c.account_id = l.account_id AND c.external_campaign_id = l.external_campaign_id)"
+                " ORDER BY l.account_id, l.external_campaign_id"
+                " ON CONFLICT (account_id, external_campaign_id) DO NOTHING"
+            )
+        )
+        await self._session.execute(
+            text(
+                "INSERT INTO dim_adset_or_adgroup (campaign_id, external_adset_id, adset_name)"
+                " SELECT DISTINCT ON (c.campaign_id, l.external_adset_id)"
+                "  c.campaign_id, l.external_adset_id, l.adset_name"
+                f" FROM {LOAD_TABLE} l"
+                " JOIN dim_campaign c ON c.account_id = l.account_id AND c.external_campaign_id = l.external_campaign_id"
+                " WHERE NOT EXISTS (SELECT 1 FROM dim_adset_or_adgroup s"
+                "  WHERE s.campaign_id = c.campaign_id AND s.external_adset_id = l.external_adset_id)"
+                " ORDER BY c.campaign_id, l.external_adset_id"
+                " ON CONFLICT (campaign_id, external_adset_id) DO NOTHING"
+            )
+        )
+        await self._session.execute(
+            text(
+                "INSERT INTO dim_ad (adset_id, external_ad_id, ad_name)"
+                " SELECT DISTINCT ON (s.adset_id, l.external_ad_id) s.adset_id, l.external_ad_id, l.ad_name"
+                f" FROM {LOAD_TABLE} l"
+                " JOIN dim_campaign c ON c.account_id = l.account_id AND c.external_campaign_id = l.external_campaign_id"
+                " JOIN dim_adset_or_adgroup s"
+                "  ON s.campaign_id = c.campaign_id AND s.external_adset_id = l.external_adset_id"
+                " WHERE NOT EXISTS (SELECT 1 FROM dim_ad a"
+                "  WHERE a.adset_id = s.adset_id AND a.external_ad_id = l.external_ad_id)"
+                " ORDER BY s.adset_id, l.external_ad_id"
+                " ON CONFLICT (adset_id, external_ad_id) DO NOTHING"
+            )
+        )
+
+    async def replace_facts(
+        self, platform_id: int, account_ids: Sequence[int], start_date: date, end_date: date
+    ) -> int:
+        """Replace the accounts' facts in the window with the load table's rows.
+
+        Platforms restate recent days rather than report changed rows, so the
+        synced window is rewritten wholesale for every account that was synced.
+        DMA labels already resolved from the dimension cache arrive as
+        ``dma_id``; only the rest are joined against ``map_platform_dma``.
+        Each DMA-day's totals before and after the rewrite are kept for
+        :meth:`record_changed_cells`.
+        """
+
+        params = {
+            "platform_id": platform_id,
+            "account_ids": list(account_ids),
+            "lo": date_to_id(start_date),
+            "hi": date_to_id(end_date),
+        }
+        await self._session.execute(
+            text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {CELLS_TABLE} ("
+                " platform_id integer NOT NULL, date_id integer NOT NULL, dma_id integer NOT NULL,"
+                " is_new boolean NOT NULL, row_count bigint NOT NULL,"
+                f" {', '.join(f'{col} numeric' for col in METRIC_COLUMNS)}"
+                ") ON COMMIT DROP"
+            )
+        )
+        metrics = ", ".join(METRIC_COLUMNS)
+        cell_totals = ", ".join(f"sum({col})" for col in METRIC_COLUMNS)
+        await self._session.execute(
+            text(
+                "WITH removed AS ("
+                " DELETE FROM fact_marketing_daily"
+                " WHERE platform_id = :platform_id AND account_id = ANY(:account_ids)"
+                "  AND date_id BETWEEN :lo AND :hi"
+                f" RETURNING date_id, dma_id, {metrics})"
+                f" INSERT INTO {CELLS_TABLE}"
+                f" SELECT :platform_id, date_id, dma_id, false, count(*), {cell_totals}"
+                " FROM removed WHERE dma_id IS NOT NULL GROUP BY date_id, dma_id"
+            ),
+            params,
+        )
+        result = await self._session.execute(
+            text(
+                "WITH written AS ("
+                " INSERT INTO fact_marketing_daily (platform_id, account_id, campaign_id, adset_id, ad_id,"
+                f" date_id, country_id, dma_id, currency_code, {metrics})"
+                " SELECT :platform_id, l.account_id, c.campaign_id, s.adset_id, a.ad_id,"
+                "  l.date_id, co.country_id, coalesce(l.dma_id, m.dma_id), l.currency_code,"
+                f" {', '.join(f'l.{col}' for col in METRIC_COLUMNS)}"
+                f" FROM {LOAD_TABLE} l"
+                " JOIN dim_campaign c ON c.account_id = l.account_id AND c.external_campaign_id = l.external_campaign_id"
+                " JOIN dim_adset_or_adgroup s"
+                "  ON s.campaign_id = c.campaign_id AND s.external_adset_id = l.external_adset_id"
+                " JOIN dim_ad a ON a.adset_id = s.adset_id AND a.external_ad_id = l.external_ad_id"
+                # Neither lookup key is unique, so each resolves to at most one
+                # row rather than fanning the fact out.
+                " LEFT JOIN LATERAL (SELECT co.country_id FROM dim_country co"
+                "  WHERE upper(co.iso2) = upper(l.country_iso2) ORDER BY co.country_id LIMIT 1) co ON true"
+                " LEFT JOIN LATERAL (SELECT m.dma_id FROM map_platform_dma m"
+                "  WHERE l.dma_id IS NULL AND m.platform_id = :platform_id AND m.platform_dma_label = l.dma_label"
+                "  ORDER BY m.id LIMIT 1) m ON true"
+                " WHERE l.date_id BETWEEN :lo AND :hi"
+                f" RETURNING date_id, dma_id, {metrics}),"
+                " cells AS ("
+                f" INSERT INTO {CELLS_TABLE}"
+                f" SELECT :platform_id, date_id, dma_id, true, count(*), {cell_totals}"
+                " FROM written WHERE dma_id IS NOT NULL GROUP BY date_id, dma_id)"
+                " SELECT count(*) FROM written"
+            ),
+            params,
+        )
+        await self._session.execute(text(f"TRUNCATE {LOAD_TABLE}"))
+        return result.scalar_one()
+
+    async def record_changed_cells(self, log_id: int) -> int:
+        """Log the DMA-days whose totals the rewrites since the last call changed.
+
+        A restated window mostly comes back unchanged; comparing each cell's
+        row count and metric sums before and after keeps those cells out of
+        ``fact_cell_change`` so incremental model refreshes skip them.
+        """
+
+        totals = ("row_count", *METRIC_COLUMNS)
+        before = ", ".join(f"sum({col}) FILTER (WHERE NOT is_new)" for col in totals)
+        after = ", ".join(f"sum({col}) FILTER (WHERE is_new)" for col in totals)
+        result = await self._session.execute(
+            text(
+                "INSERT INTO fact_cell_change (log_id, platform_id, date_id, dma_id)"
+                " SELECT :log_id, platform_id, date_id, dma_id"
+                f" FROM {CELLS_TABLE} GROUP BY platform_id, date_id, dma_id"
+                f" HAVING ({before}) IS DISTINCT FROM ({after})"
+            ),
+            {"log_id": log_id},
+        )
+        await self._session.execute(text(f"TRUNCATE {CELLS_TABLE}"))
+        return result.rowcount
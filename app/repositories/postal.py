@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import instrument_repository
+from app.models.marketing import MapPostalCityState
+
+LOAD_TABLE = "tmp_dim_postal"
+
+
+@instrument_repository
+class PostalRepository:
+    """Reads and bulk writes behind postal code resolution."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def load_mapping(self) -> Sequence[tuple[str, str, str, int | None]]:
+        """Return every ``(postal_code, city_name, state_code, city_id)``, backfilled rows first."""
+
+        result = await self._session.execute(
+            select(
+                MapPostalCityState.postal_code,
+                MapPostalCityState.city_name,
+                MapPostalCityState.state_code,
+                MapPostalCityState.city_id,
+            ).order_by(MapPostalCityState.city_id.is_(None), MapPostalCityState.id)
+        )
+        return result.all()
+
+    async def backfill_city_ids(self) -> int:
+        """Fill ``city_id`` for unresolved mapping rows in one ``UPDATE ... FROM``.
+
+        Distinct ``(city_name, state_code, country)`` keys are matched against
+        the dimensions once. The country comes from the postal code's shape
+        (``A9A`` is Canadian, everything else US) and the state matches either
+        the bare subdivision code or its ``CC-XX`` ISO form.
+        """
+
+        result = await self._session.execute(
+            text(
+                "UPDATE map_postal_city_state AS m"
+                " SET city_id = geo.city_id"
+                " FROM ("
+                "  SELECT DISTINCT ON (k.city_name_norm, k.state_code, k.country_iso2)"
+                "   k.city_name_norm, k.state_code, k.country_iso2, ci.city_id"
+                "  FROM (SELECT DISTINCT"
+                "         lower(regexp_replace(btrim(city_name), '\\s+', ' ', 'g')) AS city_name_norm,"
+                "         upper(btrim(state_code)) AS state_code,"
+                "         CASE WHEN upper(postal_code) ~ '^\\s*[A-Z][0-9][A-Z]' THEN 'CA' ELSE 'US' END"
+                "          AS country_iso2"
+                "        FROM map_postal_city_state WHERE city_id IS NULL) k"
+                "  JOIN dim_country c ON upper(c.iso2) = k.country_iso2"
+                "  JOIN dim_region r ON r.country_id = c.country_id"
+                "   AND upper(r.iso_subdivision) IN (k.state_code, k.country_iso2 || '-' || k.state_code)"
+                "  JOIN dim_city ci ON ci.region_id = r.region_id"
+                "   AND lower(regexp_replace(btrim(ci.city_name), '\\s+', ' ', 'g')) = k.city_name_norm"
+                "  ORDER BY k.city_name_norm, k.state_code, k.country_iso2, ci.city_id"
+                " ) AS geo"
+                " WHERE m.city_id IS NULL"
+                "  AND lower(regexp_replace(btrim(m.city_name), '\\s+', ' ', 'g')) = geo.city_name_norm"
+                "  AND upper(btrim(m.state_code)) = geo.state_code"
+                "  AND CASE WHEN upper(m.postal_code) ~ '^\\s*[A-Z][0-9][A-Z]' THEN 'CA' ELSE 'US' END"
+                "   = geo.country_iso2"
+            )
+        )
+        return result.rowcount
+
+    async def create_postals(self, postals: Sequence[tuple[int, str]]) -> int:
+        """Insert the ``(city_id, postal_code)`` pairs missing from ``dim_postal``.
+
+        Pairs are COPY'd into a temp table and inserted with one anti-join,
+        under the same transaction-scoped lock as the city placeholders.
+        """
+
+        if not postals:
+            return 0
+        await self._session.execute(
+            text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {LOAD_TABLE} (city_id integer NOT NULL, postal_code text NOT NULL)"
+                " ON COMMIT DROP"
+            )
+        )
+        connection = await self._session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            LOAD_TABLE, records=postals, columns=("city_id", "postal_code")
+        )
+        await self._session.execute(text("SELECT pg_advisory_xact_lock(hashtext('dim_postal'))"))
+        result = await self._session.execute(
+            text(
+                "INSERT INTO dim_postal (city_id, postal_code)"
+                f" SELECT DISTINCT t.city_id, t.postal_code FROM {LOAD_TABLE} t"
+                " WHERE NOT EXISTS ("
+                "  SELECT 1 FROM dim_postal p WHERE p.city_id = t.city_id AND p.postal_code = t.postal_code)"
+            )
+        )
+        await self._session.execute(text(f"TRUNCATE {LOAD_TABLE}"))
+        return result.rowcount
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import calendar
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import instrument_repository
+from app.db.partitions import date_to_id, id_to_date
+from app.models.marketing import AggMarketingMonthly, AggMarketingWeekly, FactMarketingDaily, RollupCoverage
+
+
+def _week_bounds(value: date) -> tuple[date, date]:
+    start = value - timedelta(days=value.weekday())
+    return start, start + timedelta(days=6)
+
+
+def _month_bounds(value: date) -> tuple[date, date]:
+    last_day = calendar.monthrange(value.year, value.month)[1]
+    return value.replace(day=1), value.replace(day=last_day)
+
+
+@dataclass(frozen=True)
+class RollupGrain:
+    name: str
+    model: type
+    # Postgres ``date_trunc`` field matching ``bounds``.
+    trunc: str
+    bounds: Callable[[date], tuple[date, date]]
+
+    def aligned(self, start_date: date, end_date: date) -> bool:
+        """Return ``True`` when the window is made of whole periods of this grain."""
+
+        return self.bounds(start_date)[0] == start_date and self.bounds(end_date)[1] == end_date
+
+    def covering(self, start_date: date, end_date: date) -> tuple[date, date]:
+        """Widen the window to whole periods."""
+
+        return self.bounds(start_date)[0], self.bounds(end_date)[1]
+
+
+WEEKLY = RollupGrain("weekly", AggMarketingWeekly, "week", _week_bounds)
+MONTHLY = RollupGrain("monthly", AggMarketingMonthly, "month", _month_bounds)
+
+# Coarsest first; the query layer uses the first grain aligned with the window.
+ROLLUP_GRAINS = (MONTHLY, WEEKLY)
+
+
+def aligned_rollups(start_date: date, end_date: date) -> list[RollupGrain]:
+    """Return the grains whose whole periods make up the window, coarsest first."""
+
+    return [grain for grain in ROLLUP_GRAINS if grain.aligned(start_date, end_date)]
+
+
+def choose_rollup(
+    start_date: date, end_date: date, coverage: Mapping[str, tuple[date, date]]
+) -> RollupGrain | None:
+    """Return the coarsest aligned grain whose built range covers the window.
+
+    Windows reaching outside a grain's coverage (never backfilled, or newer
+    than its last refresh) must be answered from the daily facts.
+    """
+
+    for grain in aligned_rollups(start_date, end_date):
+        covered = coverage.get(grain.name)
+        if covered is not None and covered[0] <= start_date and end_date <= covered[1]:
+            return grain
+    return None
+
+
+@instrument_repository
+class RollupRepository:
+    """Incremental maintenance of the weekly and monthly ``fact_marketing_daily`` rollups.
+
+    ``rollup_coverage`` records the contiguous range each grain has been built
+    for; the dashboard only reads a rollup for windows inside it.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def refresh(self, grain: RollupGrain, start_date: date, end_date: date) -> int:
+        """Rebuild every period of ``grain`` overlapping the window; returns rows written.
+
+        Affected periods are deleted and re-aggregated from the daily facts in
+        one pass, so a period is always consistent with the facts it covers.
+        """
+
+        period_start, period_end = grain.covering(start_date, end_date)
+        table = grain.model.__tablename__
+        params = {"lo": date_to_id(period_start), "hi": date_to_id(period_end)}
+        await self._session.execute(
+            text(f"DELETE FROM {table} WHERE period_start_id >= :lo AND period_end_id <= :hi"),
+            params,
+        )
+        period = f"date_trunc('{grain.trunc}', to_date(f.date_id::text, 'YYYYMMDD'))"
+        result = await self._session.execute(
+            text(
+                f"INSERT INTO {table} (period_start_id, period_end_id, platform_id, campaign_id, dma_id,"
+                " spend, impressions, clicks, conversions, conversion_value)"
+                f" SELECT to_char({period}, 'YYYYMMDD')::integer,"
+                f"  to_char({period} + interval '1 {grain.trunc}' - interval '1 day', 'YYYYMMDD')::integer,"
+                "  f.platform_id, f.campaign_id, f.dma_id,"
+                "  sum(f.spend), sum(f.impressions), sum(f.clicks), sum(f.conversions), sum(f.conversion_value)"
+                " FROM fact_marketing_daily f"
+                " WHERE f.date_id BETWEEN :lo AND :hi"
+                " GROUP BY 1, 2, f.platform_id, f.campaign_id, f.dma_id"
+            ),
+            params,
+        )
+        return result.rowcount
+
+    async def coverage(
+        self, grains: Sequence[RollupGrain] = ROLLUP_GRAINS, *, for_update: bool = False
+    ) -> dict[str, tuple[date, date]]:
+        """Return the built ``(start, end)`` range per grain; unbuilt grains are absent.
+
+        ``for_update`` locks the rows so concurrent refreshes extend the
+        coverage one after the other.
+        """
+
+        stmt = select(RollupCoverage.grain, RollupCoverage.start_date_id, RollupCoverage.end_date_id).where(
+            RollupCoverage.grain.in_([grain.name for grain in grains])
+        )
+        if for_update:
+            stmt = stmt.with_for_update()
+        result = await self._session.execute(stmt)
+        return {name: (id_to_date(start_id), id_to_date(end_id)) for name, start_id, end_id in result}
+
+    async def save_coverage(self, grain: RollupGrain, start_date: date, end_date: date) -> None:
+        await self._session.execute(
+            text(
+                "INSERT INTO rollup_coverage (grain, start_date_id, end_date_id) VALUES (:grain, :lo, :hi)"
+                " ON CONFLICT (grain) DO UPDATE SET start_date_id = EXCLUDED.start_date_id,"
+                " end_date_id = EXCLUDED.end_date_id, updated_at = now()"
+            ),
+            {"grain": grain.name, "lo": date_to_id(start_date), "hi": date_to_id(end_date)},
+        )
+
+    async def fact_date_range(self) -> tuple[date, date] | None:
+        """Return the first and last day with marketing facts, or ``None`` when there are none."""
+
+        result = await self._session.execute(
+            select(func.min(FactMarketingDaily.date_id), func.max(FactMarketingDaily.date_id))
+        )
+        lo, hi = result.one()
+        return None if lo is None else (id_to_date(lo), id_to_date(hi))
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import instrument_repository
+
+LOAD_TABLE = "tmp_stg_shopify_daily_city"
+
+# Staging is city-grained, so promoted facts hang off one placeholder postal per city.
+CITY_LEVEL_POSTAL_CODE = "*"
+
+# Column order of the records handed to ``copy_records``.
+LOAD_COLUMNS = (
+    "_row_no",
+    "date_id",
+    "platform_id",
+    "account_id",
+    "country_iso2",
+    "region_code",
+    "city_name_norm",
+    "orders",
+    "gross_sales",
+    "refunds",
+    "shipping",
+    "_source_file",
+)
+
+_KEY_COLUMNS = ("date_id", "account_id", "country_iso2", "region_code", "city_name_norm")
+_VALUE_COLUMNS = ("platform_id", "orders", "gross_sales", "refunds", "shipping")
+
+
+@instrument_repository
+class StagingRepository:
+    """Bulk loading into ``stg_shopify_daily_city`` through a session-local temp table."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def _driver_connection(self):
+        """Return the asyncpg connection backing the session's current transaction."""
+
+        connection = await self._session.connection()
+        raw = await connection.get_raw_connection()
+        return raw.driver_connection
+
+    async def create_load_table(self) -> None:
+        await self._session.execute(
+            text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {LOAD_TABLE} ("
+                " _row_no bigint NOT NULL,"
+                " date_id date NOT NULL,"
+                " platform_id integer NOT NULL,"
+                " account_id integer NOT NULL,"
+                " country_iso2 text NOT NULL,"
+                " region_code text NOT NULL,"
+                " city_name_norm text NOT NULL,"
+                " orders numeric(18, 4),"
+                " gross_sales numeric(18, 4),"
+                " refunds numeric(18, 4),"
+                " shipping numeric(18, 4),"
+                " _source_file text"
+                ") ON COMMIT DROP"
+            )
+        )
+
+    async def copy_records(self, records: Sequence[tuple]) -> int:
+        """Stream ``records`` (ordered as :data:`LOAD_COLUMNS`) into the load table via COPY."""
+
+        if not records:
+            return 0
+        driver = await self._driver_connection()
+        await driver.copy_records_to_table(LOAD_TABLE, records=records, columns=LOAD_COLUMNS)
+        return len(records)
+
+    async def merge_load_table(self) -> int:
+        """Upsert the load table into ``stg_shopify_daily_city`` and return affected rows.
+
+        Duplicate keys within a load keep the last occurrence. Rows whose values
+        did not change are left untouched so ``_ingested_at`` only moves for new
+        or restated data.
+        """
+
+        keys = ", ".join(_KEY_COLUMNS)
+        columns = ", ".join((*_KEY_COLUMNS, *_VALUE_COLUMNS, "_source_file"))
+        updates = ", ".join(f"{col} = EXCLUDED.{col}" for col in (*_VALUE_COLUMNS, "_source_file"))
+        current = ", ".join(f"stg.{col}" for col in _VALUE_COLUMNS)
+        incoming = ", ".join(f"EXCLUDED.{col}" for col in _VALUE_COLUMNS)
+        result = await self._session.execute(
+            text(
+                f"INSERT INTO stg_shopify_daily_city AS stg ({columns})"
+                f" SELECT DISTINCT ON ({keys}) {columns} FROM {LOAD_TABLE}"
+                f" ORDER BY {keys}, _row_no DESC"
+                " ON CONFLICT ON CONSTRAINT stg_shopify_daily_city_pk DO UPDATE"
+                f" SET {updates}, _ingested_at = now()"
+                f" WHERE ({current}) IS DISTINCT FROM ({incoming})"
+            )
+        )
+        await self._session.execute(text(f"TRUNCATE {LOAD_TABLE}"))
+        return result.rowcount
+
+    async def defer_constraints(self) -> None:
+        """Defer the staging table's deferrable FKs to the end of the current transaction."""
+
+        await self._session.execute(text("SET CONSTRAINTS ALL DEFERRED"))
+
+    async def resolve_geography(self, start_date: date, end_date: date) -> int:
+        """Fill ``country_id``/``region_id``/``city_id`` for unresolved staging rows.
+
+        Distinct raw geography keys are resolved against the dimensions with one
+        set of joins and applied back to staging in a single ``UPDATE ... FROM``.
+        Regions match either the bare subdivision code or its ``CC-XX`` ISO form.
+        """
+
+        result = await self._session.execute(
+            text(
+                "UPDATE stg_shopify_daily_city AS stg"
+                " SET country_id = geo.country_id, region_id = geo.region_id, city_id = geo.city_id"
+                " FROM ("
+                "  SELECT DISTINCT ON (k.country_iso2, k.region_code, k.city_name_norm)"
+                "   k.country_iso2, k.region_code, k.city_name_norm,"
+                "   c.country_id, r.region_id, ci.city_id"
+                "  FROM (SELECT DISTINCT country_iso2, region_code, city_name_norm"
+                "        FROM stg_shopify_daily_city"
+                "        WHERE city_id IS NULL AND date_id BETWEEN :start_date AND :end_date) k"
+                "  JOIN dim_country c ON upper(c.iso2) = k.country_iso2"
+                "  LEFT JOIN dim_region r ON r.country_id = c.country_id"
+                "   AND upper(r.iso_subdivision) IN (k.region_code, k.country_iso2 || '-' || k.region_code)"
+                "  LEFT JOIN dim_city ci ON ci.region_id = r.region_id"
+                "   AND lower(regexp_replace(btrim(ci.city_name), '\\s+', ' ', 'g')) = k.city_name_norm"
+                "  ORDER BY k.country_iso2, k.region_code, k.city_name_norm, ci.city_id NULLS LAST, r.region_id"
+                " ) AS geo"
+                " WHERE stg.city_id IS NULL"
+                "  AND stg.date_id BETWEEN :start_date AND :end_date"
+                "  AND stg.country_iso2 = geo.country_iso2"
+                "  AND stg.region_code = geo.region_code"
+                "  AND stg.city_name_norm = geo.city_name_norm"
+            ),
+            {"start_date": start_date, "end_date": end_date},
+        )
+        return result.rowcount
+
+    async def ensure_city_postals(self, start_date: date, end_date: date) -> int:
+        """Create the city-level placeholder ``dim_postal`` row for newly resolved cities.
+
+        Date chunks may be promoted concurrently; the transaction-scoped lock
+        stops two of them inserting the same placeholder.
+        """
+
+        await self._session.execute(text("SELECT pg_advisory_xact_lock(hashtext('dim_postal'))"))
+        result = await self._session.execute(
+            text(
+                "INSERT INTO dim_postal (city_id, postal_code)"
+                " SELECT DISTINCT stg.city_id, :postal_code FROM stg_shopify_daily_city stg"
+                " WHERE stg.city_id IS NOT NULL AND stg.date_id BETWEEN :start_date AND :end_date"
+                "  AND NOT EXISTS ("
+                "   SELECT 1 FROM dim_postal p"
+                "   WHERE p.city_id = stg.city_id AND p.postal_code = :postal_code)"
+            ),
+            {"start_date": start_date, "end_date": end_date, "postal_code": CITY_LEVEL_POSTAL_CODE},
+        )
+        return result.rowcount
+
+    async def upsert_shopify_facts(self, start_date: date, end_date: date) -> int:
+        """Aggregate resolved staging rows into ``fact_shopify_daily`` for the window."""
+
+        result = await self._session.execute(
+            text(
+                "INSERT INTO fact_shopify_daily"
+                " (date_id, country_id, region_id, city_id, postal_id, orders, revenue)"
+                " SELECT d.date_id, stg.country_id, stg.region_id, stg.city_id, p.postal_id,"
+                "  round(sum(coalesce(stg.orders, 0)))::bigint,"
+                "  sum(coalesce(stg.gross_sales, 0) - coalesce(stg.refunds, 0))"
+                " FROM stg_shopify_daily_city stg"
+                " JOIN dim_date d ON d.date_actual = stg.date_id"
+                " JOIN dim_postal p ON p.city_id = stg.city_id AND p.postal_code = :postal_code"
+                " WHERE stg.city_id IS NOT NULL AND stg.date_id BETWEEN :start_date AND :end_date"
+                " GROUP BY d.date_id, stg.country_id, stg.region_id, stg.city_id, p.postal_id"
+                " ON CONFLICT ON CONSTRAINT ux_fact_shopify_daily_grain DO UPDATE"
+                " SET country_id = EXCLUDED.country_id, region_id = EXCLUDED.region_id,"
+                "  orders = EXCLUDED.orders, revenue = EXCLUDED.revenue"
+            ),
+            {"start_date": start_date, "end_date": end_date, "postal_code": CITY_LEVEL_POSTAL_CODE},
+        )
+        return result.rowcount
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import instrument_repository
+from app.models.marketing import TableVersion
+
+
+@instrument_repository
+class TableVersionRepository:
+    """Reads the trigger-maintained change counters in ``table_version``.
+
+    The counters are bumped inside the writing transaction, so they are
+    consistent with whatever snapshot the session reads (including a hot
+    standby, which replays them with the rows they describe).
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def versions(self, tables: Sequence[str]) -> dict[str, tuple[int, int]]:
+        """Return ``(version, rewrite_version)`` per table; untracked tables report ``(0, 0)``."""
+
+        result = await self._session.execute(
+            select(TableVersion.table_name, TableVersion.version, TableVersion.rewrite_version).where(
+                TableVersion.table_name.in_(tables)
+            )
+        )
+        found = {name: (version, rewrite) for name, version, rewrite in result}
+        return {table: found.get(table, (0, 0)) for table in tables}
@@ -3,9 +3,11 @@ from __future__ import annotations
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.metrics import instrument_repository
 from app.models.user import User
 
 
+@instrument_repository
 class UserRepository:
     """Data access layer for :class:`~app.models.user.User`."""
 
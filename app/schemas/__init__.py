@@ -1,5 +1,70 @@
 """Pydantic schemas shared across the API."""
 
+from app.schemas.auth import CurrentUser, LoginRequest, Token
+from app.schemas.batch import (
+    AdsetsQuery,
+    AdsQuery,
+    BatchQuery,
+    BatchRequest,
+    BatchResponse,
+    BatchResult,
+    CampaignsQuery,
+    CampaignTreeQuery,
+    StatsQuery,
+)
+from app.schemas.campaign import (
+    AdOut,
+    AdPage,
+    AdsetOut,
+    AdsetPage,
+    AdsetTree,
+    CampaignOut,
+    CampaignPage,
+    CampaignTree,
+    ListingParams,
+    SpendSummary,
+)
+from app.schemas.dashboard import DashboardFilters, DashboardStats, PlatformStats
+from app.schemas.export import (
+    ExportDataset,
+    ExportFormat,
+    ExportJobOut,
+    ExportJobStatus,
+    ExportRequest,
+)
 from app.schemas.user import UserCreate, UserOut
 
-__all__ = ["UserCreate", "UserOut"]
+__all__ = [
+    "AdOut",
+    "AdPage",
+    "AdsQuery",
+    "AdsetOut",
+    "AdsetPage",
+    "AdsetTree",
+    "AdsetsQuery",
+    "BatchQuery",
+    "BatchRequest",
+    "BatchResponse",
+    "BatchResult",
+    "CampaignOut",
+    "CampaignPage",
+    "CampaignTree",
+    "CampaignTreeQuery",
+    "CampaignsQuery",
+    "CurrentUser",
+    "DashboardFilters",
+    "DashboardStats",
+    "ExportDataset",
+    "ExportFormat",
+    "ExportJobOut",
+    "ExportJobStatus",
+    "ExportRequest",
+    "ListingParams",
+    "LoginRequest",
+    "PlatformStats",
+    "SpendSummary",
+    "StatsQuery",
+    "Token",
+    "UserCreate",
+    "UserOut",
+]
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, EmailStr, Field
+
+
+class LoginRequest(BaseModel):
+    email: EmailStr = Field(..., description="Account email address")
+    password: str = Field(..., description="Account password")
+
+
+class Token(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int = Field(..., description="Token lifetime in seconds")
+
+
+class CurrentUser(BaseModel):
+    """Identity carried in the access token's claims; no database lookup is needed to build it."""
+
+    id: int
+    email: EmailStr
+    is_active: bool
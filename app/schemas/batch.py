@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Annotated, Any, Literal, Union
+
+from pydantic import BaseModel, Field
+
+from app.schemas.campaign import ListingParams
+from app.schemas.dashboard import DashboardFilters
+
+
+class StatsQuery(DashboardFilters):
+    kind: Literal["stats"]
+
+
+class CampaignsQuery(ListingParams):
+    kind: Literal["campaigns"]
+    account_id: int | None = Field(None, description="Restrict to a single ad account")
+
+
+class AdsetsQuery(ListingParams):
+    kind: Literal["adsets"]
+    campaign_id: int
+
+
+class AdsQuery(ListingParams):
+    kind: Literal["ads"]
+    adset_id: int
+
+
+class CampaignTreeQuery(BaseModel):
+    kind: Literal["campaign_tree"]
+    campaign_id: int
+    start_date: date | None = Field(None, description="First day (inclusive) of the spend window")
+    end_date: date | None = Field(None, description="Last day (inclusive) of the spend window")
+
+
+BatchQuery = Annotated[
+    Union[StatsQuery, CampaignsQuery, AdsetsQuery, AdsQuery, CampaignTreeQuery],
+    Field(discriminator="kind"),
+]
+
+
+class BatchRequest(BaseModel):
+    queries: dict[str, BatchQuery] = Field(..., description="Named query specs; names key the response")
+
+
+class BatchResult(BaseModel):
+    status_code: int = Field(..., description="HTTP status the query would have returned on its own")
+    data: dict[str, Any] | None = None
+    detail: Any = Field(None, description="Error detail when status_code is not 200")
+    duration_ms: float
+
+
+class BatchResponse(BaseModel):
+    results: dict[str, BatchResult]
+    duration_ms: float = Field(..., description="Wall time of the whole batch")
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from datetime import date
+
+from pydantic import BaseModel, Field
+
+
+class ListingParams(BaseModel):
+    after: int | None = Field(None, description="Keyset cursor: return rows whose id is greater than this")
+    limit: int = Field(100, ge=1, le=1000, description="Maximum rows per page")
+    include_spend: bool = Field(False, description="Aggregate spend over the window for every row on the page")
+    start_date: date | None = Field(None, description="First day (inclusive) of the spend window")
+    end_date: date | None = Field(None, description="Last day (inclusive) of the spend window")
+
+
+class SpendSummary(BaseModel):
+    spend: float = 0.0
+    impressions: int = 0
+    clicks: int = 0
+    conversions: int = 0
+    conversion_value: float = 0.0
+
+
+class CampaignOut(BaseModel):
+    campaign_id: int
+    account_id: int
+    external_campaign_id: str | None = None
+    campaign_name: str | None = None
+    spend: SpendSummary | None = None
+
+
+class AdsetOut(BaseModel):
+    adset_id: int
+    campaign_id: int
+    external_adset_id: str | None = None
+    adset_name: str | None = None
+    spend: SpendSummary | None = None
+
+
+class AdOut(BaseModel):
+    ad_id: int
+    adset_id: int
+    external_ad_id: str | None = None
+    ad_name: str | None = None
+    spend: SpendSummary | None = None
+
+
+class CampaignPage(BaseModel):
+    items: list[CampaignOut]
+    next_after: int | None = Field(None, description="Cursor for the next page; absent on the last page")
+
+
+class AdsetPage(BaseModel):
+    items: list[AdsetOut]
+    next_after: int | None = Field(None, description="Cursor for the next page; absent on the last page")
+
+
+class AdPage(BaseModel):
+    items: list[AdOut]
+    next_after: int | None = Field(None, description="Cursor for the next page; absent on the last page")
+
+
+class AdsetTree(AdsetOut):
+    ads: list[AdOut] = Field(default_factory=list)
+
+
+class CampaignTree(CampaignOut):
+    adsets: list[AdsetTree] = Field(default_factory=list)
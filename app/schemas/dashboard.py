@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from datetime import date
+
+from pydantic import BaseModel, Field
+
+
+class DashboardFilters(BaseModel):
+    start_date: date = Field(..., description="First day (inclusive) of the reporting window")
+    end_date: date = Field(..., description="Last day (inclusive) of the reporting window")
+    platform_id: int | None = Field(None, description="Restrict to a single ad platform")
+    country_id: int | None = Field(None, description="Restrict to a single country")
+    region_id: int | None = Field(None, description="Restrict to a single region")
+    dma_id: int | None = Field(None, description="Restrict to a single DMA")
+
+
+class PlatformStats(BaseModel):
+    platform_id: int
+    spend: float
+    impressions: int
+    clicks: int
+    conversions: int
+    conversion_value: float
+    roas: float | None = Field(None, description="Platform-reported conversion value / spend")
+    cpa: float | None = Field(None, description="Spend / platform-reported conversions")
+
+
+class DashboardStats(BaseModel):
+    start_date: date
+    end_date: date
+    spend: float
+    impressions: int
+    clicks: int
+    conversions: int
+    revenue: float = Field(..., description="Shopify revenue over the same window and geography")
+    orders: int
+    roas: float | None = Field(None, description="Blended ROAS: Shopify revenue / total spend")
+    cpa: float | None = Field(None, description="Blended CPA: total spend / Shopify orders")
+    platforms: list[PlatformStats] = Field(default_factory=list)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class ExportDataset(str, Enum):
+    marketing_daily = "marketing_daily"
+    shopify_daily = "shopify_daily"
+
+
+class ExportFormat(str, Enum):
+    csv = "csv"
+    parquet = "parquet"
+
+
+class ExportRequest(BaseModel):
+    dataset: ExportDataset
+    start_date: date = Field(..., description="First day (inclusive) of the extract")
+    end_date: date = Field(..., description="Last day (inclusive) of the extract")
+    format: ExportFormat = Field(ExportFormat.csv, description="Output file format")
+    gzip: bool = Field(True, description="Compress the output (Parquet uses its internal gzip codec)")
+
+
+class ExportJobStatus(str, Enum):
+    pending = "pending"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class ExportJobOut(BaseModel):
+    job_id: str
+    status: ExportJobStatus
+    dataset: ExportDataset
+    format: ExportFormat
+    gzip: bool
+    start_date: date
+    end_date: date
+    bytes_written: int | None = None
+    error_message: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    download_url: str | None = Field(None, description="Presigned S3 URL, present once the job has succeeded")
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,35 @@
 """Business service layer."""
 
+from app.services.attribution_service import AttributionService
+from app.services.batch_service import BatchService
+from app.services.campaign_service import CampaignService
+from app.services.dashboard_service import DashboardService
+from app.services.etl_pipeline_service import EtlPipelineService
+from app.services.export_job_service import ExportJobService
+from app.services.export_service import ExportService
+from app.services.geo_allocation_service import GeoAllocationService
+from app.services.incremental_attribution_service import IncrementalAttributionService
+from app.services.platform_sync_service import PlatformSyncService
+from app.services.postal_resolution_service import PostalResolutionService
+from app.services.rollup_service import RollupService
+from app.services.shopify_ingestion_service import ShopifyIngestionService
+from app.services.shopify_promotion_service import ShopifyPromotionService
 from app.services.user_service import UserService
 
-__all__ = ["UserService"]
+__all__ = [
+    "AttributionService",
+    "BatchService",
+    "CampaignService",
+    "DashboardService",
+    "EtlPipelineService",
+    "ExportJobService",
+    "ExportService",
+    "GeoAllocationService",
+    "IncrementalAttributionService",
+    "PlatformSyncService",
+    "PostalResolutionService",
+    "RollupService",
+    "ShopifyIngestionService",
+    "ShopifyPromotionService",
+    "UserService",
+]
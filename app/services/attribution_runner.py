@@ -0,0 +1,186 @@
+"""Process-pool orchestration of attribution fits sharded by DMA.
+
+Each DMA's regression is independent, so contiguous DMA ranges are fitted in
+separate processes. The input and output cubes live in POSIX shared memory:
+workers attach by name, read their slice of spend/sales and write their slice
+of attributed/predicted sales in place, returning only the small per-DMA
+coefficient arrays. Nothing large is pickled across the process boundary.
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from app.services.attribution_engine import AttributionFit, AttributionInputs, fit_attribution
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """Picklable handle to an ndarray stored in a named shared-memory block."""
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+    def attach(self) -> tuple[SharedMemory, np.ndarray]:
+        block = SharedMemory(name=self.name)
+        return block, np.ndarray(self.shape, dtype=self.dtype, buffer=block.buf)
+
+
+@dataclass(frozen=True)
+class ShardTiming:
+    dma_start: int
+    dma_stop: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class _ShardOutput:
+    dma_start: int
+    dma_stop: int
+    coefficients: np.ndarray
+    intercept: np.ndarray
+    ci_lower: np.ndarray
+    ci_upper: np.ndarray
+    importances: np.ndarray
+    seconds: float
+
+
+def _allocate(stack: ExitStack, shape: tuple[int, ...], source: np.ndarray | None = None) -> SharedArray:
+    """Create a float64 shared block (released when ``stack`` closes), optionally filled from ``source``."""
+
+    size = max(int(np.prod(shape)) * np.dtype(np.float64).itemsize, 1)
+    block = SharedMemory(create=True, size=size)
+    stack.callback(block.unlink)
+    stack.callback(block.close)
+    array = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+    if source is None:
+        array.fill(0.0)
+    else:
+        array[...] = source
+    del array
+    return SharedArray(block.name, shape, np.dtype(np.float64).str)
+
+
+def _read(handle: SharedArray) -> np.ndarray:
+    block, view = handle.attach()
+    try:
+        return view.copy()
+    finally:
+        del view
+        block.close()
+
+
+def _fit_slice(
+    spend: np.ndarray,
+    sales: np.ndarray,
+    attributed: np.ndarray,
+    predicted: np.ndarray,
+    shard: slice,
+    decay: float,
+    ridge: float,
+) -> AttributionFit:
+    inputs = AttributionInputs(
+        platform_ids=np.arange(spend.shape[0]),
+        dma_ids=np.arange(shard.start, shard.stop),
+        date_ids=np.arange(spend.shape[2]),
+        spend=spend[:, shard],
+        sales=sales[shard],
+    )
+    fit = fit_attribution(inputs, decay=decay, ridge=ridge)
+    attributed[:, shard] = fit.attributed
+    predicted[shard] = fit.predicted
+    return fit
+
+
+def _fit_shard(
+    spend: SharedArray,
+    sales: SharedArray,
+    attributed: SharedArray,
+    predicted: SharedArray,
+    dma_start: int,
+    dma_stop: int,
+    decay: float,
+    ridge: float,
+) -> _ShardOutput:
+    started = time.perf_counter()
+    attached = [handle.attach() for handle in (spend, sales, attributed, predicted)]
+    try:
+        fit = _fit_slice(*(view for _, view in attached), slice(dma_start, dma_stop), decay, ridge)
+    finally:
+        blocks = [block for block, _ in attached]
+        # Views must be released before their blocks can be closed.
+        del attached
+        for block in blocks:
+            block.close()
+
+    return _ShardOutput(
+        dma_start=dma_start,
+        dma_stop=dma_stop,
+        coefficients=fit.coefficients,
+        intercept=fit.intercept,
+        ci_lower=fit.ci_lower,
+        ci_upper=fit.ci_upper,
+        importances=fit.importances,
+        seconds=time.perf_counter() - started,
+    )
+
+
+async def fit_attribution_parallel(
+    inputs: AttributionInputs,
+    *,
+    workers: int,
+    decay: float = 0.5,
+    ridge: float = 1e-3,
+) -> tuple[AttributionFit, list[ShardTiming]]:
+    """Fit ``inputs`` across ``workers`` processes, one contiguous DMA range each."""
+
+    num_platforms, num_dmas, num_days = inputs.spend.shape
+    bounds = np.linspace(0, num_dmas, min(workers, max(num_dmas, 1)) + 1, dtype=int)
+    shards = [(int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+    loop = asyncio.get_running_loop()
+    with ExitStack() as stack:
+        spend = _allocate(stack, inputs.spend.shape, inputs.spend)
+        sales = _allocate(stack, inputs.sales.shape, inputs.sales)
+        attributed = _allocate(stack, (num_platforms, num_dmas, num_days))
+        predicted = _allocate(stack, (num_dmas, num_days))
+
+        # "spawn" keeps the parent's event loop and open DB connections out of the workers.
+        pool = ProcessPoolExecutor(max_workers=len(shards) or 1, mp_context=multiprocessing.get_context("spawn"))
+        stack.callback(pool.shutdown)
+        outputs = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    pool, _fit_shard, spend, sales, attributed, predicted, lo, hi, decay, ridge
+                )
+                for lo, hi in shards
+            )
+        )
+        attributed_result = _read(attributed)
+        predicted_result = _read(predicted)
+
+    def merged(field: str, width: int) -> np.ndarray:
+        array = np.zeros((num_dmas, width)) if width else np.zeros(num_dmas)
+        for output in outputs:
+            array[output.dma_start : output.dma_stop] = getattr(output, field)
+        return array
+
+    fit = AttributionFit(
+        coefficients=merged("coefficients", num_platforms),
+        intercept=merged("intercept", 0),
+        ci_lower=merged("ci_lower", num_platforms),
+        ci_upper=merged("ci_upper", num_platforms),
+        predicted=predicted_result,
+        attributed=attributed_result,
+        importances=merged("importances", num_platforms),
+    )
+    timings = [ShardTiming(output.dma_start, output.dma_stop, output.seconds) for output in outputs]
+    return fit, timings
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.partitions import date_to_id
+from app.repositories.attribution import AttributionRepository
+from app.services.attribution_engine import AttributionFit, AttributionInputs, build_cube, fit_attribution
+from app.services.attribution_runner import ShardTiming, fit_attribution_parallel
+from app.services.geo_allocation_service import VALUE_COLUMNS, GeoAllocationService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = "geo_adstock_ridge"
+DEFAULT_MODEL_VERSION = "1"
+
+
+@dataclass(frozen=True)
+class AttributionRunResult:
+    model_name: str
+    model_version: str
+    platforms: int
+    dmas: int
+    days: int
+    rows_written: int
+    fit_seconds: float
+    shard_timings: list[ShardTiming] = field(default_factory=list)
+    run_id: int | None = None
+
+
+def date_axis(start_date: date, end_date: date) -> np.ndarray:
+    """Return the sorted ``date_id`` values for every day of the window."""
+
+    days = (end_date - start_date).days + 1
+    return np.fromiter(
+        (date_to_id(start_date + timedelta(days=offset)) for offset in range(days)),
+        dtype=np.int64,
+        count=days,
+    )
+
+
+def result_records(inputs: AttributionInputs, fit: AttributionFit) -> Iterator[tuple]:
+    """Yield ``fact_model_results`` rows (one per platform × DMA × day) for COPY.
+
+    Confidence intervals and importances are per platform × DMA, so their JSON
+    is rendered once per pair and shared by every day of that series.
+    """
+
+    num_days = len(inputs.date_ids)
+    date_ids = inputs.date_ids.tolist()
+    for d, dma_id in enumerate(inputs.dma_ids.tolist()):
+        importances = json.dumps(
+            {str(pid): round(share, 6) for pid, share in zip(inputs.platform_ids.tolist(), fit.importances[d].tolist())}
+        )
+        predicted = fit.predicted[d].tolist()
+        for p, platform_id in enumerate(inputs.platform_ids.tolist()):
+            effect = float(fit.coefficients[d, p])
+            interval = json.dumps(
+                {"level": 0.95, "lower": float(fit.ci_lower[d, p]), "upper": float(fit.ci_upper[d, p])}
+            )
+            yield from zip(
+                [platform_id] * num_days,
+                [dma_id] * num_days,
+                date_ids,
+                predicted,
+                fit.attributed[p, d].tolist(),
+                [effect] * num_days,
+                [interval] * num_days,
+                [importances] * num_days,
+            )
+
+
+def shard_timing_records(inputs: AttributionInputs, timings: Sequence[ShardTiming]) -> list[dict]:
+    """Render shard timings for ``model_run``, naming each shard's DMA id range."""
+
+    dma_ids = inputs.dma_ids.tolist()
+    return [
+        {
+            "dma_start": timing.dma_start,
+            "dma_stop": timing.dma_stop,
+            "first_dma_id": dma_ids[timing.dma_start],
+            "last_dma_id": dma_ids[timing.dma_stop - 1],
+            "seconds": round(timing.seconds, 6),
+        }
+        for timing in timings
+    ]
+
+
+class AttributionService:
+    """Fit the geo attribution model and persist its output to ``fact_model_results``.
+
+    Every run is recorded in ``model_run`` in the same transaction as its
+    results, including the per-shard fit timings of parallel runs.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._repo = AttributionRepository(session)
+        self._geo = GeoAllocationService(session)
+
+    async def load_inputs(
+        self,
+        start_date: date,
+        end_date: date,
+        *,
+        dma_ids: Sequence[int] | None = None,
+        platform_ids: Sequence[int] | None = None,
+    ) -> AttributionInputs:
+        spend_platform, spend_dma, spend_date, spend = await self._repo.load_spend(
+            start_date, end_date, dma_ids=dma_ids, platform_ids=platform_ids
+        )
+        # City revenue is apportioned to DMA-days through the cached interval
+        # index, reading only cities mapped to ``dma_ids``; DMAs outside the
+        # spend axis drop out of the cube.
+        sales = await self._geo.allocate_shopify(start_date, end_date, dma_ids=dma_ids)
+
+        platform_axis = np.unique(spend_platform)
+        dma_axis = np.unique(spend_dma)
+        days = date_axis(start_date, end_date)
+        return AttributionInputs(
+            platform_ids=platform_axis,
+            dma_ids=dma_axis,
+            date_ids=days,
+            spend=build_cube((platform_axis, dma_axis, days), (spend_platform, spend_dma, spend_date), spend),
+            sales=build_cube(
+                (dma_axis, days), (sales.dma_ids, sales.date_ids), sales.values[:, VALUE_COLUMNS.index("revenue")]
+            ),
+        )
+
+    async def run(
+        self,
+        start_date: date,
+        end_date: date,
+        *,
+        model_name: str = DEFAULT_MODEL_NAME,
+        model_version: str = DEFAULT_MODEL_VERSION,
+        dma_ids: Sequence[int] | None = None,
+        platform_ids: Sequence[int] | None = None,
+        workers: int | None = None,
+    ) -> AttributionRunResult:
+        """Fit and persist the model; ``workers > 1`` shards the fit by DMA across processes."""
+
+        if end_date < start_date:
+            raise ValueError("end_date must not be earlier than start_date.")
+        workers = workers or get_settings().ATTRIBUTION_WORKERS
+
+        inputs = await self.load_inputs(start_date, end_date, dma_ids=dma_ids, platform_ids=platform_ids)
+        started = time.perf_counter()
+        if workers > 1 and len(inputs.dma_ids) > 1:
+            fit, timings = await fit_attribution_parallel(inputs, workers=workers)
+        else:
+            fit, timings = await asyncio.to_thread(fit_attribution, inputs), []
+        fit_seconds = time.perf_counter() - started
+
+        # All shards are merged into one COPY + upsert in a single transaction.
+        rows = await self._repo.upsert_results(model_name, model_version, result_records(inputs, fit))
+        run_id = await self._repo.record_run(
+            {
+                "model_name": model_name,
+                "model_version": model_version,
+                "start_date_id": date_to_id(start_date),
+                "end_date_id": date_to_id(end_date),
+                "platforms": len(inputs.platform_ids),
+                "dmas": len(inputs.dma_ids),
+                "days": len(inputs.date_ids),
+                "workers": max(len(timings), 1),
+                "rows_written": rows,
+                "fit_seconds": round(fit_seconds, 6),
+                "shard_timings": shard_timing_records(inputs, timings),
+            }
+        )
+        await self._session.commit()
+        result = AttributionRunResult(
+            model_name=model_name,
+            model_version=model_version,
+            platforms=len(inputs.platform_ids),
+            dmas=len(inputs.dma_ids),
+            days=len(inputs.date_ids),
+            rows_written=rows,
+            fit_seconds=fit_seconds,
+            shard_timings=timings,
+            run_id=run_id,
+        )
+        logger.info(
+            "Attribution run %d (%s/%s) wrote %d rows; fit %.2fs over %d shard(s): %s",
+            run_id,
+            model_name,
+            model_version,
+            rows,
+            fit_seconds,
+            len(timings) or 1,
+            [(t.dma_start, t.dma_stop, round(t.seconds, 3)) for t in timings],
+        )
+        return result
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import ResponseCache
+from app.core.config import get_settings
+from app.schemas.batch import (
+    AdsetsQuery,
+    AdsQuery,
+    BatchRequest,
+    BatchResponse,
+    BatchResult,
+    CampaignsQuery,
+    CampaignTreeQuery,
+    StatsQuery,
+)
+from app.schemas.dashboard import DashboardFilters
+from app.services.campaign_service import CampaignService
+from app.services.dashboard_service import DashboardService
+
+logger = logging.getLogger(__name__)
+
+
+class BatchService:
+    """Run the independent queries of a dashboard page as one request.
+
+    Every query gets its own session from the read pool, so the queries
+    execute concurrently on separate connections and the batch takes about
+    as long as its slowest query. A semaphore caps how many queries, and so
+    connections, one batch runs at once; cached stats release the key
+    lookup's connection before computing on a fresh session. Failures are reported per query; the remaining
+    results are still returned.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        cache: ResponseCache | None = None,
+        concurrency: int | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._cache = cache
+        self._concurrency = concurrency or get_settings().BATCH_MAX_CONCURRENCY
+
+    async def run(self, request: BatchRequest) -> BatchResponse:
+        limit = get_settings().BATCH_MAX_QUERIES
+        if not request.queries:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="A batch needs at least one query.",
+            )
+        if len(request.queries) > limit:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"A batch may contain at most {limit} queries.",
+            )
+
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(min(self._concurrency, len(request.queries)))
+        names = list(request.queries)
+        results = await asyncio.gather(*(self._run_one(name, request.queries[name], semaphore) for name in names))
+        return BatchResponse(
+            results=dict(zip(names, results)),
+            duration_ms=(time.perf_counter() - started) * 1000,
+        )
+
+    async def _run_one(self, name: str, query: BaseModel, semaphore: asyncio.Semaphore) -> BatchResult:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                async with self._session_factory() as session:
+                    data = await self._execute(session, query)
+            except HTTPException as exc:
+                return BatchResult(
+                    status_code=exc.status_code,
+                    detail=exc.detail,
+                    duration_ms=(time.perf_counter() - started) * 1000,
+                )
+            except Exception:
+                logger.exception("Batch query %r (%s) failed", name, query.kind)
+                return BatchResult(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Query failed.",
+                    duration_ms=(time.perf_counter() - started) * 1000,
+                )
+            return BatchResult(
+                status_code=status.HTTP_200_OK,
+                data=data.model_dump(mode="json"),
+                duration_ms=(time.perf_counter() - started) * 1000,
+            )
+
+    def _execute(self, session: AsyncSession, query: BaseModel) -> Awaitable[BaseModel]:
+        if isinstance(query, StatsQuery):
+            # Plain filters, so batched and standalone requests share cache entries.
+            filters = DashboardFilters.model_validate(query.model_dump(exclude={"kind"}))
+            return DashboardService(session, self._cache, self._session_factory).get_stats(filters)
+        campaigns = CampaignService(session)
+        if isinstance(query, CampaignsQuery):
+            return campaigns.list_campaigns(query, account_id=query.account_id)
+        if isinstance(query, AdsetsQuery):
+            return campaigns.list_adsets(query.campaign_id, query)
+        if isinstance(query, AdsQuery):
+            return campaigns.list_ads(query.adset_id, query)
+        if isinstance(query, CampaignTreeQuery):
+            return campaigns.campaign_tree(query.campaign_id, start_date=query.start_date, end_date=query.end_date)
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Unknown query kind {query.kind!r}.")
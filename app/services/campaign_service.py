@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from datetime import date
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.marketing import FactMarketingDaily
+from app.repositories.campaign import SPEND_METRICS, CampaignRepository
+from app.schemas.campaign import (
+    AdOut,
+    AdPage,
+    AdsetOut,
+    AdsetPage,
+    AdsetTree,
+    CampaignOut,
+    CampaignPage,
+    CampaignTree,
+    ListingParams,
+    SpendSummary,
+)
+
+
+def _summary(row: Mapping | None) -> SpendSummary:
+    if row is None:
+        return SpendSummary()
+    return SpendSummary(**{name: row[name] or 0 for name in SPEND_METRICS})
+
+
+def _add(total: SpendSummary, part: SpendSummary) -> SpendSummary:
+    return SpendSummary(**{name: getattr(total, name) + getattr(part, name) for name in SPEND_METRICS})
+
+
+def _window(params: ListingParams | None, start_date: date | None, end_date: date | None) -> tuple[date, date] | None:
+    if params is not None:
+        if not params.include_spend:
+            return None
+        start_date, end_date = params.start_date, params.end_date
+    if start_date is None and end_date is None:
+        return None
+    if start_date is None or end_date is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="start_date and end_date are both required to aggregate spend.",
+        )
+    if end_date < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="end_date must not be earlier than start_date.",
+        )
+    return start_date, end_date
+
+
+class CampaignService:
+    """Listings over the campaign hierarchy without N+1 lookups.
+
+    Each page is one keyset query plus, when spend is requested, one grouped
+    fact query for all ids on the page. The campaign tree is a single joined
+    query whose flat rows are folded into ad sets and ads here.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._repo = CampaignRepository(session)
+
+    async def list_campaigns(self, params: ListingParams, *, account_id: int | None = None) -> CampaignPage:
+        window = _window(params, None, None)
+        rows = await self._repo.list_campaigns(account_id=account_id, after=params.after, limit=params.limit + 1)
+        page, next_after = rows[: params.limit], self._next_after(rows, params.limit, "campaign_id")
+        spend = {}
+        if window is not None:
+            ids = [row.campaign_id for row in page]
+            spend = await self._repo.spend_by(FactMarketingDaily.campaign_id, ids, *window)
+        return CampaignPage(
+            items=[
+                CampaignOut(
+                    campaign_id=row.campaign_id,
+                    account_id=row.account_id,
+                    external_campaign_id=row.external_campaign_id,
+                    campaign_name=row.campaign_name,
+                    spend=_summary(spend.get(row.campaign_id)) if window else None,
+                )
+                for row in page
+            ],
+            next_after=next_after,
+        )
+
+    async def list_adsets(self, campaign_id: int, params: ListingParams) -> AdsetPage:
+        window = _window(params, None, None)
+        await self._require_campaign(campaign_id)
+        rows = await self._repo.list_adsets(campaign_id, after=params.after, limit=params.limit + 1)
+        page, next_after = rows[: params.limit], self._next_after(rows, params.limit, "adset_id")
+        spend = {}
+        if window is not None:
+            ids = [row.adset_id for row in page]
+            spend = await self._repo.spend_by(FactMarketingDaily.adset_id, ids, *window, campaign_id=campaign_id)
+        return AdsetPage(
+            items=[
+                AdsetOut(
+                    adset_id=row.adset_id,
+                    campaign_id=row.campaign_id,
+                    external_adset_id=row.external_adset_id,
+                    adset_name=row.adset_name,
+                    spend=_summary(spend.get(row.adset_id)) if window else None,
+                )
+                for row in page
+            ],
+            next_after=next_after,
+        )
+
+    async def list_ads(self, adset_id: int, params: ListingParams) -> AdPage:
+        window = _window(params, None, None)
+        adset = await self._repo.get_adset(adset_id)
+        if adset is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ad set not found.")
+        rows = await self._repo.list_ads(adset_id, after=params.after, limit=params.limit + 1)
+        page, next_after = rows[: params.limit], self._next_after(rows, params.limit, "ad_id")
+        spend = {}
+        if window is not None:
+            ids = [row.ad_id for row in page]
+            spend = await self._repo.spend_by(FactMarketingDaily.ad_id, ids, *window, campaign_id=adset.campaign_id)
+        return AdPage(
+            items=[
+                AdOut(
+                    ad_id=row.ad_id,
+                    adset_id=row.adset_id,
+                    external_ad_id=row.external_ad_id,
+                    ad_name=row.ad_name,
+                    spend=_summary(spend.get(row.ad_id)) if window else None,
+                )
+                for row in page
+            ],
+            next_after=next_after,
+        )
+
+    async def campaign_tree(
+        self, campaign_id: int, *, start_date: date | None = None, end_date: date | None = None
+    ) -> CampaignTree:
+        """Expand a campaign into its ad sets and ads; spend rolls up from ads when a window is given."""
+
+        window = _window(None, start_date, end_date)
+        campaign = await self._require_campaign(campaign_id)
+        rows = await self._repo.campaign_tree(
+            campaign_id,
+            start_date=window[0] if window else None,
+            end_date=window[1] if window else None,
+        )
+
+        adsets: dict[int, AdsetTree] = {}
+        for row in rows:
+            adset = adsets.get(row["adset_id"])
+            if adset is None:
+                adset = adsets[row["adset_id"]] = AdsetTree(
+                    adset_id=row["adset_id"],
+                    campaign_id=campaign_id,
+                    external_adset_id=row["external_adset_id"],
+                    adset_name=row["adset_name"],
+                    spend=SpendSummary() if window else None,
+                )
+            if row["ad_id"] is None:
+                continue
+            ad_spend = _summary(row) if window else None
+            adset.ads.append(
+                AdOut(
+                    ad_id=row["ad_id"],
+                    adset_id=row["adset_id"],
+                    external_ad_id=row["external_ad_id"],
+                    ad_name=row["ad_name"],
+                    spend=ad_spend,
+                )
+            )
+            if window:
+                adset.spend = _add(adset.spend, ad_spend)
+
+        total = SpendSummary() if window else None
+        if window:
+            for adset in adsets.values():
+                total = _add(total, adset.spend)
+        return CampaignTree(
+            campaign_id=campaign.campaign_id,
+            account_id=campaign.account_id,
+            external_campaign_id=campaign.external_campaign_id,
+            campaign_name=campaign.campaign_name,
+            spend=total,
+            adsets=list(adsets.values()),
+        )
+
+    async def _require_campaign(self, campaign_id: int):
+        campaign = await self._repo.get_campaign(campaign_id)
+        if campaign is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found.")
+        return campaign
+
+    @staticmethod
+    def _next_after(rows: Sequence, limit: int, key: str) -> int | None:
+        # One extra row was fetched to tell whether another page exists.
+        return getattr(rows[limit - 1], key) if len(rows) > limit else None
@@ -0,0 +1,199 @@
+"""In-memory, time-versioned city → DMA allocation index.
+
+``map_city_dma`` assigns each city one or more DMAs with a ``dma_share`` over
+an effective date window. The index flattens those windows, per city, into
+non-overlapping date segments that each carry the full list of
+``(dma_id, dma_share)`` allocations in force. Segments are stored as sorted
+arrays keyed by ``(city rank, segment start)``, so any batch of
+``(city_id, date)`` pairs resolves with a single ``np.searchsorted`` and the
+allocation is one vectorized expand-multiply-aggregate pass.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Segment keys pack (city rank, day) into one int64; days are shifted to be
+# non-negative and must stay below _DAY_SPAN (covers 1900..4600).
+_DAY_OFFSET = 1 << 15
+_DAY_SPAN = 1 << 20
+
+
+def date_ids_to_days(date_ids: np.ndarray) -> np.ndarray:
+    """Convert ``yyyymmdd`` smart keys to days since 1970-01-01, vectorized."""
+
+    date_ids = np.asarray(date_ids, dtype=np.int64)
+    months = (date_ids // 10000 - 1970) * 12 + (date_ids // 100 % 100 - 1)
+    if not len(months):
+        return months
+    # Fact windows span few months, so resolve month starts through a small table.
+    first = int(months.min())
+    table = np.arange(first, int(months.max()) + 1).astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+    return table[months - first] + date_ids % 100 - 1
+
+
+@dataclass(frozen=True)
+class DMAAllocation:
+    """Values aggregated per ``(dma_id, date_id)``, sorted by DMA then date."""
+
+    dma_ids: np.ndarray  # (N,)
+    date_ids: np.ndarray  # (N,)
+    values: np.ndarray  # (N, K)
+    # Per value column, the input total that no DMA received (unmapped cities or shares below 1).
+    unallocated: np.ndarray  # (K,)
+
+
+    def restrict(self, dma_ids: np.ndarray) -> DMAAllocation:
+        """Keep only the rows of ``dma_ids``; ``unallocated`` is left as computed."""
+
+        keep = np.isin(self.dma_ids, np.asarray(dma_ids, dtype=np.int64))
+        return DMAAllocation(self.dma_ids[keep], self.date_ids[keep], self.values[keep], self.unallocated)
+
+
+class CityDMAIndex:
+    def __init__(
+        self,
+        city_ids: np.ndarray,
+        segment_keys: np.ndarray,
+        segment_ends: np.ndarray,
+        allocation_offsets: np.ndarray,
+        allocation_dma_ids: np.ndarray,
+        allocation_shares: np.ndarray,
+    ) -> None:
+        self._city_ids = city_ids  # sorted unique city ids; a city's rank is its position
+        self._segment_keys = segment_keys  # rank * _DAY_SPAN + shifted start day, ascending
+        self._segment_ends = segment_ends  # last day (inclusive, unshifted) of each segment
+        self._allocation_offsets = allocation_offsets  # segment s owns allocations [off[s], off[s + 1])
+        self._allocation_dma_ids = allocation_dma_ids
+        self._allocation_shares = allocation_shares
+        # Distinct DMAs and each allocation's position among them, for dense aggregation.
+        self._dma_axis, self._allocation_dma_ranks = np.unique(allocation_dma_ids, return_inverse=True)
+
+    @property
+    def cities(self) -> int:
+        return len(self._city_ids)
+
+    @property
+    def segments(self) -> int:
+        return len(self._segment_keys)
+
+    @classmethod
+    def build(
+        cls,
+        city_ids: np.ndarray,
+        start_days: np.ndarray,
+        end_days: np.ndarray,
+        dma_ids: np.ndarray,
+        shares: np.ndarray,
+    ) -> CityDMAIndex:
+        """Build from ``map_city_dma`` columns; windows are inclusive day numbers."""
+
+        order = np.lexsort((start_days, city_ids))
+        city_ids, start_days, end_days = city_ids[order], start_days[order], end_days[order]
+        dma_ids, shares = dma_ids[order], shares[order]
+        cities, city_starts = np.unique(city_ids, return_index=True)
+        city_stops = np.append(city_starts[1:], len(city_ids))
+
+        keys: list[int] = []
+        ends: list[int] = []
+        offsets = [0]
+        alloc_dmas: list[int] = []
+        alloc_shares: list[float] = []
+        for rank, (lo, hi) in enumerate(zip(city_starts.tolist(), city_stops.tolist())):
+            starts, stops = start_days[lo:hi].tolist(), end_days[lo:hi].tolist()
+            # Elementary segments lie between consecutive window starts / ends + 1.
+            bounds = sorted(set(starts) | {stop + 1 for stop in stops})
+            for seg_start, next_start in zip(bounds, bounds[1:]):
+                active = [i for i in range(hi - lo) if starts[i] <= seg_start <= stops[i]]
+                if not active:
+                    continue
+                keys.append(rank * _DAY_SPAN + seg_start + _DAY_OFFSET)
+                ends.append(next_start - 1)
+                alloc_dmas.extend(int(dma_ids[lo + i]) for i in active)
+                alloc_shares.extend(float(shares[lo + i]) for i in active)
+                offsets.append(len(alloc_dmas))
+
+        return cls(
+            cities.astype(np.int64),
+            np.asarray(keys, dtype=np.int64),
+            np.asarray(ends, dtype=np.int64),
+            np.asarray(offsets, dtype=np.int64),
+            np.asarray(alloc_dmas, dtype=np.int64),
+            np.asarray(alloc_shares, dtype=np.float64),
+        )
+
+    def cities_for(self, dma_ids: np.ndarray) -> np.ndarray:
+        """Return the sorted ids of cities allocated to any of ``dma_ids`` in some window."""
+
+        segment_ranks = self._segment_keys // _DAY_SPAN
+        allocation_segments = np.repeat(np.arange(self.segments), np.diff(self._allocation_offsets))
+        hit = np.isin(self._allocation_dma_ids, np.asarray(dma_ids, dtype=np.int64))
+        return self._city_ids[np.unique(segment_ranks[allocation_segments[hit]])]
+
+    def lookup(self, city_ids: np.ndarray, days: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Resolve ``(city_id, day)`` pairs to ``(input row, dma_id, share)`` triples.
+
+        A pair yields one triple per DMA in force that day and none when the
+        city is unmapped on that date.
+        """
+
+        rows, allocation = self._resolve(city_ids, days)
+        return rows, self._allocation_dma_ids[allocation], self._allocation_shares[allocation]
+
+    def _resolve(self, city_ids: np.ndarray, days: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(input row, allocation position)`` for every DMA in force per pair."""
+
+        city_ids = np.asarray(city_ids, dtype=np.int64)
+        days = np.asarray(days, dtype=np.int64)
+        if not self.segments or not len(city_ids):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        rank = np.searchsorted(self._city_ids, city_ids)
+        rank_in = np.minimum(rank, len(self._city_ids) - 1)
+        found = self._city_ids[rank_in] == city_ids
+
+        segment = np.searchsorted(self._segment_keys, rank_in * _DAY_SPAN + days + _DAY_OFFSET, side="right") - 1
+        segment_in = np.maximum(segment, 0)
+        found &= (segment >= 0) & (self._segment_keys[segment_in] // _DAY_SPAN == rank_in)
+        found &= self._segment_ends[segment_in] >= days
+
+        first = self._allocation_offsets[segment_in]
+        counts = np.where(found, self._allocation_offsets[segment_in + 1] - first, 0)
+        rows = np.repeat(np.arange(len(city_ids)), counts)
+        # Position of each expanded triple within its segment's allocation list.
+        within = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        allocation = np.repeat(first, counts) + within
+        return rows, allocation
+
+    def allocate(self, city_ids: np.ndarray, date_ids: np.ndarray, values: np.ndarray) -> DMAAllocation:
+        """Apportion per-city ``values`` (``(N,)`` or ``(N, K)``) to DMAs and sum per DMA-day."""
+
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, None]
+        date_ids = np.asarray(date_ids, dtype=np.int64)
+        days = date_ids_to_days(date_ids)
+        rows, allocation = self._resolve(city_ids, days)
+        if not len(rows):
+            empty = np.empty(0, dtype=np.int64)
+            return DMAAllocation(empty, empty, np.empty((0, values.shape[1])), values.sum(axis=0))
+
+        # Aggregate over a dense (DMA, day) grid with bincount rather than sorting the expanded rows.
+        first_day = int(days.min())
+        span = int(days.max()) - first_day + 1
+        cell = self._allocation_dma_ranks[allocation] * span + (days[rows] - first_day)
+        hits = np.flatnonzero(np.bincount(cell, minlength=len(self._dma_axis) * span))
+        shares = self._allocation_shares[allocation]
+        totals = np.column_stack(
+            [np.bincount(cell, weights=values[rows, k] * shares)[hits] for k in range(values.shape[1])]
+        )
+        day_ids = np.char.replace(
+            np.datetime_as_string(np.arange(first_day, first_day + span).astype("datetime64[D]")), "-", ""
+        ).astype(np.int64)
+        return DMAAllocation(
+            dma_ids=self._dma_axis[hits // span],
+            date_ids=day_ids[hits % span],
+            values=totals,
+            unallocated=values.sum(axis=0) - totals.sum(axis=0),
+        )
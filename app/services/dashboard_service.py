@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.cache import ResponseCache, make_cache_key
+from app.core.config import get_settings
+from app.repositories.dashboard import DashboardRepository
+from app.repositories.metric_availability import get_metric_availability
+from app.schemas.dashboard import DashboardFilters, DashboardStats, PlatformStats
+
+
+def _ratio(numerator: Decimal | int, denominator: Decimal | int) -> float | None:
+    if not denominator:
+        return None
+    return float(Decimal(numerator) / Decimal(denominator))
+
+
+class DashboardService:
+    """Business logic for the analytics dashboard.
+
+    Cached results are computed once per key and shared by every concurrent
+    request for it, so with a cache the computation runs on a session of its
+    own from ``session_factory`` rather than on the first caller's, which may
+    be closed or cancelled while others still wait for the result. The
+    caller's session only reads the cache key and has released its
+    connection by then, so a request never holds two at once.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: ResponseCache | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> None:
+        self._session = session
+        self._repo = DashboardRepository(session, use_rollups=get_settings().DASHBOARD_USE_ROLLUPS)
+        self._cache = cache
+        self._session_factory = session_factory
+
+    async def get_stats(self, filters: DashboardFilters) -> DashboardStats:
+        if filters.end_date < filters.start_date:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="end_date must not be earlier than start_date.",
+            )
+        if self._cache is None or not self._cache.enabled or self._session_factory is None:
+            return await self._compute_stats(filters)
+
+        # A new ingestion log entry for the platform changes the key, so cached
+        # aggregates never outlive the data they were computed from.
+        marker = await self._repo.latest_sync_marker(filters.platform_id)
+        # End the read so its connection goes back to the pool instead of
+        # idling while the computation (or the shared one) runs on another.
+        await self._session.rollback()
+        key = make_cache_key("dashboard.stats", filters.model_dump(mode="json"), version=marker)
+
+        async def compute() -> dict:
+            async with self._session_factory() as session:
+                stats = await DashboardService(session)._compute_stats(filters)
+            return stats.model_dump(mode="json")
+
+        return DashboardStats.model_validate(await self._cache.get_or_compute(key, compute))
+
+    async def _compute_stats(self, filters: DashboardFilters) -> DashboardStats:
+        availability = None
+        if get_settings().DASHBOARD_PRUNE_UNAVAILABLE_METRICS:
+            availability = await get_metric_availability().refresh(self._session)
+        rows = await self._repo.aggregate_stats(
+            filters.start_date,
+            filters.end_date,
+            platform_id=filters.platform_id,
+            country_id=filters.country_id,
+            region_id=filters.region_id,
+            dma_id=filters.dma_id,
+            availability=availability,
+        )
+
+        platforms = [
+            PlatformStats(
+                platform_id=row["platform_id"],
+                spend=float(row["spend"]),
+                impressions=int(row["impressions"]),
+                clicks=int(row["clicks"]),
+                conversions=int(row["conversions"]),
+                conversion_value=float(row["conversion_value"]),
+                roas=_ratio(row["conversion_value"], row["spend"]),
+                cpa=_ratio(row["spend"], row["conversions"]),
+            )
+            for row in rows
+            if row["platform_id"] is not None
+        ]
+
+        # The Shopify aggregate is repeated on every row (and present even when
+        # no platform reported spend), so read it from the first one.
+        revenue = rows[0]["revenue"] if rows else Decimal(0)
+        orders = rows[0]["orders"] if rows else Decimal(0)
+        spend = sum((Decimal(row["spend"]) for row in rows if row["platform_id"] is not None), Decimal(0))
+
+        return DashboardStats(
+            start_date=filters.start_date,
+            end_date=filters.end_date,
+            spend=float(spend),
+            impressions=sum(p.impressions for p in platforms),
+            clicks=sum(p.clicks for p in platforms),
+            conversions=sum(p.conversions for p in platforms),
+            revenue=float(revenue),
+            orders=int(orders),
+            roas=_ratio(revenue, spend),
+            cpa=_ratio(spend, orders),
+            platforms=platforms,
+        )
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import logging
+import shutil
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.partitions import date_to_id
+from app.models.marketing import DimAccount, DimPlatform
+from app.repositories.ingestion_log import STATUS_FAILED, STATUS_SUCCESS, IngestionLogRepository
+
+logger = logging.getLogger(__name__)
+
+PROCESSED_DIR = "processed"
+
+
+@dataclass(frozen=True)
+class ShopifyExport:
+    path: str
+    account_id: int
+    platform_id: int
+
+
+@dataclass(frozen=True)
+class EtlPlan:
+    run_id: str
+    start_date: date
+    end_date: date
+    chunks: list[tuple[date, date]]
+    platform_ids: list[int] = field(default_factory=list)
+    shopify_exports: list[ShopifyExport] = field(default_factory=list)
+
+
+def date_chunks(start_date: date, end_date: date, days: int) -> list[tuple[date, date]]:
+    chunks = []
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(chunk_start + timedelta(days=days - 1), end_date)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+class EtlPipelineService:
+    """Planning and bookkeeping for the nightly ETL run by :mod:`app.tasks.etl`.
+
+    Steps are keyed on ``(run_id, step, platform_id, date_id)`` in
+    ``event_ingestion_log``; a step whose key already succeeded is skipped, so
+    re-running a night (or a redelivered task) does not redo finished work.
+    Every executed step writes one log row with its duration and record count.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._log = IngestionLogRepository(session)
+
+    async def plan(self, day: date | None = None) -> EtlPlan:
+        """Plan the run for ``day``: the trailing window, its chunks and the work to fan out."""
+
+        settings = get_settings()
+        day = day or date.today()
+        end_date = day - timedelta(days=1)
+        start_date = end_date - timedelta(days=settings.ETL_LOOKBACK_DAYS - 1)
+
+        configured = list(settings.PLATFORM_APIS)
+        platform_ids = []
+        if configured:
+            result = await self._session.execute(
+                select(DimPlatform.platform_id)
+                .where(func.lower(DimPlatform.name).in_(configured))
+                .order_by(DimPlatform.platform_id)
+            )
+            platform_ids = list(result.scalars())
+
+        return EtlPlan(
+            run_id=f"nightly-{date_to_id(day)}",
+            start_date=start_date,
+            end_date=end_date,
+            chunks=date_chunks(start_date, end_date, settings.ETL_CHUNK_DAYS),
+            platform_ids=platform_ids,
+            shopify_exports=await self._pending_shopify_exports(),
+        )
+
+    async def _pending_shopify_exports(self) -> list[ShopifyExport]:
+        root = get_settings().SHOPIFY_EXPORT_DIR
+        if not root or not Path(root).is_dir():
+            return []
+        by_account: dict[int, list[Path]] = {}
+        for account_dir in sorted(Path(root).iterdir()):
+            if account_dir.is_dir() and account_dir.name.isdigit():
+                files = sorted(p for p in account_dir.iterdir() if p.is_file())
+                if files:
+                    by_account[int(account_dir.name)] = files
+        if not by_account:
+            return []
+
+        result = await self._session.execute(
+            select(DimAccount.account_id, DimAccount.platform_id).where(DimAccount.account_id.in_(by_account))
+        )
+        platforms = dict(result.all())
+        exports = []
+        for account_id, files in by_account.items():
+            if account_id not in platforms:
+                logger.warning("Skipping Shopify exports for unknown account_id %d", account_id)
+                continue
+            exports.extend(ShopifyExport(str(path), account_id, platforms[account_id]) for path in files)
+        return exports
+
+    @staticmethod
+    def mark_processed(path: str) -> None:
+        source = Path(path)
+        target = source.parent / PROCESSED_DIR
+        target.mkdir(exist_ok=True)
+        shutil.move(source, target / source.name)
+
+    async def is_done(
+        self, run_id: str, step: str, *, platform_id: int | None = None, date_id: int | None = None
+    ) -> bool:
+        done = await self._log.has_succeeded(run_id, step, platform_id, date_id)
+        if done:
+            logger.info("ETL %s: %s (platform=%s, date_id=%s) already done", run_id, step, platform_id, date_id)
+        return done
+
+    async def run_step(
+        self,
+        run_id: str,
+        step: str,
+        work: Callable[[], Awaitable[int]],
+        *,
+        platform_id: int | None = None,
+        date_id: int | None = None,
+        skip_if_done: bool = True,
+    ) -> int | None:
+        """Run ``work`` (returning its record count) unless the step's key already succeeded.
+
+        Returns ``None`` when skipped. Failures are logged and re-raised. Steps
+        whose unit of work is not a ``(platform_id, date_id)`` key (staging one
+        file) pass ``skip_if_done=False`` and are idempotent by other means.
+        """
+
+        if skip_if_done and await self.is_done(run_id, step, platform_id=platform_id, date_id=date_id):
+            return None
+
+        log_key = {"run_id": run_id, "step": step, "platform_id": platform_id, "date_id": date_id}
+        started = time.perf_counter()
+        try:
+            records = await work()
+        except Exception as exc:
+            await self._session.rollback()
+            await self._log.record(
+                records_fetched=0,
+                status=STATUS_FAILED,
+                duration_seconds=time.perf_counter() - started,
+                error_message=str(exc),
+                **log_key,
+            )
+            await self._session.commit()
+            raise
+
+        await self._log.record(
+            records_fetched=records,
+            status=STATUS_SUCCESS,
+            duration_seconds=time.perf_counter() - started,
+            **log_key,
+        )
+        await self._session.commit()
+        return records
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.storage import presigned_get_url, s3_client, upload_stream
+from app.models.export import ExportJob
+from app.repositories.export import ExportJobRepository
+from app.schemas.export import ExportJobOut, ExportJobStatus, ExportRequest
+from app.services.export_service import ExportService
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+EXPORT_JOB_TASK = "app.tasks.exports.run_export_job"
+
+
+class ExportJobService:
+    """Background exports: jobs are queued here and streamed into S3 by a Celery worker.
+
+    The worker reuses :class:`ExportService`'s encoders and feeds their output
+    into a multipart upload, so neither an API worker nor an HTTP connection is
+    held for the duration of a multi-gigabyte extract.
+
+    A running job holds a lease (``EXPORT_JOB_LEASE_SECONDS``) that its worker
+    renews through ``heartbeat_at``. Jobs whose worker died are reclaimed once
+    the lease lapses; :meth:`requeue_abandoned` re-enqueues them.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._repo = ExportJobRepository(session)
+
+    async def create(self, request: ExportRequest) -> ExportJobOut:
+        settings = get_settings()
+        ExportService.validate(request)
+        if not settings.EXPORT_S3_BUCKET:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Background exports are not configured.",
+            )
+
+        job_id = uuid.uuid4().hex
+        job = await self._repo.create(
+            ExportJob(
+                job_id=job_id,
+                dataset=request.dataset.value,
+                format=request.format.value,
+                gzip=request.gzip,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                status=ExportJobStatus.pending.value,
+                s3_bucket=settings.EXPORT_S3_BUCKET,
+                s3_key=f"{settings.EXPORT_S3_PREFIX}{job_id}/{ExportService.filename(request)}",
+            )
+        )
+        await self._session.commit()
+        try:
+            # Enqueued by name so the API process does not import the worker's task modules.
+            celery_app.send_task(EXPORT_JOB_TASK, args=[job_id])
+        except Exception as exc:
+            logger.exception("Could not enqueue export job %s", job_id)
+            await self._repo.finish(
+                job_id, status=ExportJobStatus.failed.value, error_message=f"Could not enqueue the job: {exc}"
+            )
+            await self._session.commit()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="The export job could not be queued; try again later.",
+            ) from exc
+        await self._session.refresh(job)
+        return ExportJobOut.model_validate(job)
+
+    async def get(self, job_id: str) -> ExportJobOut:
+        job = await self._repo.get(job_id)
+        if not job:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export job not found")
+
+        out = ExportJobOut.model_validate(job)
+        if job.status == ExportJobStatus.succeeded.value:
+            out.download_url = await presigned_get_url(
+                job.s3_bucket,
+                job.s3_key,
+                expires_in=get_settings().EXPORT_URL_TTL_SECONDS,
+                filename=job.s3_key.rsplit("/", 1)[-1],
+            )
+        return out
+
+    @staticmethod
+    def _request(job: ExportJob) -> ExportRequest:
+        return ExportRequest(
+            dataset=job.dataset,
+            start_date=job.start_date,
+            end_date=job.end_date,
+            format=job.format,
+            gzip=job.gzip,
+        )
+
+    async def run(self, job_id: str, session_factory: Callable[[], AsyncSession]) -> ExportJob:
+        """Execute a queued job; ``session_factory`` supplies the session the extract streams from.
+
+        Job state is committed on this service's session so progress is visible
+        while the extract's own long-running read is still open.
+        """
+
+        settings = get_settings()
+        lease = timedelta(seconds=settings.EXPORT_JOB_LEASE_SECONDS)
+        job = await self._repo.claim(job_id, lease=lease)
+        await self._session.commit()
+        if job is None:
+            logger.info("Export job %s is already running or finished; skipping", job_id)
+            return await self._repo.get(job_id)
+
+        request = self._request(job)
+        stop = asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, job.started_at, lease / 3, stop))
+        try:
+            async with s3_client() as client:
+                result = await upload_stream(
+                    client,
+                    ExportService(session_factory).stream(request),
+                    bucket=job.s3_bucket,
+                    key=job.s3_key,
+                    content_type=ExportService.media_type(request),
+                    part_size=settings.EXPORT_S3_PART_SIZE,
+                )
+        except Exception as exc:
+            await self._stop_heartbeat(heartbeat, stop)
+            await self._repo.finish(
+                job_id, status=ExportJobStatus.failed.value, error_message=str(exc), started_at=job.started_at
+            )
+            await self._session.commit()
+            raise
+        await self._stop_heartbeat(heartbeat, stop)
+
+        if not await self._repo.finish(
+            job_id,
+            status=ExportJobStatus.succeeded.value,
+            bytes_written=result.bytes_written,
+            parts_uploaded=result.parts,
+            started_at=job.started_at,
+        ):
+            logger.warning("Export job %s was reclaimed by another worker; leaving its status alone", job_id)
+        await self._session.commit()
+        logger.info(
+            "Export job %s wrote %d bytes to s3://%s/%s in %d part(s)",
+            job_id,
+            result.bytes_written,
+            job.s3_bucket,
+            job.s3_key,
+            result.parts,
+        )
+        await self._session.refresh(job)
+        return job
+
+    async def _heartbeat(self, job_id: str, started_at: datetime, interval: timedelta, stop: asyncio.Event) -> None:
+        """Renew the job's lease every ``interval`` until ``stop`` is set.
+
+        Stopped through the event rather than cancelled, so a renewal is never
+        interrupted halfway through its commit on the shared session.
+        """
+
+        while True:
+            try:
+                await asyncio.wait_for(stop.wait(), interval.total_seconds())
+                return
+            except TimeoutError:
+                pass
+            owned = await self._repo.heartbeat(job_id, started_at)
+            await self._session.commit()
+            if not owned:
+                logger.warning("Export job %s lost its lease to another worker", job_id)
+                return
+
+    @staticmethod
+    async def _stop_heartbeat(heartbeat: asyncio.Task, stop: asyncio.Event) -> None:
+        stop.set()
+        try:
+            await heartbeat
+        except Exception:
+            logger.warning("Export job heartbeat failed", exc_info=True)
+
+    async def requeue_abandoned(self) -> list[str]:
+        """Re-enqueue running jobs whose lease lapsed and pending jobs that were never picked up.
+
+        A duplicate task for a job that is in fact still queued is harmless:
+        only one of them can claim it.
+        """
+
+        job_ids = await self._repo.abandoned(timedelta(seconds=get_settings().EXPORT_JOB_LEASE_SECONDS))
+        await self._session.commit()
+        for job_id in job_ids:
+            celery_app.send_task(EXPORT_JOB_TASK, args=[job_id])
+        if job_ids:
+            logger.warning("Requeued %d abandoned export job(s): %s", len(job_ids), job_ids)
+        return job_ids
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import csv
+import io
+import zlib
+from collections.abc import AsyncIterator, Callable, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import HTTPException, status
+from sqlalchemy import BigInteger, Column, Date, DateTime, Integer, Numeric
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.repositories.export import ExportRepository
+from app.schemas.export import ExportFormat, ExportRequest
+
+
+def _arrow_type(column: Column) -> pa.DataType:
+    if isinstance(column.type, BigInteger):
+        return pa.int64()
+    if isinstance(column.type, Integer):
+        return pa.int32()
+    if isinstance(column.type, Numeric):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column.type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def _to_arrow(values: Sequence, arrow_type: pa.DataType) -> pa.Array:
+    if pa.types.is_floating(arrow_type):
+        # NUMERIC arrives as Decimal, which Arrow will not coerce to double itself.
+        values = [None if value is None else float(value) for value in values]
+    return pa.array(values, type=arrow_type)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands back whatever was written since the last drain."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportService:
+    """Stream raw fact extracts as CSV or Parquet with flat memory use.
+
+    Rows are pulled from a server-side cursor in fixed-size batches and each
+    batch is encoded and emitted before the next one is fetched. The service
+    owns its session because a streaming response outlives request dependencies.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], batch_size: int | None = None) -> None:
+        self._session_factory = session_factory
+        self._batch_size = batch_size or get_settings().EXPORT_BATCH_SIZE
+
+    @staticmethod
+    def validate(request: ExportRequest) -> None:
+        if request.end_date < request.start_date:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="end_date must not be earlier than start_date.",
+            )
+
+    @staticmethod
+    def filename(request: ExportRequest) -> str:
+        name = f"{request.dataset.value}_{request.start_date:%Y%m%d}_{request.end_date:%Y%m%d}"
+        if request.format is ExportFormat.parquet:
+            return f"{name}.parquet"
+        return f"{name}.csv.gz" if request.gzip else f"{name}.csv"
+
+    @staticmethod
+    def media_type(request: ExportRequest) -> str:
+        if request.format is ExportFormat.parquet:
+            return "application/vnd.apache.parquet"
+        return "application/gzip" if request.gzip else "text/csv"
+
+    async def stream(self, request: ExportRequest) -> AsyncIterator[bytes]:
+        columns = ExportRepository.columns(request.dataset)
+        async with self._session_factory() as session:
+            batches = ExportRepository(session).stream_batches(
+                request.dataset, request.start_date, request.end_date, batch_size=self._batch_size
+            )
+            if request.format is ExportFormat.parquet:
+                encoded = self._parquet(columns, batches, compression="gzip" if request.gzip else "snappy")
+            else:
+                encoded = self._csv(columns, batches)
+                if request.gzip:
+                    encoded = self._gzip(encoded)
+            async for chunk in encoded:
+                if chunk:
+                    yield chunk
+
+    @staticmethod
+    async def _csv(columns: list[Column], batches: AsyncIterator[Sequence[tuple]]) -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([column.name for column in columns])
+        async for batch in batches:
+            writer.writerows(batch)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+        async for chunk in chunks:
+            yield compressor.compress(chunk)
+        yield compressor.flush()
+
+    @staticmethod
+    async def _parquet(
+        columns: list[Column], batches: AsyncIterator[Sequence[tuple]], *, compression: str
+    ) -> AsyncIterator[bytes]:
+        schema = pa.schema([pa.field(column.name, _arrow_type(column)) for column in columns])
+        sink = _ChunkSink()
+        # One row group per batch so each batch can be flushed to the client.
+        with pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression=compression) as writer:
+            async for batch in batches:
+                arrays = [_to_arrow(values, field.type) for values, field in zip(zip(*batch), schema)]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                yield sink.drain()
+        yield sink.drain()
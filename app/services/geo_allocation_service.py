@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.loop_scope import LoopScoped
+from app.repositories.geo_allocation import GeoAllocationRepository
+from app.repositories.table_version import TableVersionRepository
+from app.services.city_dma_index import CityDMAIndex, DMAAllocation
+
+# Columns of DMAAllocation.values produced by this service.
+VALUE_COLUMNS = ("revenue", "orders")
+
+MAP_TABLE = "map_city_dma"
+
+
+class _IndexCache:
+    """Process-wide index, rebuilt when ``map_city_dma``'s ``table_version`` counters move."""
+
+    def __init__(self) -> None:
+        self.index: CityDMAIndex | None = None
+        self.version: tuple[int, int] | None = None
+        self.locks: LoopScoped[asyncio.Lock] = LoopScoped(asyncio.Lock)
+
+
+@lru_cache
+def _index_cache() -> _IndexCache:
+    return _IndexCache()
+
+
+class GeoAllocationService:
+    """Apportion city-level Shopify revenue and orders to DMAs by ``map_city_dma`` windows."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._repo = GeoAllocationRepository(session)
+
+    async def index(self) -> CityDMAIndex:
+        cache = _index_cache()
+        version = (await TableVersionRepository(self._session).versions([MAP_TABLE]))[MAP_TABLE]
+        if cache.index is None or cache.version != version:
+            async with cache.locks.get():
+                if cache.index is None or cache.version != version:
+                    columns = await self._repo.load_intervals()
+                    cache.index = await asyncio.to_thread(CityDMAIndex.build, *columns)
+                    cache.version = version
+        return cache.index
+
+    async def allocate_shopify(
+        self,
+        start_date: date,
+        end_date: date,
+        *,
+        dma_ids: Sequence[int] | None = None,
+        in_memory: bool = True,
+    ) -> DMAAllocation:
+        """Allocate ``fact_shopify_daily`` over the window to DMA-days.
+
+        ``in_memory`` resolves windows against the cached interval index (one
+        plain fact scan plus a vectorized pass); otherwise the join and
+        aggregation run in Postgres. Both return the same allocation. With
+        ``dma_ids`` only cities mapped to those DMAs are read and only their
+        rows are returned; ``unallocated`` then covers just those cities.
+        """
+
+        if end_date < start_date:
+            raise ValueError("end_date must not be earlier than start_date.")
+
+        if in_memory:
+            index = await self.index()
+            cities = None if dma_ids is None else index.cities_for(np.asarray(dma_ids)).tolist()
+            city_ids, date_ids, revenue, orders = await self._repo.load_shopify_city_facts(
+                start_date, end_date, city_ids=cities
+            )
+            allocation = await asyncio.to_thread(
+                index.allocate, city_ids, date_ids, np.column_stack((revenue, orders))
+            )
+            # Cities split across DMAs also carry shares for DMAs outside the selection.
+            return allocation if dma_ids is None else allocation.restrict(np.asarray(dma_ids))
+
+        allocated_dmas, date_ids, revenue, orders = await self._repo.allocate_shopify_sql(
+            start_date, end_date, dma_ids=dma_ids
+        )
+        # The SQL path only returns what was allocated.
+        return DMAAllocation(
+            dma_ids=allocated_dmas,
+            date_ids=date_ids,
+            values=np.column_stack((revenue, orders)),
+            unallocated=np.full(len(VALUE_COLUMNS), np.nan),
+        )
@@ -0,0 +1,110 @@
+"""Rate-limited, retrying client for ad platform reporting APIs.
+
+Every platform is integrated through the same minimal reporting contract,
+served either by the platform's API gateway or by an adapter in front of it:
+
+* ``GET /accounts/{account}/campaigns`` lists ``{"id", "name"}`` campaigns.
+* ``GET /campaigns/{campaign}/insights?since=YYYY-MM-DD&until=YYYY-MM-DD`` lists
+  daily rows at ad × DMA grain (``date``, ``adset_id``, ``adset_name``,
+  ``ad_id``, ``ad_name``, ``dma``, ``country``, ``currency`` and the metric
+  columns of ``fact_marketing_daily``).
+
+Both endpoints are cursor-paginated: ``{"data": [...], "paging": {"next_cursor": ...}}``
+with ``cursor`` and ``limit`` query parameters.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from collections.abc import AsyncIterator
+from datetime import date
+from typing import Any
+
+import httpx
+
+from app.core.config import PlatformApiSettings, get_settings
+from app.core.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class PlatformApiError(RuntimeError):
+    """Raised when a platform API call fails permanently or exhausts its retries."""
+
+
+class PlatformClient:
+    def __init__(
+        self,
+        name: str,
+        client: httpx.AsyncClient,
+        config: PlatformApiSettings,
+        bucket: TokenBucket,
+    ) -> None:
+        settings = get_settings()
+        self.name = name
+        self._client = client
+        self._config = config
+        self._bucket = bucket
+        self._max_retries = settings.SYNC_MAX_RETRIES
+        self._backoff = settings.SYNC_BACKOFF_SECONDS
+        self._headers = {"Authorization": f"Bearer {config.access_token}"} if config.access_token else {}
+
+    def _delay(self, attempt: int, response: httpx.Response | None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        # Full jitter keeps concurrent streams from retrying in lockstep.
+        return random.uniform(0, self._backoff * 2**attempt)
+
+    async def get_json(self, path: str, params: dict[str, Any]) -> dict[str, Any]:
+        url = f"{self._config.base_url.rstrip('/')}/{path.lstrip('/')}"
+        for attempt in range(self._max_retries + 1):
+            await self._bucket.acquire()
+            response = None
+            try:
+                response = await self._client.get(url, params=params, headers=self._headers)
+            except httpx.TransportError as exc:
+                if attempt == self._max_retries:
+                    raise PlatformApiError(f"{self.name}: {url} failed: {exc}") from exc
+            else:
+                if response.status_code < 400:
+                    return response.json()
+                if response.status_code not in RETRY_STATUSES or attempt == self._max_retries:
+                    raise PlatformApiError(f"{self.name}: {url} returned HTTP {response.status_code}")
+
+            delay = self._delay(attempt, response)
+            logger.debug("%s: retrying %s in %.2fs (attempt %d)", self.name, url, delay, attempt + 1)
+            if response is not None and response.status_code == 429:
+                # Throttling applies to the whole platform, so every stream waits
+                # on the drained bucket rather than just this one sleeping.
+                self._bucket.penalize(delay)
+            else:
+                await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def paginate(self, path: str, params: dict[str, Any] | None = None) -> AsyncIterator[list[dict]]:
+        """Yield each page's ``data`` list, following ``next_cursor`` until exhausted."""
+
+        params = {**(params or {}), "limit": self._config.page_size}
+        while True:
+            payload = await self.get_json(path, params)
+            yield payload.get("data") or []
+            cursor = (payload.get("paging") or {}).get("next_cursor")
+            if not cursor:
+                return
+            params = {**params, "cursor": cursor}
+
+    async def campaigns(self, external_account_id: str) -> AsyncIterator[list[dict]]:
+        async for page in self.paginate(f"accounts/{external_account_id}/campaigns"):
+            yield page
+
+    async def insights(self, external_campaign_id: str, start_date: date, end_date: date) -> AsyncIterator[list[dict]]:
+        params = {"since": start_date.isoformat(), "until": end_date.isoformat()}
+        async for page in self.paginate(f"campaigns/{external_campaign_id}/insights", params):
+            yield page
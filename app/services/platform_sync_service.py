@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.http import get_http_client
+from app.core.metrics import record_ingestion
+from app.core.rate_limit import get_token_bucket
+from app.db.partitions import date_to_id
+from app.repositories.dimension_cache import get_dimension_cache
+from app.repositories.ingestion_log import STATUS_FAILED, STATUS_SUCCESS, IngestionLogRepository
+from app.repositories.platform_load import PlatformLoadRepository
+from app.services.platform_client import PlatformClient
+
+logger = logging.getLogger(__name__)
+
+SYNC_STEP = "platform_sync"
+
+
+@dataclass(frozen=True)
+class PlatformSyncResult:
+    platform_id: int
+    accounts: int
+    pages: int
+    records_fetched: int
+    rows_written: int
+    duration_seconds: float
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records_fetched / self.duration_seconds if self.duration_seconds else 0.0
+
+
+def _number(value, kind):
+    if value is None or value == "":
+        return None
+    return Decimal(str(value)) if kind is Decimal else int(value)
+
+
+def _to_record(account_id: int, campaign: dict, row: dict, resolve_dma: Callable[[str], int | None]) -> tuple:
+    """Map one insights row onto :data:`~app.repositories.platform_load.LOAD_COLUMNS` order."""
+
+    dma_label = row.get("dma")
+    return (
+        account_id,
+        date_to_id(date.fromisoformat(row["date"])),
+        str(campaign["id"]),
+        campaign.get("name"),
+        str(row["adset_id"]),
+        row.get("adset_name"),
+        str(row["ad_id"]),
+        row.get("ad_name"),
+        dma_label,
+        resolve_dma(dma_label) if dma_label else None,
+        row.get("country"),
+        row.get("currency"),
+        _number(row.get("spend"), Decimal),
+        _number(row.get("impressions"), int),
+        _number(row.get("clicks"), int),
+        _number(row.get("conversions"), int),
+        _number(row.get("conversion_value"), Decimal),
+        _number(row.get("video_view_time"), int),
+        _number(row.get("frequency"), Decimal),
+        _number(row.get("reach"), int),
+        _number(row.get("add_to_cart"), int),
+    )
+
+
+class PlatformSyncService:
+    """Sync a platform's daily ad reports into ``fact_marketing_daily``.
+
+    Accounts and their campaigns are paginated concurrently (bounded by
+    ``SYNC_CONCURRENCY`` and the platform's token bucket) over the shared HTTP
+    connection pool. Pages flow through a bounded queue straight into COPY, so
+    fetching and loading overlap and memory does not grow with the sync size.
+    Platform DMA labels are resolved in memory from the dimension cache as
+    rows are parsed; only labels it misses are joined in SQL.
+    The synced window is then replaced in one transaction and the run is
+    recorded in ``event_ingestion_log``.
+    """
+
+    def __init__(self, session: AsyncSession, http_client: httpx.AsyncClient | None = None) -> None:
+        self._session = session
+        self._repo = PlatformLoadRepository(session)
+        self._log = IngestionLogRepository(session)
+        self._http = http_client
+
+    async def _client(self, platform_id: int) -> PlatformClient:
+        platform = await self._repo.get_platform(platform_id)
+        if platform is None:
+            raise ValueError(f"Unknown platform_id {platform_id}.")
+        name = platform.name.lower()
+        config = get_settings().PLATFORM_APIS.get(name)
+        if config is None:
+            raise ValueError(f"No reporting API configured for platform {platform.name!r}.")
+        bucket = get_token_bucket(name, config.requests_per_second, config.burst)
+        return PlatformClient(name, self._http or get_http_client(), config, bucket)
+
+    async def sync(
+        self,
+        platform_id: int,
+        start_date: date,
+        end_date: date,
+        *,
+        account_ids: Sequence[int] | None = None,
+        run_id: str | None = None,
+    ) -> PlatformSyncResult:
+        """Sync and replace the window; ``run_id`` tags the ingestion log row for pipeline runs."""
+
+        if end_date < start_date:
+            raise ValueError("end_date must not be earlier than start_date.")
+
+        log_key = {"run_id": run_id, "step": SYNC_STEP, "date_id": date_to_id(start_date)}
+        started = time.perf_counter()
+        fetched = 0
+        try:
+            client = await self._client(platform_id)
+            accounts = await self._repo.list_accounts(platform_id, account_ids)
+            dimensions = get_dimension_cache()
+            await dimensions.refresh(self._session)
+            await self._repo.create_load_table()
+
+            def resolve_dma(label: str) -> int | None:
+                return dimensions.dma_id_for_label(platform_id, label)
+
+            queue: asyncio.Queue[list[tuple]] = asyncio.Queue(maxsize=get_settings().SYNC_CONCURRENCY * 2)
+            producer = asyncio.create_task(
+                self._fetch_all(client, accounts, start_date, end_date, queue, resolve_dma)
+            )
+            pages = 0
+            try:
+                while True:
+                    getter = asyncio.ensure_future(queue.get())
+                    done, _ = await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+                    if getter not in done:
+                        getter.cancel()
+                        producer.result()
+                        break
+                    fetched += await self._repo.copy_records(getter.result())
+                    pages += 1
+                while not queue.empty():
+                    fetched += await self._repo.copy_records(queue.get_nowait())
+                    pages += 1
+            finally:
+                if not producer.done():
+                    producer.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await producer
+
+            await self._repo.upsert_hierarchy()
+            written = await self._repo.replace_facts(
+                platform_id, [account_id for account_id, _ in accounts], start_date, end_date
+            )
+            duration = time.perf_counter() - started
+            entry = await self._log.record(
+                platform_id=platform_id,
+                records_fetched=fetched,
+                status=STATUS_SUCCESS,
+                duration_seconds=duration,
+                **log_key,
+            )
+            await self._repo.record_changed_cells(entry.log_id)
+            await self._session.commit()
+        except Exception as exc:
+            await self._session.rollback()
+            await self._log.record(
+                platform_id=platform_id,
+                records_fetched=fetched,
+                status=STATUS_FAILED,
+                duration_seconds=time.perf_counter() - started,
+                error_message=str(exc),
+                **log_key,
+            )
+            await self._session.commit()
+            raise
+
+        result = PlatformSyncResult(
+            platform_id=platform_id,
+            accounts=len(accounts),
+            pages=pages,
+            records_fetched=fetched,
+            rows_written=written,
+            duration_seconds=duration,
+        )
+        record_ingestion(f"platform:{client.name}", result.records_fetched, result.duration_seconds)
+        logger.info(
+            "Synced platform %d: %d accounts, %d pages, %d records (%.0f records/s)",
+            platform_id,
+            result.accounts,
+            result.pages,
+            result.records_fetched,
+            result.records_per_second,
+        )
+        return result
+
+    async def _fetch_all(
+        self,
+        client: PlatformClient,
+        accounts: Sequence[tuple[int, str]],
+        start_date: date,
+        end_date: date,
+        queue: asyncio.Queue,
+        resolve_dma: Callable[[str], int | None],
+    ) -> None:
+        streams = asyncio.Semaphore(get_settings().SYNC_CONCURRENCY)
+        async with asyncio.TaskGroup() as group:
+            for account_id, external_account_id in accounts:
+                group.create_task(
+                    self._fetch_account(
+                        client, account_id, external_account_id, start_date, end_date, queue, streams, resolve_dma
+                    )
+                )
+
+    async def _fetch_account(
+        self,
+        client: PlatformClient,
+        account_id: int,
+        external_account_id: str,
+        start_date: date,
+        end_date: date,
+        queue: asyncio.Queue,
+        streams: asyncio.Semaphore,
+        resolve_dma: Callable[[str], int | None],
+    ) -> None:
+        async with asyncio.TaskGroup() as group:
+            async with streams:
+                # Campaign streams start as soon as their listing page arrives.
+                async for page in client.campaigns(external_account_id):
+                    for campaign in page:
+                        group.create_task(
+                            self._fetch_campaign(
+                                client, account_id, campaign, start_date, end_date, queue, streams, resolve_dma
+                            )
+                        )
+
+    @staticmethod
+    async def _fetch_campaign(
+        client: PlatformClient,
+        account_id: int,
+        campaign: dict,
+        start_date: date,
+        end_date: date,
+        queue: asyncio.Queue,
+        streams: asyncio.Semaphore,
+        resolve_dma: Callable[[str], int | None],
+    ) -> None:
+        async with streams:
+            async for page in client.insights(str(campaign["id"]), start_date, end_date):
+                records = [_to_record(account_id, campaign, row, resolve_dma) for row in page]
+                if records:
+                    await queue.put(records)
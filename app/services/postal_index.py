@@ -0,0 +1,146 @@
+"""In-memory, prefix-aware postal code → city/state index.
+
+``map_postal_city_state`` is keyed by raw postal strings in whatever form the
+source used (``"02139"``, ``"02139-4307"``, ``"m5v 3l9"``, ``"M5V"``). Codes
+are normalized to a canonical key and every key is also registered under its
+coarser prefix (ZIP+4 → ZIP5, Canadian full code → FSA) when that prefix
+resolves unambiguously to one city. A lookup tries the exact key first and
+then the prefix, so ``"02139-9999"`` and ``"M5V 0A1"`` resolve even when only
+the five-digit ZIP or the FSA is mapped.
+
+Distinct city/state targets are interned, so millions of postal keys cost one
+dict slot and a small int each.
+"""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+_NON_ALNUM = re.compile(r"[^0-9A-Z]")
+_US_ZIP = re.compile(r"\d{5}(\d{4})?")
+_CA_POSTAL = re.compile(r"[A-Z]\d[A-Z](\d[A-Z]\d)?")
+
+# Canadian provinces and territories; every other ``state_code`` is treated as a US state.
+CA_PROVINCES = frozenset({"AB", "BC", "MB", "NB", "NL", "NS", "NT", "NU", "ON", "PE", "QC", "SK", "YT"})
+
+
+def normalize_postal_code(value: str | None) -> tuple[str | None, str | None]:
+    """Return ``(country_iso2, key)`` for a raw postal code.
+
+    US codes normalize to five or nine digits and Canadian codes to the
+    three-character FSA or the six-character full code, without separators.
+    Anything else is upper-cased alphanumerics with no country.
+    """
+
+    if not value:
+        return None, None
+    key = _NON_ALNUM.sub("", value.upper())
+    if not key:
+        return None, None
+    if _US_ZIP.fullmatch(key):
+        return "US", key
+    if _CA_POSTAL.fullmatch(key):
+        return "CA", key
+    # ZIP+4 with a stray separator or a dropped leading zero ("2139") is not guessed at.
+    return None, key
+
+
+def postal_prefix(key: str) -> str | None:
+    """Return the coarser key a code falls back to: ZIP5 for ZIP+4, FSA for a full Canadian code."""
+
+    if len(key) == 9 and key.isdigit():
+        return key[:5]
+    if len(key) == 6 and _CA_POSTAL.fullmatch(key):
+        return key[:3]
+    return None
+
+
+@dataclass(frozen=True)
+class PostalTarget:
+    city_name: str
+    state_code: str
+    country_iso2: str
+    city_id: int | None
+
+
+class PostalIndex:
+    def __init__(self, keys: dict[str, int], targets: list[PostalTarget]) -> None:
+        self._keys = keys  # normalized postal key (and unambiguous prefixes) -> target position
+        self._targets = targets
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def targets(self) -> int:
+        return len(self._targets)
+
+    @classmethod
+    def build(cls, rows: Iterable[tuple[str, str, str, int | None]]) -> PostalIndex:
+        """Build from ``(postal_code, city_name, state_code, city_id)`` mapping rows.
+
+        When the same key is mapped more than once the first row with a
+        ``city_id`` wins, so rows already backfilled take precedence.
+        """
+
+        interned: dict[tuple, int] = {}
+        targets: list[PostalTarget] = []
+        keys: dict[str, int] = {}
+        for postal_code, city_name, state_code, city_id in rows:
+            country, key = normalize_postal_code(postal_code)
+            if key is None:
+                continue
+            state = state_code.strip().upper()
+            target = PostalTarget(
+                city_name=" ".join(city_name.split()),
+                state_code=state,
+                country_iso2=country or ("CA" if state in CA_PROVINCES else "US"),
+                city_id=city_id,
+            )
+            position = interned.setdefault(
+                (target.city_name.casefold(), target.state_code, target.country_iso2, city_id), len(targets)
+            )
+            if position == len(targets):
+                targets.append(target)
+            current = keys.get(key)
+            if current is None or (targets[current].city_id is None and city_id is not None):
+                keys[key] = position
+
+        # Register each prefix that every longer key under it agrees on.
+        prefixes: dict[str, int | None] = {}
+        for key, position in keys.items():
+            prefix = postal_prefix(key)
+            if prefix is None or prefix in keys:
+                continue
+            seen = prefixes.get(prefix, position)
+            prefixes[prefix] = position if seen is not None and _same_city(targets[seen], targets[position]) else None
+        keys.update((prefix, position) for prefix, position in prefixes.items() if position is not None)
+        return cls(keys, targets)
+
+    def resolve(self, postal_code: str | None) -> PostalTarget | None:
+        _, key = normalize_postal_code(postal_code)
+        if key is None:
+            return None
+        position = self._keys.get(key)
+        if position is None:
+            prefix = postal_prefix(key)
+            position = self._keys.get(prefix) if prefix else None
+        return None if position is None else self._targets[position]
+
+    def resolve_many(self, postal_codes: Sequence[str | None]) -> list[PostalTarget | None]:
+        """Resolve a batch, normalizing and probing each distinct raw code once."""
+
+        resolved: dict[str | None, PostalTarget | None] = {}
+        out = []
+        for code in postal_codes:
+            if code not in resolved:
+                resolved[code] = self.resolve(code)
+            out.append(resolved[code])
+        return out
+
+
+def _same_city(a: PostalTarget, b: PostalTarget) -> bool:
+    if a.city_id is not None and b.city_id is not None:
+        return a.city_id == b.city_id
+    return (a.city_name.casefold(), a.state_code, a.country_iso2) == (b.city_name.casefold(), b.state_code, b.country_iso2)
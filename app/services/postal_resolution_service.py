@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from functools import lru_cache
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.loop_scope import LoopScoped
+from app.repositories.postal import PostalRepository
+from app.repositories.table_version import TableVersionRepository
+from app.services.postal_index import PostalIndex, normalize_postal_code
+
+MAPPING_TABLE = "map_postal_city_state"
+
+
+class _IndexCache:
+    """Process-wide index, rebuilt when ``map_postal_city_state``'s ``table_version`` counters move."""
+
+    def __init__(self) -> None:
+        self.index: PostalIndex | None = None
+        self.version: tuple[int, int] | None = None
+        self.locks: LoopScoped[asyncio.Lock] = LoopScoped(asyncio.Lock)
+
+
+@lru_cache
+def _index_cache() -> _IndexCache:
+    return _IndexCache()
+
+
+class PostalResolutionService:
+    """Resolve order postal codes to cities without a query per row.
+
+    The ``map_postal_city_state`` mapping is held in a :class:`PostalIndex`
+    and reloaded only when the table changes; unresolved ``city_id`` values
+    are backfilled in bulk and resolved postals are written to ``dim_postal``
+    with one COPY and anti-join insert.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._repo = PostalRepository(session)
+
+    async def index(self) -> PostalIndex:
+        cache = _index_cache()
+        version = (await TableVersionRepository(self._session).versions([MAPPING_TABLE]))[MAPPING_TABLE]
+        if cache.index is None or cache.version != version:
+            async with cache.locks.get():
+                if cache.index is None or cache.version != version:
+                    rows = await self._repo.load_mapping()
+                    cache.index = await asyncio.to_thread(PostalIndex.build, rows)
+                    cache.version = version
+        return cache.index
+
+    async def backfill_city_ids(self) -> int:
+        """Resolve ``map_postal_city_state.city_id`` from the dimensions; the caller commits.
+
+        This scans every unresolved mapping row, so run it once per batch of
+        files (the nightly ETL does so when planning) rather than per file.
+        """
+
+        return await self._repo.backfill_city_ids()
+
+    async def ensure_postals(self, postal_codes: Iterable[str], index: PostalIndex | None = None) -> int:
+        """Create ``dim_postal`` rows for the codes that resolve to a known city; returns rows inserted."""
+
+        index = index or await self.index()
+        postals = set()
+        for code in set(postal_codes):
+            target = index.resolve(code)
+            if target is not None and target.city_id is not None:
+                postals.add((target.city_id, normalize_postal_code(code)[1]))
+        return await self._repo.create_postals(sorted(postals))
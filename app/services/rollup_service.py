@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import get_response_cache
+from app.repositories.rollups import MONTHLY, ROLLUP_GRAINS, RollupRepository
+
+
+class RollupService:
+    """Keep the weekly/monthly marketing rollups in step with newly ingested dates.
+
+    Each grain's built range (``rollup_coverage``) is kept contiguous: a
+    refresh that does not touch the covered range also rebuilds the gap
+    between them.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._repo = RollupRepository(session)
+
+    async def refresh(self, start_date: date, end_date: date, *, invalidate: bool = True) -> dict[str, int]:
+        """Rebuild all rollup periods touching ``start_date``..``end_date`` in one transaction."""
+
+        if end_date < start_date:
+            raise ValueError("end_date must not be earlier than start_date.")
+
+        written = {}
+        try:
+            coverage = await self._repo.coverage(for_update=True)
+            for grain in ROLLUP_GRAINS:
+                lo, hi = start_date, end_date
+                covered = coverage.get(grain.name)
+                if covered is not None:
+                    if lo > covered[1]:
+                        lo = covered[1] + timedelta(days=1)
+                    if hi < covered[0]:
+                        hi = covered[0] - timedelta(days=1)
+                written[grain.name] = await self._repo.refresh(grain, lo, hi)
+                built_lo, built_hi = grain.covering(lo, hi)
+                if covered is not None:
+                    built_lo, built_hi = min(built_lo, covered[0]), max(built_hi, covered[1])
+                await self._repo.save_coverage(grain, built_lo, built_hi)
+            await self._session.commit()
+        except Exception:
+            await self._session.rollback()
+            raise
+
+        if invalidate:
+            # Dashboard responses may have been served from the replaced periods.
+            cache = await get_response_cache()
+            await cache.invalidate()
+        return written
+
+    async def backfill(self, start_date: date | None = None, end_date: date | None = None) -> dict[str, int]:
+        """Build the rollups over the whole fact history (or the given window), newest month first.
+
+        Every month is committed on its own, so the coverage grows backwards as
+        the backfill progresses. Months every grain already covers are skipped,
+        so an interrupted backfill resumes where it stopped when rerun.
+        """
+
+        written = {grain.name: 0 for grain in ROLLUP_GRAINS}
+        if start_date is None or end_date is None:
+            history = await self._repo.fact_date_range()
+            if history is None:
+                await self._session.commit()
+                return written
+            start_date = start_date or history[0]
+            end_date = end_date or history[1]
+
+        coverage = await self._repo.coverage()
+        await self._session.commit()
+        month_end = end_date
+        if all(grain.name in coverage and coverage[grain.name][1] >= end_date for grain in ROLLUP_GRAINS):
+            month_end = min(end_date, max(start for start, _ in coverage.values()) - timedelta(days=1))
+        while month_end >= start_date:
+            month_start = max(MONTHLY.bounds(month_end)[0], start_date)
+            for name, rows in (await self.refresh(month_start, month_end, invalidate=False)).items():
+                written[name] += rows
+            month_end = month_start - timedelta(days=1)
+
+        cache = await get_response_cache()
+        await cache.invalidate()
+        return written
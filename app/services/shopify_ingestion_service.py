@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import gzip
+import io
+import json
+import logging
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.metrics import record_ingestion
+from app.repositories.staging import StagingRepository
+from app.services.postal_index import PostalIndex
+from app.services.postal_resolution_service import PostalResolutionService
+
+logger = logging.getLogger(__name__)
+
+# Shopify export headers that map onto staging columns under a different name.
+FIELD_ALIASES = {
+    "day": "date_id",
+    "date": "date_id",
+    "country_code": "country_iso2",
+    "billing_country_code": "country_iso2",
+    "region": "region_code",
+    "province_code": "region_code",
+    "billing_region_code": "region_code",
+    "city": "city_name_norm",
+    "billing_city": "city_name_norm",
+    "total_orders": "orders",
+    "shipping_charges": "shipping",
+    "zip": "postal_code",
+    "postal": "postal_code",
+    "billing_zip": "postal_code",
+    "billing_postal_code": "postal_code",
+    "shipping_zip": "postal_code",
+}
+
+_AMOUNT_FIELDS = ("orders", "gross_sales", "refunds", "shipping")
+_GEOGRAPHY_FIELDS = ("country_iso2", "region_code", "city_name_norm")
+
+# Skipped rows logged in full per file; the rest are only counted.
+_LOGGED_INVALID_ROWS = 5
+
+
+@dataclass(frozen=True)
+class IngestionResult:
+    source_file: str
+    rows_read: int
+    rows_merged: int
+    duration_seconds: float
+    # Rows that failed validation and were left out of staging.
+    rows_skipped: int = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.duration_seconds if self.duration_seconds else 0.0
+
+
+def normalize_city_name(value: str) -> str:
+    """Return the canonical ``city_name_norm`` form: trimmed, single-spaced, casefolded."""
+
+    return " ".join(value.split()).casefold()
+
+
+def _open_text(path: Path) -> io.TextIOBase:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return path.open("r", encoding="utf-8", newline="")
+
+
+def _read_rows(path: Path) -> Iterator[object]:
+    fmt = path.suffixes[-2] if path.suffix == ".gz" and len(path.suffixes) > 1 else path.suffix
+    with _open_text(path) as handle:
+        if fmt == ".csv":
+            yield from csv.DictReader(handle)
+        elif fmt in {".ndjson", ".jsonl"}:
+            for line in handle:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # Rejected by _to_record like any other malformed row.
+                        yield line
+        else:
+            raise ValueError(f"Unsupported Shopify export format: {path.name}")
+
+
+class InvalidRow(ValueError):
+    """An export row that cannot be staged; the file's other rows still are."""
+
+
+def _text(fields: dict[str, object], name: str) -> str | None:
+    """Return the stripped value of ``name``, with missing, null and blank values as ``None``."""
+
+    value = fields.get(name)
+    if value is None:
+        return None
+    return str(value).strip() or None
+
+
+def _amount(fields: dict[str, object], name: str) -> Decimal | None:
+    value = _text(fields, name)
+    if value is None:
+        return None
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        raise InvalidRow(f"{name} is not a number: {value!r}") from None
+    if not amount.is_finite():
+        raise InvalidRow(f"{name} is not a number: {value!r}")
+    return amount
+
+
+def _to_record(
+    row: object,
+    row_no: int,
+    platform_id: int,
+    account_id: int,
+    source_file: str,
+    postals: PostalIndex,
+    postal_codes: set[str],
+) -> tuple:
+    """Map one export row onto :data:`~app.repositories.staging.LOAD_COLUMNS`; raises :class:`InvalidRow`."""
+
+    if not isinstance(row, dict):
+        raise InvalidRow("row is not an object")
+    # csv.DictReader files surplus cells under a None key.
+    fields = {
+        FIELD_ALIASES.get(key.strip().lower(), key.strip().lower()): value
+        for key, value in row.items()
+        if isinstance(key, str)
+    }
+    amounts = [_amount(fields, name) for name in _AMOUNT_FIELDS]
+    postal_code = _text(fields, "postal_code")
+    if postal_code:
+        postal_codes.add(postal_code)
+        # Rows with incomplete geography take all of it from the postal mapping.
+        if not all(_text(fields, name) for name in _GEOGRAPHY_FIELDS):
+            target = postals.resolve(postal_code)
+            if target is not None:
+                fields["country_iso2"] = target.country_iso2
+                fields["region_code"] = target.state_code
+                fields["city_name_norm"] = target.city_name
+    geography = [_text(fields, name) for name in _GEOGRAPHY_FIELDS]
+    missing = [name for name, value in zip(_GEOGRAPHY_FIELDS, geography) if value is None]
+    if missing:
+        raise InvalidRow(f"missing {', '.join(missing)}")
+    country_iso2, region_code, city_name = geography
+
+    raw_day = _text(fields, "date_id")
+    if raw_day is None:
+        raise InvalidRow("missing date_id")
+    try:
+        day = date.fromisoformat(raw_day[:10])
+    except ValueError:
+        raise InvalidRow(f"date_id is not a date: {raw_day!r}") from None
+    return (
+        row_no,
+        day,
+        platform_id,
+        account_id,
+        country_iso2.upper(),
+        region_code.upper(),
+        normalize_city_name(city_name),
+        *amounts,
+        source_file,
+    )
+
+
+class ShopifyIngestionService:
+    """Stream Shopify city-day exports into ``stg_shopify_daily_city``.
+
+    Files are parsed in fixed-size chunks which are COPY'd into a temp table and
+    merged into staging with one set-based upsert, so memory stays bounded by
+    the chunk size regardless of the file size. Order postal codes are
+    resolved against the in-memory postal index, filling missing geography
+    and creating the matching ``dim_postal`` rows in one bulk insert per file.
+    Rows that fail validation are skipped and counted in the result rather
+    than failing the file.
+    Unresolved mapping ``city_id`` values are not backfilled here: the ETL
+    does that once per run, before the files fan out
+    (:meth:`PostalResolutionService.backfill_city_ids`).
+    """
+
+    def __init__(self, session: AsyncSession, chunk_size: int | None = None) -> None:
+        self._session = session
+        self._repo = StagingRepository(session)
+        self._postals = PostalResolutionService(session)
+        self._chunk_size = chunk_size or get_settings().INGEST_CHUNK_SIZE
+
+    async def ingest_file(self, path: str | Path, *, platform_id: int, account_id: int) -> IngestionResult:
+        path = Path(path)
+        started = time.perf_counter()
+        postals = await self._postals.index()
+        postal_codes: set[str] = set()
+
+        skipped = 0
+
+        def records() -> Iterator[tuple]:
+            nonlocal skipped
+            for row_no, row in enumerate(_read_rows(path)):
+                try:
+                    yield _to_record(row, row_no, platform_id, account_id, path.name, postals, postal_codes)
+                except InvalidRow as exc:
+                    skipped += 1
+                    if skipped <= _LOGGED_INVALID_ROWS:
+                        logger.warning("Skipping row %d of %s: %s", row_no + 1, path.name, exc)
+
+        rows = records()
+
+        await self._repo.create_load_table()
+        rows_read = 0
+        while True:
+            # Parsing is CPU/disk bound; keep it off the event loop.
+            chunk = await asyncio.to_thread(lambda: list(islice(rows, self._chunk_size)))
+            if not chunk:
+                break
+            rows_read += await self._repo.copy_records(chunk)
+
+        rows_merged = await self._repo.merge_load_table()
+        await self._postals.ensure_postals(postal_codes, postals)
+        await self._session.commit()
+        if skipped:
+            logger.warning("Skipped %d invalid rows of %s", skipped, path.name)
+        result = IngestionResult(
+            source_file=path.name,
+            rows_read=rows_read,
+            rows_merged=rows_merged,
+            duration_seconds=time.perf_counter() - started,
+            rows_skipped=skipped,
+        )
+        record_ingestion("shopify_file", result.rows_read, result.duration_seconds)
+        return result
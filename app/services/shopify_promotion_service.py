@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import get_response_cache
+from app.repositories.staging import StagingRepository
+
+
+@dataclass(frozen=True)
+class PromotionResult:
+    start_date: date
+    end_date: date
+    rows_resolved: int
+    postals_created: int
+    facts_upserted: int
+
+
+class ShopifyPromotionService:
+    """Promote ``stg_shopify_daily_city`` rows into ``fact_shopify_daily``.
+
+    Each batch of ``batch_days`` days is one transaction: geography is resolved
+    with set-based joins, placeholder postals are created, and the aggregated
+    facts are upserted. Staging FKs are deferred so they are checked once at
+    commit instead of per updated row.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._repo = StagingRepository(session)
+
+    async def promote(self, start_date: date, end_date: date, *, batch_days: int = 7) -> list[PromotionResult]:
+        if end_date < start_date:
+            raise ValueError("end_date must not be earlier than start_date.")
+
+        results = []
+        batch_start = start_date
+        while batch_start <= end_date:
+            batch_end = min(batch_start + timedelta(days=batch_days - 1), end_date)
+            try:
+                await self._repo.defer_constraints()
+                resolved = await self._repo.resolve_geography(batch_start, batch_end)
+                postals = await self._repo.ensure_city_postals(batch_start, batch_end)
+                upserted = await self._repo.upsert_shopify_facts(batch_start, batch_end)
+                await self._session.commit()
+            except Exception:
+                await self._session.rollback()
+                raise
+            results.append(PromotionResult(batch_start, batch_end, resolved, postals, upserted))
+            batch_start = batch_end + timedelta(days=1)
+
+        # Cached dashboard aggregates may now be stale.
+        cache = await get_response_cache()
+        await cache.invalidate()
+        return results
@@ -5,13 +5,28 @@ from typing import TYPE_CHECKING
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_password_hash
+from app.core.security import (
+    create_access_token,
+    get_password_hash_async,
+    verify_and_update_password_async,
+)
 from app.repositories.user import UserRepository
+from app.schemas.auth import Token
 
 if TYPE_CHECKING:  # pragma: no cover - imported only for type checking
     from app.models.user import User
 
 
+_dummy_hash_value: str | None = None
+
+
+async def _dummy_hash() -> str:
+    global _dummy_hash_value
+    if _dummy_hash_value is None:
+        _dummy_hash_value = await get_password_hash_async("not-a-real-password")
+    return _dummy_hash_value
+
+
 class UserService:
     """Business logic for working with :class:`~app.models.user.User`."""
 
@@ -27,11 +42,38 @@ class UserService:
                 detail="A user with this email already exists.",
             )
 
-        hashed_password = get_password_hash(password)
+        hashed_password = await get_password_hash_async(password)
         user = await self._repo.create(email=email, hashed_password=hashed_password)
         await self._session.commit()
         return user
 
+    async def authenticate(self, email: str, password: str) -> User:
+        user = await self._repo.get_by_email(email)
+        # Verify against a throwaway hash for unknown emails so response time
+        # does not reveal which addresses are registered.
+        hashed_password = user.hashed_password if user else await _dummy_hash()
+        verified, new_hash = await verify_and_update_password_async(password, hashed_password)
+        if not user or not verified:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect email or password.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        if not user.is_active:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user.")
+        if new_hash:
+            # The stored hash predates the current BCRYPT_ROUNDS.
+            user.hashed_password = new_hash
+            await self._session.commit()
+        return user
+
+    async def login(self, email: str, password: str) -> Token:
+        user = await self.authenticate(email, password)
+        access_token, expires_in = create_access_token(
+            str(user.id), {"email": user.email, "act": bool(user.is_active)}
+        )
+        return Token(access_token=access_token, expires_in=expires_in)
+
     async def get_by_id(self, user_id: int) -> User:
         user = await self._repo.get_by_id(user_id)
         if not user:
@@ -0,0 +1,5 @@
+"""Celery tasks executed by background workers."""
+
+from app.tasks.celery_app import celery_app
+
+__all__ = ["celery_app"]
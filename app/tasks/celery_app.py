@@ -0,0 +1,117 @@
+"""Celery application and helpers for running async work inside worker processes."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Coroutine
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
+
+from celery import Celery
+from celery.schedules import crontab
+from celery.signals import worker_init
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.cache import close_response_cache
+from app.core.config import get_settings
+from app.core.http import close_http_client
+from app.core.metrics import instrument_engine, start_metrics_server
+from app.db.replica import ReplicaLagGuard
+
+T = TypeVar("T")
+
+settings = get_settings()
+
+celery_app = Celery(
+    "social_attribution",
+    broker=settings.CELERY_BROKER_URL or settings.REDIS_URL,
+    backend=settings.CELERY_RESULT_BACKEND or settings.REDIS_URL,
+    include=["app.tasks.etl", "app.tasks.exports", "app.tasks.maintenance"],
+)
+celery_app.conf.update(
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    beat_schedule={
+        # Ahead of the ETL so the months it writes always have partitions and dates.
+        "fact-partition-maintenance": {
+            "task": "app.tasks.maintenance.maintain_partitions",
+            "schedule": crontab(hour=(settings.ETL_NIGHTLY_HOUR - 1) % 24, minute=30),
+        },
+        "nightly-etl": {
+            "task": "app.tasks.etl.start_nightly_etl",
+            "schedule": crontab(hour=settings.ETL_NIGHTLY_HOUR, minute=0),
+        },
+        "export-lease-sweep": {
+            "task": "app.tasks.exports.requeue_abandoned_export_jobs",
+            "schedule": float(settings.EXPORT_JOB_LEASE_SECONDS),
+        },
+    },
+)
+
+
+@worker_init.connect
+def _serve_worker_metrics(**_) -> None:
+    if settings.WORKER_METRICS_PORT:
+        start_metrics_server(settings.WORKER_METRICS_PORT)
+
+
+def run_async(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run a task body under its own event loop and release that loop's shared clients.
+
+    Tasks run one after another in a worker process, each under a new
+    ``asyncio.run``. The HTTP client, token buckets and Redis-backed response
+    cache are kept per loop (:class:`~app.core.loop_scope.LoopScoped`); their
+    connections are closed here before the loop goes away.
+    """
+
+    async def main() -> T:
+        try:
+            return await coroutine
+        finally:
+            await close_http_client()
+            await close_response_cache()
+
+    return asyncio.run(main())
+
+
+def _task_engine(url: str, role: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=NullPool,
+        connect_args={
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {"application_name": f"{settings.APP_NAME}:{role}"[:63], **settings.DB_SERVER_SETTINGS},
+        },
+    )
+    instrument_engine(engine, role)
+    return engine
+
+
+@asynccontextmanager
+async def task_sessionmaker(*, read: bool = False) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    """Session factory for one task invocation.
+
+    Each task runs its coroutine under a fresh event loop (``asyncio.run``), and
+    asyncpg connections cannot move between loops, so tasks use an unpooled
+    engine that is disposed before the loop closes. ``read=True`` targets the
+    replica unless it is lagging, mirroring :func:`app.db.session.read_session_factory`.
+    """
+
+    engine = _task_engine(settings.DATABASE_URL, "worker")
+    if read and settings.DATABASE_READ_URL:
+        replica = _task_engine(settings.DATABASE_READ_URL, "worker_read")
+        guard = ReplicaLagGuard(replica, max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS, check_interval=0)
+        if await guard.healthy():
+            await engine.dispose()
+            engine = replica
+        else:
+            await replica.dispose()
+    try:
+        yield async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    finally:
+        await engine.dispose()
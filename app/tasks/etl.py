@@ -0,0 +1,173 @@
+"""Nightly ETL as a Celery workflow.
+
+``start_nightly_etl`` plans the run and applies this canvas::
+
+    group(chain(sync each date chunk) per platform, stage Shopify file)  # fan-out
+      | group(promote Shopify date chunk)                                # chord on the first group
+      | refresh_rollups
+      | refresh_models
+
+Every task is keyed on ``(run_id, step, platform_id, date_id)`` and skips work
+that already succeeded for the run, so retries and re-runs are safe.
+"""
+from __future__ import annotations
+
+from datetime import date
+
+from celery import Signature, chain, group
+
+from app.db.partitions import date_to_id
+from app.services.etl_pipeline_service import EtlPipelineService, EtlPlan
+from app.services.incremental_attribution_service import IncrementalAttributionService
+from app.services.platform_sync_service import SYNC_STEP, PlatformSyncService
+from app.services.postal_resolution_service import PostalResolutionService
+from app.services.rollup_service import RollupService
+from app.services.shopify_ingestion_service import ShopifyIngestionService
+from app.services.shopify_promotion_service import ShopifyPromotionService
+from app.tasks.celery_app import celery_app, run_async, task_sessionmaker
+
+STAGE_STEP = "shopify_stage"
+PROMOTE_STEP = "shopify_promote"
+ROLLUP_STEP = "refresh_rollups"
+MODEL_STEP = "refresh_models"
+
+async def _sync_platform_chunk(run_id: str, platform_id: int, start_date: date, end_date: date) -> int | None:
+    async with task_sessionmaker() as session_factory:
+        async with session_factory() as session:
+            if await EtlPipelineService(session).is_done(
+                run_id, SYNC_STEP, platform_id=platform_id, date_id=date_to_id(start_date)
+            ):
+                return None
+            # The sync writes its own keyed ingestion log row.
+            result = await PlatformSyncService(session).sync(platform_id, start_date, end_date, run_id=run_id)
+            return result.records_fetched
+
+
+async def _stage_shopify_file(run_id: str, path: str, account_id: int, platform_id: int) -> int | None:
+    async with task_sessionmaker() as session_factory:
+        async with session_factory() as session:
+            pipeline = EtlPipelineService(session)
+
+            async def work() -> int:
+                result = await ShopifyIngestionService(session).ingest_file(
+                    path, platform_id=platform_id, account_id=account_id
+                )
+                return result.rows_read
+
+            records = await pipeline.run_step(run_id, STAGE_STEP, work, platform_id=platform_id, skip_if_done=False)
+            pipeline.mark_processed(path)
+            return records
+
+
+async def _promote_chunk(run_id: str, start_date: date, end_date: date) -> int | None:
+    async with task_sessionmaker() as session_factory:
+        async with session_factory() as session:
+
+            async def work() -> int:
+                results = await ShopifyPromotionService(session).promote(start_date, end_date)
+                return sum(result.facts_upserted for result in results)
+
+            return await EtlPipelineService(session).run_step(
+                run_id, PROMOTE_STEP, work, date_id=date_to_id(start_date)
+            )
+
+
+async def _refresh_rollups(run_id: str, start_date: date, end_date: date) -> int | None:
+    async with task_sessionmaker() as session_factory:
+        async with session_factory() as session:
+
+            async def work() -> int:
+                return sum((await RollupService(session).refresh(start_date, end_date)).values())
+
+            return await EtlPipelineService(session).run_step(
+                run_id, ROLLUP_STEP, work, date_id=date_to_id(start_date)
+            )
+
+
+async def _refresh_models(run_id: str, start_date: date, end_date: date) -> int | None:
+    async with task_sessionmaker() as session_factory:
+        async with session_factory() as session:
+
+            async def work() -> int:
+                result = await IncrementalAttributionService(session).refresh(start_date, end_date)
+                return result.run.rows_written if result.run else 0
+
+            return await EtlPipelineService(session).run_step(
+                run_id, MODEL_STEP, work, date_id=date_to_id(start_date)
+            )
+
+
+@celery_app.task
+def sync_platform_chunk(run_id: str, platform_id: int, start_date: str, end_date: str) -> int | None:
+    return run_async(
+        _sync_platform_chunk(run_id, platform_id, date.fromisoformat(start_date), date.fromisoformat(end_date))
+    )
+
+
+@celery_app.task
+def stage_shopify_file(run_id: str, path: str, account_id: int, platform_id: int) -> int | None:
+    return run_async(_stage_shopify_file(run_id, path, account_id, platform_id))
+
+
+@celery_app.task
+def promote_shopify_chunk(run_id: str, start_date: str, end_date: str) -> int | None:
+    return run_async(_promote_chunk(run_id, date.fromisoformat(start_date), date.fromisoformat(end_date)))
+
+
+@celery_app.task
+def refresh_rollups(run_id: str, start_date: str, end_date: str) -> int | None:
+    return run_async(_refresh_rollups(run_id, date.fromisoformat(start_date), date.fromisoformat(end_date)))
+
+
+@celery_app.task
+def refresh_models(run_id: str, start_date: str, end_date: str) -> int | None:
+    return run_async(_refresh_models(run_id, date.fromisoformat(start_date), date.fromisoformat(end_date)))
+
+
+async def _plan(day: date | None):
+    async with task_sessionmaker() as session_factory:
+        async with session_factory() as session:
+            plan = await EtlPipelineService(session).plan(day)
+            if plan.shopify_exports:
+                # Once per run rather than per file: the backfill scans every
+                # unresolved mapping row and would serialise parallel stages.
+                await PostalResolutionService(session).backfill_city_ids()
+                await session.commit()
+            return plan
+
+
+def build_workflow(plan: EtlPlan) -> Signature:
+    """Return the run's canvas (see the module docstring) without applying it."""
+
+    window = (plan.start_date.isoformat(), plan.end_date.isoformat())
+    chunks = [(start.isoformat(), end.isoformat()) for start, end in plan.chunks]
+
+    # A platform's chunks sync one after another: its accounts share
+    # campaigns, so parallel chunks would contend on the same hierarchy rows.
+    # Platforms (and Shopify files) still run side by side.
+    extract = [
+        chain(sync_platform_chunk.si(plan.run_id, platform_id, start, end) for start, end in chunks)
+        for platform_id in plan.platform_ids
+    ]
+    extract += [
+        stage_shopify_file.si(plan.run_id, export.path, export.account_id, export.platform_id)
+        for export in plan.shopify_exports
+    ]
+    steps = []
+    if extract:
+        steps.append(group(extract))
+    # A group followed by another step in a chain is run as a chord, so each
+    # stage starts only once every task of the previous fan-out has finished.
+    steps.append(group(promote_shopify_chunk.si(plan.run_id, start, end) for start, end in chunks))
+    steps.append(refresh_rollups.si(plan.run_id, *window))
+    steps.append(refresh_models.si(plan.run_id, *window))
+    return chain(*steps)
+
+
+@celery_app.task
+def start_nightly_etl(day: str | None = None) -> str:
+    """Plan tonight's run and launch its workflow; returns the run id."""
+
+    plan = run_async(_plan(date.fromisoformat(day) if day else None))
+    build_workflow(plan).apply_async()
+    return plan.run_id
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from app.services.export_job_service import ExportJobService
+from app.tasks.celery_app import celery_app, run_async, task_sessionmaker
+
+
+async def _run_export_job(job_id: str) -> str:
+    async with task_sessionmaker() as session_factory, task_sessionmaker(read=True) as read_session_factory:
+        async with session_factory() as session:
+            # Job bookkeeping goes to the primary; the extract itself reads from the replica.
+            job = await ExportJobService(session).run(job_id, read_session_factory)
+            return job.status
+
+
+@celery_app.task
+def run_export_job(job_id: str) -> str:
+    """Stream one export job into S3; a redelivered job that already finished is a no-op."""
+
+    return run_async(_run_export_job(job_id))
+
+
+async def _requeue_abandoned_export_jobs() -> list[str]:
+    async with task_sessionmaker() as session_factory:
+        async with session_factory() as session:
+            return await ExportJobService(session).requeue_abandoned()
+
+
+@celery_app.task
+def requeue_abandoned_export_jobs() -> list[str]:
+    """Beat-scheduled sweep putting jobs whose worker died back on the queue."""
+
+    return run_async(_requeue_abandoned_export_jobs())
@@ -0,0 +1,56 @@
+"""Periodic and one-off database housekeeping."""
+from __future__ import annotations
+
+import logging
+from datetime import date
+
+from app.db.partitions import maintain_fact_partitions
+from app.services.rollup_service import RollupService
+from app.tasks.celery_app import celery_app, run_async, settings, task_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+async def _maintain_partitions() -> dict[str, dict[str, list[str]]]:
+    async with task_sessionmaker() as session_factory:
+        async with session_factory() as session:
+            return await maintain_fact_partitions(
+                session,
+                months_ahead=settings.PARTITION_MONTHS_AHEAD,
+                retain_months=settings.PARTITION_RETENTION_MONTHS,
+            )
+
+
+@celery_app.task
+def maintain_partitions() -> dict[str, dict[str, list[str]]]:
+    """Pre-create upcoming monthly fact partitions and detach expired ones."""
+
+    report = run_async(_maintain_partitions())
+    for table, changes in report.items():
+        if changes["created"] or changes["expired"]:
+            logger.info("%s: created %s, detached %s", table, changes["created"], changes["expired"])
+    return report
+
+
+async def _backfill_rollups(start_date: date | None, end_date: date | None) -> dict[str, int]:
+    async with task_sessionmaker() as session_factory:
+        async with session_factory() as session:
+            return await RollupService(session).backfill(start_date, end_date)
+
+
+@celery_app.task
+def backfill_rollups(start_date: str | None = None, end_date: str | None = None) -> dict[str, int]:
+    """Build the weekly/monthly rollups over the fact history (ISO dates; default: all of it).
+
+    Run once after the rollup tables are added, or after facts are loaded
+    outside the nightly ETL. Rerunning resumes from the oldest covered month.
+    """
+
+    written = run_async(
+        _backfill_rollups(
+            date.fromisoformat(start_date) if start_date else None,
+            date.fromisoformat(end_date) if end_date else None,
+        )
+    )
+    logger.info("Rollup backfill wrote %s", written)
+    return written
@@ -0,0 +1,83 @@
+"""Benchmark the in-memory city → DMA allocation index.
+
+Builds a synthetic ``map_city_dma`` (a share of cities split across two DMAs,
+a share re-assigned mid-window) and a dense ``fact_shopify_daily`` of one row
+per city per day, then times index build and allocation.
+
+    python -m benchmarks.city_dma_allocation --cities 30000 --days 730
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.services.city_dma_index import CityDMAIndex, date_ids_to_days
+
+
+def synthetic_intervals(cities: int, start_day: int, days: int, rng: np.random.Generator) -> tuple[np.ndarray, ...]:
+    open_start, open_end = -10957, 376199  # 2000-01-01 .. 2999-12-31
+    city_ids = np.arange(1, cities + 1, dtype=np.int64)
+    dma_ids = rng.integers(500, 710, size=cities)
+
+    split = rng.random(cities) < 0.1
+    moved = rng.random(cities) < 0.05
+    moved_on = start_day + rng.integers(1, days, size=cities)
+
+    columns: list[tuple[np.ndarray, ...]] = []
+    plain = ~split & ~moved
+    columns.append(
+        (city_ids[plain], np.full(plain.sum(), open_start), np.full(plain.sum(), open_end), dma_ids[plain], np.ones(plain.sum()))
+    )
+    # Split cities: 60/40 across two DMAs for the whole window.
+    n = split.sum()
+    for offset, share in ((0, 0.6), (1, 0.4)):
+        columns.append(
+            (city_ids[split], np.full(n, open_start), np.full(n, open_end), dma_ids[split] + offset, np.full(n, share))
+        )
+    # Moved cities: a new DMA from ``moved_on`` onwards.
+    only_moved = moved & ~split
+    n = only_moved.sum()
+    columns.append((city_ids[only_moved], np.full(n, open_start), moved_on[only_moved] - 1, dma_ids[only_moved], np.ones(n)))
+    columns.append((city_ids[only_moved], moved_on[only_moved], np.full(n, open_end), dma_ids[only_moved] + 1, np.ones(n)))
+    return tuple(np.concatenate(parts) for parts in zip(*columns))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cities", type=int, default=30_000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    start = date(2024, 1, 1)
+    date_ids = np.array(
+        [int((start + timedelta(days=offset)).strftime("%Y%m%d")) for offset in range(args.days)], dtype=np.int64
+    )
+    start_day = int(date_ids_to_days(date_ids[:1])[0])
+    intervals = synthetic_intervals(args.cities, start_day, args.days, rng)
+
+    started = time.perf_counter()
+    index = CityDMAIndex.build(*intervals)
+    build_seconds = time.perf_counter() - started
+
+    fact_cities = np.repeat(np.arange(1, args.cities + 1, dtype=np.int64), args.days)
+    fact_dates = np.tile(date_ids, args.cities)
+    values = rng.gamma(2.0, 50.0, size=(len(fact_cities), 2))
+
+    started = time.perf_counter()
+    allocation = index.allocate(fact_cities, fact_dates, values)
+    allocate_seconds = time.perf_counter() - started
+
+    print(f"intervals: {len(intervals[0]):,}  segments: {index.segments:,}  fact rows: {len(fact_cities):,}")
+    print(f"build:     {build_seconds:.3f}s")
+    print(f"allocate:  {allocate_seconds:.3f}s  ({len(fact_cities) / allocate_seconds:,.0f} rows/s)")
+    print(f"dma-days:  {len(allocation.dma_ids):,}  unallocated: {allocation.unallocated.round(6).tolist()}")
+    print(f"conserved: {np.allclose(allocation.values.sum(axis=0) + allocation.unallocated, values.sum(axis=0))}")
+
+
+if __name__ == "__main__":
+    main()
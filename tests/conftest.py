@@ -0,0 +1,190 @@
+"""Shared fixtures.
+
+Database tests run against a real Postgres named by ``TEST_DATABASE_URL``
+(an async SQLAlchemy URL, e.g. ``postgresql+asyncpg://postgres@localhost/satest``)
+and are skipped when it is unset. The schema is migrated to head once per
+session; before each test every table is truncated and the monthly fact
+partitions are dropped, so the database must be dedicated to the test run.
+"""
+from __future__ import annotations
+
+import os
+from collections.abc import AsyncIterator
+from datetime import date, timedelta
+
+import httpx
+import pytest
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+# Settings are read at import time by several modules, so configure them first.
+os.environ.setdefault("DATABASE_URL", TEST_DATABASE_URL or "postgresql+asyncpg://postgres@localhost/unused")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("INIT_DB_ON_STARTUP", "false")
+os.environ.setdefault("CELERY_BROKER_URL", "memory://")
+os.environ.setdefault("CELERY_RESULT_BACKEND", "cache+memory://")
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from app.db.partitions import date_to_id  # noqa: E402
+
+# Bookkeeping tables that survive the per-test truncation. Keeping
+# ``table_version`` keeps its counters monotonic across tests, as in production.
+_KEEP_TABLES = ("alembic_version", "table_version")
+
+
+@pytest.fixture(scope="session")
+def database_url() -> str:
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    from app.db.init_db import _upgrade_database
+
+    _upgrade_database(TEST_DATABASE_URL)
+    return TEST_DATABASE_URL
+
+
+@pytest.fixture
+async def engine(database_url: str) -> AsyncIterator[AsyncEngine]:
+    # Unpooled: every test runs on its own event loop.
+    engine = create_async_engine(database_url, poolclass=NullPool)
+    async with engine.begin() as conn:
+        # Monthly fact partitions (attached or detached) are dropped as well, so
+        # every test starts with only the default partitions.
+        partitions = (
+            await conn.execute(
+                text(
+                    "SELECT quote_ident(relname) FROM pg_class"
+                    " WHERE relkind = 'r' AND relname ~ '^fact_(marketing|shopify)_daily_p[0-9]{6}$'"
+                )
+            )
+        ).scalars().all()
+        if partitions:
+            await conn.execute(text(f"DROP TABLE {', '.join(partitions)}"))
+        tables = (
+            await conn.execute(
+                text(
+                    "SELECT quote_ident(c.relname) FROM pg_class c"
+                    " JOIN pg_namespace n ON n.oid = c.relnamespace"
+                    " WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p') AND NOT c.relispartition"
+                    "  AND c.relname <> ALL(:keep)"
+                ),
+                {"keep": list(_KEEP_TABLES)},
+            )
+        ).scalars().all()
+        if tables:
+            await conn.execute(text(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE"))
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+
+@pytest.fixture
+async def session(session_factory: async_sessionmaker[AsyncSession]) -> AsyncIterator[AsyncSession]:
+    async with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+async def api_client(session_factory: async_sessionmaker[AsyncSession]) -> AsyncIterator[httpx.AsyncClient]:
+    """A signed-in client for the app, with every database session drawn from ``session_factory``."""
+
+    from app.core.security import create_access_token
+    from app.db.session import get_db, read_session_factory
+    from app.main import app
+
+    async def test_session() -> AsyncIterator[AsyncSession]:
+        async with session_factory() as session:
+            yield session
+
+    async def test_session_factory() -> async_sessionmaker[AsyncSession]:
+        return session_factory
+
+    # get_read_db draws from read_session_factory, so it follows the override.
+    app.dependency_overrides.update({get_db: test_session, read_session_factory: test_session_factory})
+    token, _ = create_access_token("1", {"email": "user@example.com", "act": True})
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://test",
+            headers={"Authorization": f"Bearer {token}"},
+        ) as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+
+
+class MemoryRedis:
+    """The handful of Redis commands :class:`~app.core.cache.ResponseCache` uses, kept in a dict."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: str, ex: int | None = None) -> None:
+        self.data[key] = value.encode()
+
+    async def incr(self, key: str) -> int:
+        value = int(self.data.get(key, 0)) + 1
+        self.data[key] = str(value).encode()
+        return value
+
+
+async def seed_dates(session: AsyncSession, start_date: date, end_date: date) -> None:
+    """Insert ``dim_date`` rows (``yyyymmdd`` keys) for every day of the window."""
+
+    days = (end_date - start_date).days + 1
+    rows = [start_date + timedelta(days=offset) for offset in range(days)]
+    await session.execute(
+        text(
+            "INSERT INTO dim_date (date_id, date_actual, week, month, quarter, year)"
+            " VALUES (:date_id, :date_actual, :week, :month, :quarter, :year)"
+            " ON CONFLICT DO NOTHING"
+        ),
+        [
+            {
+                "date_id": date_to_id(day),
+                "date_actual": day,
+                "week": day.isocalendar()[1],
+                "month": day.month,
+                "quarter": (day.month - 1) // 3 + 1,
+                "year": day.year,
+            }
+            for day in rows
+        ],
+    )
+
+
+async def seed_attribution_inputs(session: AsyncSession, start_date: date, end_date: date) -> None:
+    """Seed two platforms' spend and Shopify revenue over four single-city DMAs, then commit."""
+
+    await seed_dates(session, start_date, end_date)
+    for statement in (
+        "INSERT INTO dim_platform (name) VALUES ('meta'), ('google')",
+        "INSERT INTO dim_account (platform_id, external_account_id) VALUES (1, 'm'), (2, 'g')",
+        "INSERT INTO dim_campaign (account_id, external_campaign_id) VALUES (1, 'c'), (2, 'c')",
+        "INSERT INTO dim_adset_or_adgroup (campaign_id, external_adset_id) VALUES (1, 's'), (2, 's')",
+        "INSERT INTO dim_ad (adset_id, external_ad_id) VALUES (1, 'a'), (2, 'a')",
+        "INSERT INTO dim_dma (dma_code, dma_name) SELECT 'D' || i, 'DMA ' || i FROM generate_series(1, 4) i",
+        "INSERT INTO dim_country (iso2, country_name) VALUES ('US', 'United States')",
+        "INSERT INTO dim_region (country_id, region_name) VALUES (1, 'Region')",
+        "INSERT INTO dim_city (region_id, city_name) SELECT 1, 'City ' || i FROM generate_series(1, 4) i",
+        "INSERT INTO dim_postal (city_id, postal_code) SELECT i, lpad(i::text, 5, '0') FROM generate_series(1, 4) i",
+        "INSERT INTO map_city_dma (country_id, region_id, city_id, dma_id) SELECT 1, 1, i, i FROM generate_series(1, 4) i",
+        "INSERT INTO fact_marketing_daily (platform_id, account_id, campaign_id, adset_id, ad_id, date_id, dma_id, spend)"
+        " SELECT p, p, p, p, p, d.date_id, m, 10 + 5 * sin(d.date_id * p + m)"
+        " FROM generate_series(1, 2) p CROSS JOIN generate_series(1, 4) m CROSS JOIN dim_date d",
+        "INSERT INTO fact_shopify_daily (date_id, country_id, region_id, city_id, postal_id, revenue)"
+        " SELECT d.date_id, 1, 1, c, c, 100 + 20 * cos(d.date_id + c) FROM generate_series(1, 4) c CROSS JOIN dim_date d",
+    ):
+        await session.execute(text(statement))
+    await session.commit()
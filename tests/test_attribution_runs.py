@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.marketing import ModelRun
+from app.services.attribution_service import AttributionService
+from tests.conftest import seed_attribution_inputs
+
+START, END = date(2025, 1, 1), date(2025, 1, 28)
+
+
+async def test_parallel_run_records_shard_timings(session: AsyncSession) -> None:
+    await seed_attribution_inputs(session, START, END)
+
+    result = await AttributionService(session).run(START, END, workers=2)
+
+    run = (await session.execute(select(ModelRun).where(ModelRun.run_id == result.run_id))).scalar_one()
+    assert (run.start_date_id, run.end_date_id) == (20250101, 20250128)
+    assert (run.platforms, run.dmas, run.days, run.workers) == (2, 4, 28, 2)
+    assert run.rows_written == result.rows_written == 2 * 4 * 28
+    assert [(shard["first_dma_id"], shard["last_dma_id"]) for shard in run.shard_timings] == [(1, 2), (3, 4)]
+    assert all(shard["seconds"] >= 0 for shard in run.shard_timings)
+
+
+async def test_single_process_run_is_recorded_without_shards(session: AsyncSession) -> None:
+    await seed_attribution_inputs(session, START, END)
+
+    first = await AttributionService(session).run(START, END, workers=1, dma_ids=[2, 3])
+    second = await AttributionService(session).run(START, END, workers=1)
+
+    runs = (await session.execute(select(ModelRun).order_by(ModelRun.run_id))).scalars().all()
+    assert [run.run_id for run in runs] == [first.run_id, second.run_id]
+    assert [(run.dmas, run.workers, run.shard_timings) for run in runs] == [(2, 1, []), (4, 1, [])]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from datetime import date
+
+import httpx
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.cache import ResponseCache
+from app.schemas.batch import BatchRequest
+from app.services.batch_service import BatchService
+from app.services.campaign_service import CampaignService
+from tests.conftest import MemoryRedis, seed_attribution_inputs
+
+
+async def test_failures_stay_with_their_query(
+    api_client: httpx.AsyncClient, session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await seed_attribution_inputs(session, date(2025, 1, 1), date(2025, 1, 7))
+
+    async def crash(*args, **kwargs):
+        raise RuntimeError("replica went away")
+
+    monkeypatch.setattr(CampaignService, "list_adsets", crash)
+    queries = {
+        "tree": {"kind": "campaign_tree", "campaign_id": 99},
+        "stats": {"kind": "stats", "start_date": "2025-01-01", "end_date": "2025-01-07"},
+        "adsets": {"kind": "adsets", "campaign_id": 1},
+        "backwards": {"kind": "stats", "start_date": "2025-01-07", "end_date": "2025-01-01"},
+        "ads": {"kind": "ads", "adset_id": 2},
+    }
+
+    response = await api_client.post("/api/v1/dashboard/batch", json={"queries": queries})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    # Results come back under the request's names, in its order.
+    assert list(results) == list(queries)
+    assert {name: result["status_code"] for name, result in results.items()} == {
+        "tree": 404,
+        "stats": 200,
+        "adsets": 500,
+        "backwards": 422,
+        "ads": 200,
+    }
+    assert results["adsets"]["detail"] == "Query failed."
+    assert results["stats"]["data"]["spend"] > 0
+    assert [ad["ad_id"] for ad in results["ads"]["data"]["items"]] == [2]
+
+
+async def test_oversized_batches_are_rejected(api_client: httpx.AsyncClient) -> None:
+    queries = {f"q{i}": {"kind": "campaigns"} for i in range(100)}
+    response = await api_client.post("/api/v1/dashboard/batch", json={"queries": queries})
+    assert response.status_code == 422
+
+
+async def test_cached_stats_hold_one_connection_per_permit(
+    engine: AsyncEngine, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    in_use = peak = 0
+
+    def checkout(*args) -> None:
+        nonlocal in_use, peak
+        in_use += 1
+        peak = max(peak, in_use)
+
+    def checkin(*args) -> None:
+        nonlocal in_use
+        in_use -= 1
+
+    event.listen(engine.sync_engine.pool, "checkout", checkout)
+    event.listen(engine.sync_engine.pool, "checkin", checkin)
+    queries = {
+        f"day{day}": {"kind": "stats", "start_date": "2025-01-01", "end_date": f"2025-01-{day:02d}"}
+        for day in range(10, 18)
+    }
+    service = BatchService(session_factory, ResponseCache(MemoryRedis(), ttl_seconds=60), concurrency=2)
+
+    response = await service.run(BatchRequest.model_validate({"queries": queries}))
+
+    assert [result.status_code for result in response.results.values()] == [200] * len(queries)
+    assert peak <= 2
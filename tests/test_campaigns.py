@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def _seed(session: AsyncSession) -> None:
+    for statement in (
+        "INSERT INTO dim_platform (name) VALUES ('meta')",
+        "INSERT INTO dim_account (platform_id, external_account_id) VALUES (1, 'act')",
+        "INSERT INTO dim_campaign (account_id, external_campaign_id) VALUES (1, 'busy'), (1, 'empty')",
+        "INSERT INTO dim_adset_or_adgroup (campaign_id, external_adset_id) SELECT 1, 's' || i FROM generate_series(1, 5) i",
+    ):
+        await session.execute(text(statement))
+    await session.commit()
+
+
+async def _pages(client: httpx.AsyncClient, url: str, limit: int, key: str) -> list[list[int]]:
+    pages, after = [], None
+    while True:
+        params = {"limit": limit} if after is None else {"limit": limit, "after": after}
+        response = await client.get(url, params=params)
+        assert response.status_code == 200
+        body = response.json()
+        pages.append([item[key] for item in body["items"]])
+        after = body["next_after"]
+        if after is None:
+            return pages
+        # The cursor is the last id on the page.
+        assert after == pages[-1][-1]
+
+
+async def test_keyset_pages_cover_every_row_once(api_client: httpx.AsyncClient, session: AsyncSession) -> None:
+    await _seed(session)
+    url = "/api/v1/campaigns/1/adsets"
+
+    assert await _pages(api_client, url, 2, "adset_id") == [[1, 2], [3, 4], [5]]
+    # A page that exactly exhausts the rows has no next cursor.
+    assert await _pages(api_client, url, 5, "adset_id") == [[1, 2, 3, 4, 5]]
+
+    # Rows added between requests land after the cursor, not in an earlier page.
+    first = (await api_client.get(url, params={"limit": 3})).json()
+    await session.execute(text("INSERT INTO dim_adset_or_adgroup (campaign_id, external_adset_id) VALUES (1, 's6')"))
+    await session.commit()
+    rest = (await api_client.get(url, params={"limit": 3, "after": first["next_after"]})).json()
+    assert [item["adset_id"] for item in first["items"] + rest["items"]] == [1, 2, 3, 4, 5, 6]
+    assert rest["next_after"] is None
+
+
+async def test_missing_parents_are_404_on_every_page(api_client: httpx.AsyncClient, session: AsyncSession) -> None:
+    await _seed(session)
+
+    for params in ({}, {"after": 3}):
+        assert (await api_client.get("/api/v1/campaigns/99/adsets", params=params)).status_code == 404
+        assert (await api_client.get("/api/v1/adsets/99/ads", params=params)).status_code == 404
+    # An existing parent past its last row is just an empty page.
+    response = await api_client.get("/api/v1/campaigns/1/adsets", params={"after": 5})
+    assert response.json() == {"items": [], "next_after": None}
+    response = await api_client.get("/api/v1/campaigns/2/adsets")
+    assert response.status_code == 200 and response.json()["items"] == []
+
+
+async def test_malformed_cursor_is_rejected(api_client: httpx.AsyncClient, session: AsyncSession) -> None:
+    await _seed(session)
+
+    for params in ({"after": "abc"}, {"after": "1.5"}, {"limit": 0}):
+        assert (await api_client.get("/api/v1/campaigns/1/adsets", params=params)).status_code == 422
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from datetime import date
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from tests.conftest import seed_dates
+
+URL = "/api/v1/dashboard/stats"
+WINDOW = {"start_date": "2025-03-01", "end_date": "2025-03-03"}
+
+
+@pytest.fixture(autouse=True)
+def _no_availability_pruning(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Pruning has its own tests; here every platform reports every metric.
+    monkeypatch.setattr(get_settings(), "DASHBOARD_PRUNE_UNAVAILABLE_METRICS", False)
+
+
+async def _seed(session: AsyncSession) -> None:
+    await seed_dates(session, date(2025, 2, 28), date(2025, 3, 3))
+    for statement in (
+        "INSERT INTO dim_platform (name) VALUES ('meta'), ('google')",
+        "INSERT INTO dim_account (platform_id, external_account_id) VALUES (1, 'm'), (2, 'g')",
+        "INSERT INTO dim_campaign (account_id, external_campaign_id) VALUES (1, 'c'), (2, 'c')",
+        "INSERT INTO dim_adset_or_adgroup (campaign_id, external_adset_id) VALUES (1, 's'), (2, 's')",
+        "INSERT INTO dim_ad (adset_id, external_ad_id) VALUES (1, 'a'), (2, 'a')",
+        "INSERT INTO dim_dma (dma_code, dma_name) VALUES ('501', 'New York'), ('803', 'Los Angeles')",
+        "INSERT INTO dim_country (iso2, country_name) VALUES ('US', 'United States')",
+        "INSERT INTO dim_region (country_id, region_name) VALUES (1, 'Region')",
+        "INSERT INTO dim_city (region_id, city_name) VALUES (1, 'Brooklyn'), (1, 'Pasadena')",
+        "INSERT INTO dim_postal (city_id, postal_code) VALUES (1, '11201'), (2, '91101')",
+        "INSERT INTO map_city_dma (country_id, region_id, city_id, dma_id) VALUES (1, 1, 1, 1), (1, 1, 2, 2)",
+        "INSERT INTO fact_marketing_daily (platform_id, account_id, campaign_id, adset_id, ad_id, date_id,"
+        " country_id, region_id, dma_id, spend, impressions, clicks, conversions, conversion_value) VALUES"
+        " (1, 1, 1, 1, 1, 20250301, 1, 1, 1, 100, 1000, 10, 4, 300),"
+        " (1, 1, 1, 1, 1, 20250302, 1, 1, 2, 50, 500, 5, 1, 60),"
+        " (2, 2, 2, 2, 2, 20250303, 1, 1, 1, 30, 300, 3, 0, 0),"
+        # Outside the window.
+        " (1, 1, 1, 1, 1, 20250228, 1, 1, 1, 999, 9, 9, 9, 9)",
+        "INSERT INTO fact_shopify_daily (date_id, country_id, region_id, city_id, postal_id, revenue, orders) VALUES"
+        " (20250301, 1, 1, 1, 1, 400, 4), (20250302, 1, 1, 2, 2, 100, 1), (20250228, 1, 1, 1, 1, 999, 9)",
+    ):
+        await session.execute(text(statement))
+    await session.commit()
+
+
+def _platforms(body: dict) -> list[tuple]:
+    return [(p["platform_id"], p["spend"], p["conversions"], p["roas"], p["cpa"]) for p in body["platforms"]]
+
+
+async def test_stats_aggregate_spend_and_sales_over_the_window(
+    api_client: httpx.AsyncClient, session: AsyncSession
+) -> None:
+    await _seed(session)
+
+    body = (await api_client.get(URL, params=WINDOW)).json()
+
+    assert (body["spend"], body["impressions"], body["clicks"], body["conversions"]) == (180, 1800, 18, 5)
+    assert (body["revenue"], body["orders"]) == (500, 5)
+    assert body["roas"] == pytest.approx(500 / 180) and body["cpa"] == 36
+    # Platform ratios use platform-reported conversions; no conversions, no CPA.
+    assert _platforms(body) == [(1, 150, 5, 360 / 150, 30), (2, 30, 0, 0, None)]
+
+
+async def test_dma_filter_apportions_sales_through_the_city_mapping(
+    api_client: httpx.AsyncClient, session: AsyncSession
+) -> None:
+    await _seed(session)
+
+    body = (await api_client.get(URL, params={**WINDOW, "dma_id": 1})).json()
+
+    assert (body["spend"], body["revenue"], body["orders"]) == (130, 400, 4)
+    assert _platforms(body) == [(1, 100, 4, 3, 25), (2, 30, 0, 0, None)]
+
+    # Half of Brooklyn's sales belong to DMA 2 from the 2nd onwards.
+    await session.execute(text("UPDATE map_city_dma SET effective_end_date = '2025-03-01' WHERE city_id = 1"))
+    await session.execute(
+        text(
+            "INSERT INTO fact_shopify_daily (date_id, country_id, region_id, city_id, postal_id, revenue, orders)"
+            " VALUES (20250302, 1, 1, 1, 1, 200, 2)"
+        )
+    )
+    await session.execute(
+        text(
+            "INSERT INTO map_city_dma (country_id, region_id, city_id, dma_id, dma_share, effective_start_date)"
+            " VALUES (1, 1, 1, 2, 0.5, '2025-03-02')"
+        )
+    )
+    await session.commit()
+    body = (await api_client.get(URL, params={**WINDOW, "dma_id": 2})).json()
+    assert (body["spend"], body["revenue"], body["orders"]) == (50, 200, 2)
+
+
+async def test_platform_filter_and_empty_windows(api_client: httpx.AsyncClient, session: AsyncSession) -> None:
+    await _seed(session)
+
+    body = (await api_client.get(URL, params={**WINDOW, "platform_id": 2})).json()
+    # Shopify sales are not platform-specific, so they stay window-wide.
+    assert (body["spend"], body["revenue"], _platforms(body)) == (30, 500, [(2, 30, 0, 0, None)])
+
+    body = (await api_client.get(URL, params={"start_date": "2025-03-10", "end_date": "2025-03-12"})).json()
+    assert (body["spend"], body["revenue"], body["roas"], body["platforms"]) == (0, 0, None, [])
+
+    response = await api_client.get(URL, params={"start_date": "2025-03-03", "end_date": "2025-03-01"})
+    assert response.status_code == 422
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import Settings, get_settings
+from app.core.metrics import InstrumentedAsyncQueuePool
+from app.db import session as db_session
+from app.db.session import _create_engine
+
+
+def test_settings_read_pool_options_from_the_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DB_POOL_SIZE", "7")
+    monkeypatch.setenv("DB_READ_MAX_OVERFLOW", "3")
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "null")
+    monkeypatch.setenv("DB_SERVER_SETTINGS", '{"work_mem": "64MB"}')
+
+    settings = Settings()
+
+    assert (settings.DB_POOL_SIZE, settings.DB_READ_MAX_OVERFLOW) == (7, 3)
+    assert settings.DB_STATEMENT_TIMEOUT_MS is None
+    assert settings.DB_SERVER_SETTINGS == {"work_mem": "64MB"}
+    # SQL echo is opt-in and independent of DEBUG.
+    assert settings.DEBUG and not settings.DB_ECHO
+
+
+def test_primary_and_read_engines_have_their_own_pools() -> None:
+    settings = get_settings()
+    primary, read = db_session.engine.sync_engine.pool, db_session.read_engine.sync_engine.pool
+
+    assert primary is not read
+    assert isinstance(primary, InstrumentedAsyncQueuePool) and isinstance(read, InstrumentedAsyncQueuePool)
+    assert (primary.size(), primary._max_overflow) == (settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+    assert (read.size(), read._max_overflow) == (settings.DB_READ_POOL_SIZE, settings.DB_READ_MAX_OVERFLOW)
+    assert not db_session.engine.echo
+    # Without DATABASE_READ_URL reads go to the primary's database.
+    assert db_session.read_engine.url == db_session.engine.url
+
+
+async def test_connections_carry_the_configured_server_settings(
+    database_url: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "DB_SERVER_SETTINGS", {"work_mem": "8MB"})
+    engine = _create_engine(settings, database_url, role="test", pool_size=1, max_overflow=0, statement_timeout_ms=1500)
+    try:
+        async with engine.connect() as conn:
+            shown = [
+                (await conn.execute(text(f"SHOW {name}"))).scalar_one()
+                for name in ("statement_timeout", "application_name", "work_mem")
+            ]
+        assert shown == ["1500ms", f"{settings.APP_NAME}:test", "8MB"]
+    finally:
+        await engine.dispose()
+
+
+async def test_checkout_fails_after_the_pool_timeout(database_url: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT_SECONDS", 0.2)
+    engine = _create_engine(settings, database_url, role="test", pool_size=1, max_overflow=0, statement_timeout_ms=None)
+    try:
+        async with engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                await asyncio.wait_for(engine.connect().__aenter__(), timeout=5)
+    finally:
+        await engine.dispose()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.dimension_cache import DimensionCache
+from app.repositories.platform_load import LOAD_COLUMNS, PlatformLoadRepository
+from app.repositories.table_version import TableVersionRepository
+from tests.conftest import seed_dates
+
+
+async def _seed(session: AsyncSession) -> None:
+    for statement in (
+        "INSERT INTO dim_platform (name) VALUES ('meta')",
+        "INSERT INTO dim_dma (dma_code, dma_name) VALUES ('501', 'New York'), ('803', 'Los Angeles')",
+        "INSERT INTO map_platform_dma (platform_id, platform_dma_label, dma_id) VALUES (1, 'NYC', 1)",
+        "INSERT INTO dim_account (platform_id, external_account_id) VALUES (1, 'act')",
+    ):
+        await session.execute(text(statement))
+    await session.commit()
+
+
+async def test_version_moves_with_committed_writes(session: AsyncSession) -> None:
+    repo = TableVersionRepository(session)
+    before = (await repo.versions(["map_platform_dma"]))["map_platform_dma"]
+    await _seed(session)
+    inserted = (await repo.versions(["map_platform_dma"]))["map_platform_dma"]
+    assert inserted[0] > before[0] and inserted[1] == before[1]
+
+    # Statements that change nothing leave the counters alone.
+    await session.execute(text("UPDATE map_platform_dma SET dma_id = 2 WHERE platform_dma_label = 'missing'"))
+    await session.commit()
+    assert (await repo.versions(["map_platform_dma"]))["map_platform_dma"] == inserted
+
+    await session.execute(text("UPDATE map_platform_dma SET dma_id = 2"))
+    await session.commit()
+    updated = (await repo.versions(["map_platform_dma"]))["map_platform_dma"]
+    assert updated[0] > inserted[0] and updated[1] > inserted[1]
+
+    await session.execute(text("TRUNCATE map_platform_dma"))
+    await session.commit()
+    truncated = (await repo.versions(["map_platform_dma"]))["map_platform_dma"]
+    assert truncated[1] > updated[1]
+    assert (await repo.versions(["untracked"]))["untracked"] == (0, 0)
+
+
+async def test_cache_loads_inserts_incrementally_and_rewrites_fully(session: AsyncSession) -> None:
+    await _seed(session)
+    cache = DimensionCache(check_interval=0)
+    await cache.refresh(session)
+    assert cache.dma_id_for_label(1, "NYC") == 1
+    assert cache.dma_id_for_code("803") == 2
+    assert cache.account_id(1, "act") == 1
+
+    await session.execute(text("INSERT INTO map_platform_dma (platform_id, platform_dma_label, dma_id) VALUES (1, 'LA', 2)"))
+    await session.commit()
+    await cache.refresh(session)
+    assert cache.dma_id_for_label(1, "LA") == 2
+    stats = cache.stats()["platform_dma"]
+    assert (stats["full_loads"], stats["incremental_loads"]) == (1, 1)
+    # Untouched dimensions are not reloaded.
+    assert cache.stats()["dma_code"]["full_loads"] == 1
+
+    await session.execute(text("UPDATE map_platform_dma SET dma_id = 2 WHERE platform_dma_label = 'NYC'"))
+    await session.commit()
+    await cache.refresh(session)
+    assert cache.dma_id_for_label(1, "NYC") == 2
+    assert cache.stats()["platform_dma"]["full_loads"] == 2
+
+
+async def test_replace_facts_prefers_resolved_dma_and_falls_back_to_labels(session: AsyncSession) -> None:
+    await seed_dates(session, date(2025, 3, 1), date(2025, 3, 1))
+    await _seed(session)
+    repo = PlatformLoadRepository(session)
+    await repo.create_load_table()
+
+    def record(ad: str, label: str | None, dma_id: int | None) -> tuple:
+        values = dict.fromkeys(LOAD_COLUMNS)
+        values.update(
+            account_id=1,
+            date_id=20250301,
+            external_campaign_id="c",
+            external_adset_id="s",
+            external_ad_id=ad,
+            dma_label=label,
+            dma_id=dma_id,
+            spend=1,
+        )
+        return tuple(values[column] for column in LOAD_COLUMNS)
+
+    await repo.copy_records([record("cached", "LA", 2), record("missed", "NYC", None), record("unknown", "?", None)])
+    await repo.upsert_hierarchy()
+    assert await repo.replace_facts(1, [1], date(2025, 3, 1), date(2025, 3, 1)) == 3
+
+    rows = await session.execute(
+        text(
+            "SELECT a.external_ad_id, f.dma_id FROM fact_marketing_daily f"
+            " JOIN dim_ad a USING (ad_id) ORDER BY 1"
+        )
+    )
+    assert [tuple(row) for row in rows] == [("cached", 2), ("missed", 1), ("unknown", None)]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from celery.canvas import _chain, chord
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.etl_pipeline_service import EtlPipelineService, EtlPlan, ShopifyExport, date_chunks
+from app.tasks.etl import build_workflow
+
+
+async def _log(session: AsyncSession) -> list[tuple]:
+    rows = await session.execute(
+        text("SELECT step, date_id, status, records_fetched, error_message FROM event_ingestion_log ORDER BY log_id")
+    )
+    return [tuple(row) for row in rows]
+
+
+async def test_finished_steps_are_skipped_on_rerun(session: AsyncSession) -> None:
+    pipeline = EtlPipelineService(session)
+    calls = 0
+
+    async def work() -> int:
+        nonlocal calls
+        calls += 1
+        return 7
+
+    assert await pipeline.run_step("run-1", "refresh_rollups", work, date_id=20250301) == 7
+    # Same key: skipped. Another date or another run: executed.
+    assert await pipeline.run_step("run-1", "refresh_rollups", work, date_id=20250301) is None
+    assert await pipeline.run_step("run-1", "refresh_rollups", work, date_id=20250302) == 7
+    assert await pipeline.run_step("run-2", "refresh_rollups", work, date_id=20250301) == 7
+    assert calls == 3
+    assert await pipeline.is_done("run-1", "refresh_rollups", date_id=20250301)
+    assert not await pipeline.is_done("run-1", "refresh_models", date_id=20250301)
+
+    # Steps that are idempotent by other means run every time.
+    assert await pipeline.run_step("run-1", "refresh_rollups", work, date_id=20250301, skip_if_done=False) == 7
+    assert calls == 4
+
+
+async def test_failed_steps_are_logged_and_retried(session: AsyncSession) -> None:
+    pipeline = EtlPipelineService(session)
+    attempts = 0
+
+    async def work() -> int:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            await session.execute(text("INSERT INTO dim_platform (name) VALUES ('rolled back')"))
+            raise RuntimeError("upstream timeout")
+        return 3
+
+    with pytest.raises(RuntimeError, match="upstream timeout"):
+        await pipeline.run_step("run-1", "refresh_models", work, date_id=20250301)
+    assert not await pipeline.is_done("run-1", "refresh_models", date_id=20250301)
+    assert await pipeline.run_step("run-1", "refresh_models", work, date_id=20250301) == 3
+
+    assert await _log(session) == [
+        ("refresh_models", 20250301, "failed", 0, "upstream timeout"),
+        ("refresh_models", 20250301, "success", 3, None),
+    ]
+    # The failed attempt's own writes were rolled back before logging.
+    assert (await session.execute(text("SELECT count(*) FROM dim_platform"))).scalar_one() == 0
+
+
+def test_workflow_serialises_each_platforms_chunks() -> None:
+    plan = EtlPlan(
+        run_id="nightly-20250308",
+        start_date=date(2025, 3, 1),
+        end_date=date(2025, 3, 7),
+        chunks=date_chunks(date(2025, 3, 1), date(2025, 3, 7), 3),
+        platform_ids=[1, 2],
+        shopify_exports=[ShopifyExport("/exports/5/a.csv", 5, 3)],
+    )
+
+    workflow = build_workflow(plan)
+
+    # Each fan-out followed by a step is upgraded to a chord on that step.
+    assert isinstance(workflow, chord) and isinstance(workflow.body, chord)
+    syncs = [branch for branch in workflow.tasks if isinstance(branch, _chain)]
+    assert [[(task.name, task.args) for task in branch.tasks] for branch in syncs] == [
+        [
+            ("app.tasks.etl.sync_platform_chunk", ("nightly-20250308", platform_id, start, end))
+            for start, end in (("2025-03-01", "2025-03-03"), ("2025-03-04", "2025-03-06"), ("2025-03-07", "2025-03-07"))
+        ]
+        for platform_id in (1, 2)
+    ]
+    assert [task.name for task in workflow.tasks if not isinstance(task, _chain)] == [
+        "app.tasks.etl.stage_shopify_file"
+    ]
+    promote, finish = workflow.body.tasks, workflow.body.body
+    assert [task.args[1:] for task in promote] == [
+        ("2025-03-01", "2025-03-03"),
+        ("2025-03-04", "2025-03-06"),
+        ("2025-03-07", "2025-03-07"),
+    ]
+    assert [(task.name, task.args) for task in finish.tasks] == [
+        ("app.tasks.etl.refresh_rollups", ("nightly-20250308", "2025-03-01", "2025-03-07")),
+        ("app.tasks.etl.refresh_models", ("nightly-20250308", "2025-03-01", "2025-03-07")),
+    ]
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+from collections.abc import Iterator
+from datetime import date, timedelta
+
+import aioboto3
+import pytest
+from fastapi import HTTPException
+from moto.server import ThreadedMotoServer
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.storage import UploadResult
+from app.repositories.export import ExportJobRepository
+from app.schemas.export import ExportDataset, ExportRequest
+from app.services import export_job_service
+from app.services.export_job_service import EXPORT_JOB_TASK, ExportJobService
+from app.tasks.celery_app import celery_app
+from tests.conftest import seed_dates
+
+BUCKET = "exports"
+
+
+@pytest.fixture(scope="module")
+def s3_endpoint() -> Iterator[str]:
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    try:
+        yield f"http://{host}:{port}"
+    finally:
+        server.stop()
+
+
+@pytest.fixture
+async def s3(s3_endpoint: str, monkeypatch: pytest.MonkeyPatch) -> str:
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    settings = get_settings()
+    monkeypatch.setattr(settings, "S3_ENDPOINT_URL", s3_endpoint)
+    monkeypatch.setattr(settings, "AWS_REGION", "us-east-1")
+    monkeypatch.setattr(settings, "EXPORT_S3_BUCKET", BUCKET)
+    async with aioboto3.Session().client("s3", endpoint_url=s3_endpoint, region_name="us-east-1") as client:
+        try:
+            await client.create_bucket(Bucket=BUCKET)
+        except client.exceptions.BucketAlreadyOwnedByYou:
+            pass
+    return s3_endpoint
+
+
+@pytest.fixture
+def sent(monkeypatch: pytest.MonkeyPatch) -> list[tuple]:
+    calls: list[tuple] = []
+    monkeypatch.setattr(celery_app, "send_task", lambda name, args=None, **kwargs: calls.append((name, args)))
+    return calls
+
+
+async def _seed_facts(session: AsyncSession) -> None:
+    await seed_dates(session, date(2025, 1, 1), date(2025, 1, 3))
+    for statement in (
+        "INSERT INTO dim_platform (name) VALUES ('meta')",
+        "INSERT INTO dim_account (platform_id, external_account_id) VALUES (1, 'act')",
+        "INSERT INTO dim_campaign (account_id, external_campaign_id) VALUES (1, 'c')",
+        "INSERT INTO dim_adset_or_adgroup (campaign_id, external_adset_id) VALUES (1, 's')",
+        "INSERT INTO dim_ad (adset_id, external_ad_id) VALUES (1, 'a')",
+        "INSERT INTO fact_marketing_daily (platform_id, account_id, campaign_id, adset_id, ad_id, date_id, spend)"
+        " SELECT 1, 1, 1, 1, 1, date_id, 2.5 FROM dim_date",
+    ):
+        await session.execute(text(statement))
+    await session.commit()
+
+
+def _lease() -> timedelta:
+    return timedelta(seconds=get_settings().EXPORT_JOB_LEASE_SECONDS)
+
+
+def _request() -> ExportRequest:
+    return ExportRequest(dataset=ExportDataset.marketing_daily, start_date=date(2025, 1, 1), end_date=date(2025, 1, 3))
+
+
+async def _job_status(session: AsyncSession, job_id: str) -> str:
+    return (await session.execute(text("SELECT status FROM export_job WHERE job_id = :id"), {"id": job_id})).scalar_one()
+
+
+async def test_job_is_queued_and_streamed_to_s3(
+    session: AsyncSession, session_factory: async_sessionmaker[AsyncSession], s3: str, sent: list[tuple]
+) -> None:
+    await _seed_facts(session)
+    service = ExportJobService(session)
+
+    created = await service.create(_request())
+    assert sent == [(EXPORT_JOB_TASK, [created.job_id])]
+
+    job = await service.run(created.job_id, session_factory)
+    assert job.status == "succeeded" and job.parts_uploaded == 1 and job.heartbeat_at is not None
+    async with aioboto3.Session().client("s3", endpoint_url=s3, region_name="us-east-1") as client:
+        body = await (await client.get_object(Bucket=BUCKET, Key=job.s3_key))["Body"].read()
+    lines = gzip.decompress(body).decode().splitlines()
+    assert len(lines) == 4 and "spend" in lines[0]
+
+    # A redelivered task finds the job finished and does nothing.
+    assert (await service.run(created.job_id, session_factory)).status == "succeeded"
+
+
+async def test_enqueue_failure_marks_the_job_failed(
+    session: AsyncSession, s3: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def broker_down(*args, **kwargs):
+        raise ConnectionRefusedError("broker unreachable")
+
+    monkeypatch.setattr(celery_app, "send_task", broker_down)
+    with pytest.raises(HTTPException) as raised:
+        await ExportJobService(session).create(_request())
+
+    assert raised.value.status_code == 503
+    row = (await session.execute(text("SELECT status, error_message FROM export_job"))).one()
+    assert row[0] == "failed" and "broker unreachable" in row[1]
+
+
+async def test_abandoned_running_job_is_requeued_and_reclaimed(
+    session: AsyncSession, session_factory: async_sessionmaker[AsyncSession], s3: str, sent: list[tuple]
+) -> None:
+    await _seed_facts(session)
+    service = ExportJobService(session)
+    job_id = (await service.create(_request())).job_id
+    repo = ExportJobRepository(session)
+    first_claim = (await repo.claim(job_id, lease=_lease())).started_at
+    await session.commit()
+    sent.clear()
+
+    # Live lease: neither claimable nor swept.
+    assert await repo.claim(job_id, lease=_lease()) is None
+    assert await service.requeue_abandoned() == []
+
+    # The worker died an hour ago.
+    await session.execute(
+        text("UPDATE export_job SET heartbeat_at = now() - interval '1 hour' WHERE job_id = :id"), {"id": job_id}
+    )
+    await session.commit()
+    assert await service.requeue_abandoned() == [job_id]
+    assert sent == [(EXPORT_JOB_TASK, [job_id])]
+
+    job = await service.run(job_id, session_factory)
+    assert job.status == "succeeded" and job.started_at != first_claim
+    # The dead claim can neither renew its lease nor overwrite the outcome.
+    assert not await repo.heartbeat(job_id, first_claim)
+    assert not await repo.finish(job_id, status="failed", started_at=first_claim)
+    assert await _job_status(session, job_id) == "succeeded"
+
+
+async def test_worker_renews_its_lease_while_uploading(
+    session: AsyncSession,
+    session_factory: async_sessionmaker[AsyncSession],
+    s3: str,
+    sent: list[tuple],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(get_settings(), "EXPORT_JOB_LEASE_SECONDS", 1)
+
+    async def slow_upload(client, chunks, **kwargs) -> UploadResult:
+        await asyncio.sleep(1.2)
+        return UploadResult(bytes_written=0, parts=1)
+
+    monkeypatch.setattr(export_job_service, "upload_stream", slow_upload)
+    job_id = (await ExportJobService(session).create(_request())).job_id
+
+    job = await ExportJobService(session).run(job_id, session_factory)
+    assert job.status == "succeeded"
+    assert (job.heartbeat_at - job.started_at).total_seconds() >= 0.3
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+from datetime import date
+
+import httpx
+import pyarrow.parquet as pq
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.repositories.export import ExportRepository
+from app.schemas.export import ExportDataset, ExportFormat, ExportRequest
+from app.services.export_service import ExportService
+from tests.conftest import seed_dates
+
+URL = "/api/v1/exports/facts"
+
+
+async def _seed(session: AsyncSession) -> None:
+    await seed_dates(session, date(2025, 1, 1), date(2025, 1, 7))
+    for statement in (
+        "INSERT INTO dim_platform (name) VALUES ('meta')",
+        "INSERT INTO dim_account (platform_id, external_account_id) VALUES (1, 'act')",
+        "INSERT INTO dim_campaign (account_id, external_campaign_id) VALUES (1, 'c')",
+        "INSERT INTO dim_adset_or_adgroup (campaign_id, external_adset_id) VALUES (1, 's')",
+        "INSERT INTO dim_ad (adset_id, external_ad_id) VALUES (1, 'a')",
+        "INSERT INTO fact_marketing_daily (platform_id, account_id, campaign_id, adset_id, ad_id, date_id, spend)"
+        " SELECT 1, 1, 1, 1, 1, date_id, date_id % 100 FROM dim_date",
+    ):
+        await session.execute(text(statement))
+    await session.commit()
+
+
+def _request(**overrides) -> ExportRequest:
+    values = {
+        "dataset": ExportDataset.marketing_daily,
+        "start_date": date(2025, 1, 2),
+        "end_date": date(2025, 1, 6),
+        "gzip": False,
+    }
+    return ExportRequest(**{**values, **overrides})
+
+
+async def test_csv_download_is_gzipped_and_limited_to_the_window(
+    api_client: httpx.AsyncClient, session: AsyncSession
+) -> None:
+    await _seed(session)
+
+    response = await api_client.get(
+        URL, params={"dataset": "marketing_daily", "start_date": "2025-01-02", "end_date": "2025-01-06"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert 'filename="marketing_daily_20250102_20250106.csv.gz"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.content).decode())))
+    assert [column.name for column in ExportRepository.columns(ExportDataset.marketing_daily)] == list(rows[0])
+    assert [(row["date_id"], row["spend"]) for row in rows] == [(f"2025010{day}", str(day)) for day in range(2, 7)]
+
+    inverted = {"dataset": "marketing_daily", "start_date": "2025-01-06", "end_date": "2025-01-02"}
+    assert (await api_client.get(URL, params=inverted)).status_code == 422
+
+
+async def test_rows_are_encoded_one_batch_at_a_time(
+    session: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    await _seed(session)
+    batches = ExportRepository(session).stream_batches(
+        ExportDataset.marketing_daily, date(2025, 1, 2), date(2025, 1, 6), batch_size=2
+    )
+    assert [len(batch) async for batch in batches] == [2, 2, 1]
+    await session.rollback()
+
+    chunks = [chunk async for chunk in ExportService(session_factory, batch_size=2).stream(_request())]
+
+    # The header travels with the first batch; every batch is flushed on its own.
+    assert [chunk.decode().count("\n") for chunk in chunks] == [3, 2, 1]
+
+
+async def test_parquet_writes_a_row_group_per_batch(
+    session: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    await _seed(session)
+    service = ExportService(session_factory, batch_size=2)
+
+    data = b"".join([chunk async for chunk in service.stream(_request(format=ExportFormat.parquet, gzip=True))])
+
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read(columns=["date_id", "spend"])
+    assert table.column("date_id").to_pylist() == [20250102, 20250103, 20250104, 20250105, 20250106]
+    assert table.column("spend").to_pylist() == [2.0, 3.0, 4.0, 5.0, 6.0]
+    assert parquet.metadata.row_group(0).column(0).compression == "GZIP"
@@ -0,0 +1,157 @@
+"""Query-plan regression tests for the fact table indexes.
+
+The plans are taken for the statements the repositories actually build.
+Partitions get their own copies of the parent's indexes, so plan nodes are
+mapped back to the parent index through ``pg_inherits`` before asserting.
+"""
+from __future__ import annotations
+
+import json
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.partitions import ensure_monthly_partitions
+from app.repositories.attribution import AttributionRepository
+from app.repositories.campaign import CampaignRepository
+from app.repositories.dashboard import DashboardRepository
+from tests.conftest import seed_dates
+
+START, END = date(2025, 1, 1), date(2025, 2, 28)
+
+
+@pytest.fixture
+async def facts(session: AsyncSession) -> AsyncSession:
+    for table in ("fact_marketing_daily", "fact_shopify_daily"):
+        await ensure_monthly_partitions(session, table, months_ahead=1, today=START)
+    await seed_dates(session, START, END)
+    statements = [
+        "INSERT INTO dim_platform (name) SELECT 'platform ' || i FROM generate_series(1, 3) i",
+        "INSERT INTO dim_account (platform_id, external_account_id) SELECT i, 'acct' || i FROM generate_series(1, 3) i",
+        "INSERT INTO dim_campaign (account_id, external_campaign_id)"
+        " SELECT 1 + i % 3, 'c' || i FROM generate_series(1, 50) i",
+        "INSERT INTO dim_adset_or_adgroup (campaign_id, external_adset_id) SELECT i, 's' || i FROM generate_series(1, 50) i",
+        "INSERT INTO dim_ad (adset_id, external_ad_id) SELECT i, 'a' || i FROM generate_series(1, 50) i",
+        "INSERT INTO dim_dma (dma_code, dma_name) SELECT 'D' || i, 'DMA ' || i FROM generate_series(1, 20) i",
+        "INSERT INTO dim_country (iso2, country_name) VALUES ('US', 'United States')",
+        "INSERT INTO dim_region (country_id, region_name) SELECT 1, 'Region ' || i FROM generate_series(1, 10) i",
+        "INSERT INTO dim_city (region_id, city_name) SELECT 1 + i % 10, 'City ' || i FROM generate_series(1, 200) i",
+        "INSERT INTO dim_postal (city_id, postal_code) SELECT i, lpad(i::text, 5, '0') FROM generate_series(1, 200) i",
+        "INSERT INTO map_city_dma (country_id, region_id, city_id, dma_id)"
+        " SELECT 1, 1 + ci % 10, ci, 1 + ci % 20 FROM generate_series(1, 200) ci",
+        "INSERT INTO fact_marketing_daily (platform_id, account_id, campaign_id, adset_id, ad_id, date_id, dma_id, spend)"
+        " SELECT 1 + c % 3, 1 + c % 3, c, c, c, d.date_id, m, 1.0"
+        " FROM generate_series(1, 50) c CROSS JOIN generate_series(1, 20) m CROSS JOIN dim_date d",
+        "INSERT INTO fact_shopify_daily (date_id, country_id, region_id, city_id, postal_id, revenue)"
+        " SELECT d.date_id, 1, 1 + ci % 10, ci, ci, 10.0 FROM generate_series(1, 200) ci CROSS JOIN dim_date d",
+        # Every joined table, so plans never depend on whether autovacuum got there first.
+        "ANALYZE fact_marketing_daily",
+        "ANALYZE fact_shopify_daily",
+        "ANALYZE map_city_dma",
+        "ANALYZE dim_date",
+    ]
+    for statement in statements:
+        await session.execute(text(statement))
+    await session.commit()
+    return session
+
+
+def _plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+async def _plan(session: AsyncSession, sql: str) -> list[dict]:
+    result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    raw = result.scalar_one()
+    plan = raw if isinstance(raw, list) else json.loads(raw)
+    return list(_plan_nodes(plan[0]["Plan"]))
+
+
+async def _parent_indexes(session: AsyncSession, nodes: list[dict]) -> set[str]:
+    names = {node["Index Name"] for node in nodes if "Index Name" in node}
+    if not names:
+        return set()
+    result = await session.execute(
+        text(
+            "SELECT coalesce(p.relname, c.relname) FROM pg_class c"
+            " LEFT JOIN pg_inherits i ON i.inhrelid = c.oid"
+            " LEFT JOIN pg_class p ON p.oid = i.inhparent"
+            " WHERE c.relname = ANY(:names)"
+        ),
+        {"names": list(names)},
+    )
+    return set(result.scalars())
+
+
+def _scanned_relations(nodes: list[dict]) -> set[str]:
+    return {node["Relation Name"] for node in nodes if "Relation Name" in node}
+
+
+class _RecordingSession:
+    """Forwards to a session, keeping every statement a repository executes."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self.statements: list = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return await self._session.execute(statement, *args, **kwargs)
+
+
+async def _repository_plan(session: AsyncSession, call) -> list[dict]:
+    """Run ``call`` against a recording session and EXPLAIN the statement it executed."""
+
+    recorder = _RecordingSession(session)
+    await call(recorder)
+    compiled = recorder.statements[-1].compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    return await _plan(session, str(compiled))
+
+
+WEEK = (date(2025, 1, 10), date(2025, 1, 16))
+
+
+@pytest.mark.parametrize(
+    ("call", "indexes"),
+    [
+        pytest.param(
+            lambda s: DashboardRepository(s, use_rollups=False).aggregate_stats(*WEEK, dma_id=3),
+            {"ix_fact_marketing_daily_dma_date", "ix_fact_shopify_daily_city_date"},
+            id="dashboard-dma",
+        ),
+        pytest.param(
+            lambda s: DashboardRepository(s, use_rollups=False).aggregate_stats(
+                date(2025, 1, 10), date(2025, 1, 10), platform_id=2
+            ),
+            {"ix_fact_marketing_daily_platform_date"},
+            id="dashboard-platform",
+        ),
+        pytest.param(
+            lambda s: AttributionRepository(s).load_spend(*WEEK, dma_ids=[3]),
+            {"ix_fact_marketing_daily_dma_date"},
+            id="attribution-spend",
+        ),
+        pytest.param(
+            lambda s: CampaignRepository(s).campaign_tree(7, start_date=WEEK[0], end_date=WEEK[1]),
+            {"ix_fact_marketing_daily_campaign_date"},
+            id="campaign-tree",
+        ),
+    ],
+)
+async def test_filtered_fact_reads_use_composite_indexes(facts: AsyncSession, call, indexes: set[str]) -> None:
+    nodes = await _repository_plan(facts, call)
+    assert indexes <= await _parent_indexes(facts, nodes)
+
+
+async def test_date_window_prunes_other_months(facts: AsyncSession) -> None:
+    nodes = await _plan(
+        facts, "SELECT sum(spend) FROM fact_marketing_daily WHERE date_id BETWEEN 20250110 AND 20250116"
+    )
+    assert _scanned_relations(nodes) == {"fact_marketing_daily_p202501"}
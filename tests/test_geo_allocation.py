@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.geo_allocation_service import GeoAllocationService
+from tests.conftest import seed_attribution_inputs
+
+START, END = date(2025, 1, 1), date(2025, 1, 7)
+
+
+async def test_memory_and_sql_allocations_agree(session: AsyncSession) -> None:
+    await seed_attribution_inputs(session, START, END)
+    # City 1 moves from DMA 1 to DMA 2 on the 4th.
+    await session.execute(text("UPDATE map_city_dma SET effective_end_date = '2025-01-03' WHERE city_id = 1"))
+    await session.execute(
+        text(
+            "INSERT INTO map_city_dma (country_id, region_id, city_id, dma_id, dma_share, effective_start_date)"
+            " VALUES (1, 1, 1, 2, 1, '2025-01-04')"
+        )
+    )
+    await session.commit()
+    service = GeoAllocationService(session)
+
+    memory = await service.allocate_shopify(START, END)
+    sql = await service.allocate_shopify(START, END, in_memory=False)
+
+    assert np.array_equal(memory.dma_ids, sql.dma_ids) and np.array_equal(memory.date_ids, sql.date_ids)
+    assert np.allclose(memory.values, sql.values)
+    assert np.allclose(memory.unallocated, 0)
+
+
+async def test_index_is_rebuilt_when_the_mapping_changes(session: AsyncSession) -> None:
+    await seed_attribution_inputs(session, START, END)
+    service = GeoAllocationService(session)
+    index = await service.index()
+    assert await service.index() is index
+
+    await session.execute(text("UPDATE map_city_dma SET dma_id = 1 WHERE city_id = 2"))
+    await session.commit()
+    rebuilt = await service.index()
+    assert rebuilt is not index
+
+    allocation = await service.allocate_shopify(START, END)
+    assert 2 not in allocation.dma_ids.tolist()
+
+
+async def test_dma_selection_reads_only_mapped_cities(session: AsyncSession) -> None:
+    await seed_attribution_inputs(session, START, END)
+    # City 2 moves from DMA 2 to DMA 3 on the 4th.
+    await session.execute(text("UPDATE map_city_dma SET effective_end_date = '2025-01-03' WHERE city_id = 2"))
+    await session.execute(
+        text(
+            "INSERT INTO map_city_dma (country_id, region_id, city_id, dma_id, dma_share, effective_start_date)"
+            " VALUES (1, 1, 2, 3, 1, '2025-01-04')"
+        )
+    )
+    await session.commit()
+    service = GeoAllocationService(session)
+    assert (await service.index()).cities_for(np.array([3])).tolist() == [2, 3]
+
+    full = await service.allocate_shopify(START, END)
+    for in_memory in (True, False):
+        selected = await service.allocate_shopify(START, END, dma_ids=[3], in_memory=in_memory)
+        keep = full.dma_ids == 3
+        assert selected.dma_ids.tolist() == [3] * 7
+        assert np.array_equal(selected.date_ids, full.date_ids[keep])
+        assert np.allclose(selected.values, full.values[keep])
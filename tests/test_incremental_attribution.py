@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.repositories.change_tracking import ChangeTrackingRepository
+from app.repositories.ingestion_log import IngestionLogRepository
+from app.repositories.platform_load import LOAD_COLUMNS, PlatformLoadRepository
+from app.services.attribution_service import DEFAULT_MODEL_NAME, DEFAULT_MODEL_VERSION, AttributionService
+from app.services.incremental_attribution_service import IncrementalAttributionService
+from tests.conftest import seed_attribution_inputs
+
+START, END = date(2025, 1, 1), date(2025, 1, 28)
+
+
+async def _log_sync(session: AsyncSession, platform_id: int, age: timedelta) -> None:
+    """Log a sync that changed one day of every DMA for ``platform_id``."""
+
+    log_id = await session.scalar(
+        text(
+            "INSERT INTO event_ingestion_log (platform_id, sync_timestamp, records_fetched, status)"
+            " VALUES (:platform_id, now() - CAST(:age AS interval), 1, 'success') RETURNING log_id"
+        ),
+        {"platform_id": platform_id, "age": age},
+    )
+    await session.execute(
+        text(
+            "INSERT INTO fact_cell_change (log_id, platform_id, date_id, dma_id)"
+            " SELECT :log_id, :platform_id, 20250110, m FROM generate_series(1, 4) m"
+        ),
+        {"log_id": log_id, "platform_id": platform_id},
+    )
+    await session.commit()
+
+
+async def _resync(session: AsyncSession, *, restate_dma: int | None = None) -> int:
+    """Re-sync Meta's last week as it is stored, bumping one DMA's spend, and return the changed cells."""
+
+    facts = await session.execute(
+        text(
+            "SELECT date_id, dma_id, spend FROM fact_marketing_daily"
+            " WHERE platform_id = 1 AND date_id > 20250121 ORDER BY date_id, dma_id"
+        )
+    )
+    records = []
+    for date_id, dma_id, spend in facts:
+        values = dict.fromkeys(LOAD_COLUMNS)
+        values.update(
+            account_id=1,
+            date_id=date_id,
+            external_campaign_id="c",
+            external_adset_id="s",
+            external_ad_id="a",
+            dma_id=dma_id,
+            spend=spend + 1 if dma_id == restate_dma and date_id == 20250128 else spend,
+        )
+        records.append(tuple(values[column] for column in LOAD_COLUMNS))
+
+    repo = PlatformLoadRepository(session)
+    await repo.create_load_table()
+    await repo.copy_records(records)
+    await repo.upsert_hierarchy()
+    assert await repo.replace_facts(1, [1], date(2025, 1, 22), END) == len(records)
+    entry = await IngestionLogRepository(session).record(
+        platform_id=1, records_fetched=len(records), status="success", duration_seconds=0
+    )
+    changed = await repo.record_changed_cells(entry.log_id)
+    await session.commit()
+    return changed
+
+
+async def _watermark(session: AsyncSession):
+    return await ChangeTrackingRepository(session).get_watermark(DEFAULT_MODEL_NAME, DEFAULT_MODEL_VERSION)
+
+
+async def test_failed_first_fit_leaves_no_watermark(session: AsyncSession, monkeypatch: pytest.MonkeyPatch) -> None:
+    await seed_attribution_inputs(session, START, END)
+    await _log_sync(session, 1, timedelta(hours=1))
+
+    async def failing_run(*args, **kwargs):
+        raise RuntimeError("fit crashed")
+
+    monkeypatch.setattr(AttributionService, "run", failing_run)
+    with pytest.raises(RuntimeError):
+        await IncrementalAttributionService(session).refresh(START, END)
+    await session.rollback()
+    assert await _watermark(session) is None
+
+    monkeypatch.undo()
+    result = await IncrementalAttributionService(session).refresh(START, END)
+    assert result.full_refresh and result.run.rows_written == 2 * 4 * 28
+    assert (await _watermark(session)).last_log_id == 1
+
+
+async def test_recent_changes_wait_for_the_safety_lag(session: AsyncSession) -> None:
+    await seed_attribution_inputs(session, START, END)
+    await _log_sync(session, 1, timedelta(hours=1))
+    await _log_sync(session, 2, timedelta(0))
+
+    repo = ChangeTrackingRepository(session)
+    assert (await repo.current_high_water(timedelta(minutes=15)))[1] == 1
+    assert (await repo.current_high_water(timedelta(0)))[1] == 2
+    await session.rollback()
+
+    service = IncrementalAttributionService(session)
+    await service.refresh(START, END)
+    assert (await _watermark(session)).last_log_id == 1
+
+    # The in-flight sync is captured once it is older than the lag.
+    await session.execute(text("UPDATE event_ingestion_log SET sync_timestamp = now() - interval '1 hour'"))
+    await session.commit()
+    first_run, cells, _ = await service.capture_changes(DEFAULT_MODEL_NAME, DEFAULT_MODEL_VERSION)
+    assert not first_run and cells == 4
+    dmas, _ = await ChangeTrackingRepository(session).dirty_dmas(
+        DEFAULT_MODEL_NAME, DEFAULT_MODEL_VERSION, 20250101, 20250128
+    )
+    assert dmas == [1, 2, 3, 4]
+    assert (await _watermark(session)).last_log_id == 2
+
+
+async def test_unchanged_resync_marks_nothing_dirty(session: AsyncSession, monkeypatch: pytest.MonkeyPatch) -> None:
+    await seed_attribution_inputs(session, START, END)
+    monkeypatch.setattr(get_settings(), "ATTRIBUTION_CHANGE_LAG_SECONDS", 0)
+    service = IncrementalAttributionService(session)
+    assert (await service.refresh(START, END)).full_refresh
+
+    # The whole week is rewritten, but every cell comes back as it was.
+    assert await _resync(session) == 0
+    result = await service.refresh(START, END)
+    assert result.cells_captured == 0 and result.run is None
+
+    assert await _resync(session, restate_dma=3) == 1
+    result = await service.refresh(START, END)
+    assert result.cells_captured == 1 and result.dmas_recomputed == [3]
+    assert result.run.rows_written == 2 * 28
+
+
+async def test_refresh_skips_cells_outside_its_window(session: AsyncSession) -> None:
+    await seed_attribution_inputs(session, START, END)
+    await IncrementalAttributionService(session).refresh(START, END)
+    await _log_sync(session, 1, timedelta(hours=1))
+
+    # The logged change is dated 2025-01-10.
+    result = await IncrementalAttributionService(session).refresh(date(2025, 1, 11), END)
+    assert result.cells_captured == 4 and result.run is None
+    dmas, last_change_id = await ChangeTrackingRepository(session).dirty_dmas(
+        DEFAULT_MODEL_NAME, DEFAULT_MODEL_VERSION, 20250101, 20250128
+    )
+    assert dmas == [] and last_change_id is None
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.metric_availability import LEVEL_DMA, MetricAvailabilityCache
+
+
+async def test_matrix_reloads_only_when_its_tables_change(session: AsyncSession) -> None:
+    await session.execute(text("INSERT INTO dim_platform (name) VALUES ('meta')"))
+    await session.execute(
+        text(
+            "INSERT INTO metric_availability (platform_id, location_level, metric_name, is_available)"
+            " VALUES (1, 'dma', 'spend', true), (1, 'dma', 'reach', false)"
+        )
+    )
+    await session.commit()
+    cache = MetricAvailabilityCache(check_interval=0)
+
+    matrix = await cache.refresh(session)
+    assert matrix.platform_ids == (1,)
+    assert matrix.reported_metrics(LEVEL_DMA, ["spend", "reach"]) == ("spend",)
+    assert await cache.refresh(session) is matrix
+
+    await session.execute(text("UPDATE metric_availability SET is_available = true WHERE metric_name = 'reach'"))
+    await session.commit()
+    matrix = await cache.refresh(session)
+    assert matrix.reported_metrics(LEVEL_DMA, ["spend", "reach"]) == ("spend", "reach")
+
+    await session.execute(text("INSERT INTO dim_platform (name) VALUES ('google')"))
+    await session.commit()
+    assert (await cache.refresh(session)).platform_ids == (1, 2)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import get_settings
+from app.core.metrics import instrument_engine, record_ingestion
+from app.db.session import _create_engine
+from app.repositories.dashboard import DashboardRepository
+from app.repositories.export import ExportRepository
+from app.schemas.export import ExportDataset
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def test_metrics_endpoint_reports_routes_pools_and_ingestion(api_client: httpx.AsyncClient) -> None:
+    record_ingestion("test_source", 120, 3.0)
+    assert (await api_client.get("/api/v1/dashboard/reports")).status_code == 200
+
+    response = await api_client.get("/metrics")
+
+    assert response.status_code == 200
+    body = response.text
+    assert 'handler="/api/v1/dashboard/reports"' in body
+    assert 'handler="/metrics"' not in body
+    for engine in ("primary", "read"):
+        assert f'db_pool_checked_out{{engine="{engine}"}}' in body
+        assert f'db_pool_size{{engine="{engine}"}}' in body
+    assert 'ingest_records_total{source="test_source"} 120.0' in body
+    assert 'ingest_seconds_total{source="test_source"} 3.0' in body
+
+
+async def test_statements_are_labelled_with_their_repository_method(engine: AsyncEngine, session: AsyncSession) -> None:
+    instrument_engine(engine, "test")
+    labels = {"engine": "test", "repository": "DashboardRepository", "method": "latest_sync_marker"}
+    before = _sample("db_query_seconds_count", **labels)
+
+    await DashboardRepository(session).latest_sync_marker()
+    assert _sample("db_query_seconds_count", **labels) == before + 1
+
+    # Streams are labelled while they fetch, and statements outside repositories are not.
+    stream_labels = {**labels, "repository": "ExportRepository", "method": "stream_batches"}
+    unscoped = {**labels, "repository": "none", "method": "none"}
+    streamed = _sample("db_query_seconds_count", **stream_labels)
+    outside = _sample("db_query_seconds_count", **unscoped)
+    batches = ExportRepository(session).stream_batches(
+        ExportDataset.marketing_daily, date(2025, 1, 1), date(2025, 1, 1), batch_size=10
+    )
+    async for _ in batches:
+        pass
+    await session.execute(text("SELECT 1"))
+    assert _sample("db_query_seconds_count", **stream_labels) > streamed
+    assert _sample("db_query_seconds_count", **unscoped) == outside + 1
+
+
+async def test_pool_gauges_and_checkout_wait(database_url: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "DB_POOL_TIMEOUT_SECONDS", 5.0)
+    engine = _create_engine(
+        get_settings(), database_url, role="metrics-test", pool_size=1, max_overflow=0, statement_timeout_ms=None
+    )
+    waited = _sample("db_pool_wait_seconds_sum", engine="metrics-test")
+    try:
+        async with engine.connect():
+            assert _sample("db_pool_checked_out", engine="metrics-test") == 1
+
+            async def second() -> None:
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+
+            # The second checkout waits for the only pooled connection.
+            waiter = asyncio.create_task(second())
+            await asyncio.sleep(0.2)
+        await waiter
+        assert _sample("db_pool_checked_out", engine="metrics-test") == 0
+        assert _sample("db_pool_wait_seconds_sum", engine="metrics-test") - waited >= 0.1
+    finally:
+        await engine.dispose()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.partitions import ensure_date_dimension, list_partitions, maintain_fact_partitions
+from tests.conftest import seed_dates
+
+
+async def _seed_marketing_dims(session: AsyncSession) -> None:
+    for statement in (
+        "INSERT INTO dim_platform (name) VALUES ('meta')",
+        "INSERT INTO dim_account (platform_id, external_account_id) VALUES (1, 'act')",
+        "INSERT INTO dim_campaign (account_id, external_campaign_id) VALUES (1, 'c')",
+        "INSERT INTO dim_adset_or_adgroup (campaign_id, external_adset_id) VALUES (1, 's')",
+        "INSERT INTO dim_ad (adset_id, external_ad_id) VALUES (1, 'a')",
+    ):
+        await session.execute(text(statement))
+
+
+async def test_date_dimension_uses_yyyymmdd_keys(session: AsyncSession) -> None:
+    assert await ensure_date_dimension(session, date(2024, 2, 27), date(2024, 3, 1)) == 4
+    assert await ensure_date_dimension(session, date(2024, 2, 27), date(2024, 3, 1)) == 0
+    rows = (await session.execute(text("SELECT date_id, month, year FROM dim_date ORDER BY date_id"))).all()
+    assert [tuple(row) for row in rows] == [
+        (20240227, 2, 2024),
+        (20240228, 2, 2024),
+        (20240229, 2, 2024),
+        (20240301, 3, 2024),
+    ]
+
+    with pytest.raises(IntegrityError):
+        await session.execute(text("INSERT INTO dim_date (date_id, date_actual) VALUES (17, '2024-03-02')"))
+
+
+async def test_unpartitioned_month_lands_in_default_until_maintenance(session: AsyncSession) -> None:
+    await seed_dates(session, date(2023, 5, 30), date(2023, 6, 2))
+    await _seed_marketing_dims(session)
+    await session.execute(
+        text(
+            "INSERT INTO fact_marketing_daily (platform_id, account_id, campaign_id, adset_id, ad_id, date_id, spend)"
+            " SELECT 1, 1, 1, 1, 1, date_id, 1 FROM dim_date"
+        )
+    )
+    placed = await session.execute(
+        text("SELECT DISTINCT tableoid::regclass::text FROM fact_marketing_daily")
+    )
+    assert set(placed.scalars()) == {"fact_marketing_daily_default"}
+
+    report = await maintain_fact_partitions(
+        session, months_ahead=1, retain_months=12, today=date(2023, 6, 15)
+    )
+
+    assert report["fact_marketing_daily"]["created"] == [
+        "fact_marketing_daily_p202305",
+        "fact_marketing_daily_p202306",
+        "fact_marketing_daily_p202307",
+    ]
+    placed = await session.execute(
+        text(
+            "SELECT tableoid::regclass::text, count(*) FROM fact_marketing_daily"
+            " GROUP BY 1 ORDER BY 1"
+        )
+    )
+    assert [tuple(row) for row in placed] == [
+        ("fact_marketing_daily_p202305", 2),
+        ("fact_marketing_daily_p202306", 2),
+    ]
+    # The moved rows keep their indexes and constraints through the attach.
+    assert (await session.execute(text("SELECT count(*) FROM fact_marketing_daily WHERE date_id = 20230601"))).scalar_one() == 1
+
+
+async def test_maintenance_extends_dates_and_expires_old_partitions(session: AsyncSession) -> None:
+    await maintain_fact_partitions(session, months_ahead=2, retain_months=3, today=date(2022, 1, 10))
+    await maintain_fact_partitions(session, months_ahead=2, retain_months=3, today=date(2022, 6, 10))
+
+    months = [(year, month) for year, month, _ in await list_partitions(session, "fact_shopify_daily")]
+    assert months == [(2022, 3), (2022, 6), (2022, 7), (2022, 8)]
+    bounds = (await session.execute(text("SELECT min(date_id), max(date_id) FROM dim_date"))).one()
+    assert tuple(bounds) == (20211001, 20220831)
+
+
+async def test_expiry_prunes_rollups_of_expired_months(session: AsyncSession) -> None:
+    rollup = (
+        "INSERT INTO {table} (period_start_id, period_end_id, platform_id, campaign_id, spend)"
+        " SELECT start_id, end_id, 1, 1, 1 FROM (VALUES {periods}) p (start_id, end_id)"
+    )
+    for statement in (
+        rollup.format(
+            table="agg_marketing_weekly",
+            # The week of the 2022-03-01 cutoff straddles it.
+            periods="(20220221, 20220227), (20220228, 20220306), (20220307, 20220313)",
+        ),
+        rollup.format(table="agg_marketing_monthly", periods="(20220201, 20220228), (20220301, 20220331)"),
+        "INSERT INTO rollup_coverage (grain, start_date_id, end_date_id)"
+        " VALUES ('weekly', 20220103, 20220612), ('monthly', 20211201, 20220131)",
+    ):
+        await session.execute(text(statement))
+    await session.commit()
+
+    await maintain_fact_partitions(session, months_ahead=0, retain_months=3, today=date(2022, 6, 10))
+
+    for table, kept in (("agg_marketing_weekly", [20220307]), ("agg_marketing_monthly", [20220301])):
+        periods = await session.execute(text(f"SELECT period_start_id FROM {table} ORDER BY 1"))
+        assert list(periods.scalars()) == kept
+    coverage = await session.execute(text("SELECT grain, start_date_id, end_date_id FROM rollup_coverage"))
+    assert [tuple(row) for row in coverage] == [("weekly", 20220301, 20220612)]
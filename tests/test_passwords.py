@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Iterator
+
+import httpx
+import pytest
+from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core import security
+from app.core.config import get_settings
+from app.models.user import User
+
+EMAIL = "owner@example.com"
+
+
+def _rounds(hashed_password: str) -> int:
+    # Modular crypt format: $2b$<rounds>$<salt and digest>
+    return int(hashed_password.split("$")[2])
+
+
+@pytest.fixture
+def hash_workers(monkeypatch: pytest.MonkeyPatch) -> Iterator[int]:
+    """A fresh hashing pool sized from the settings, shut down afterwards."""
+
+    monkeypatch.setattr(get_settings(), "PASSWORD_HASH_WORKERS", 2)
+    security._hash_executor.cache_clear()
+    yield 2
+    security._hash_executor().shutdown()
+    security._hash_executor.cache_clear()
+
+
+async def test_hashing_runs_on_the_bounded_pool(hash_workers: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    lock = threading.Lock()
+    running = peak = 0
+
+    def slow_hash(password: str) -> str:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return threading.current_thread().name
+
+    monkeypatch.setattr(security, "get_password_hash", slow_hash)
+
+    threads = await asyncio.gather(*(security.get_password_hash_async("secret") for _ in range(6)))
+
+    assert peak == hash_workers
+    assert all(name.startswith("password-hash") for name in threads)
+
+
+async def test_new_hashes_use_the_configured_rounds() -> None:
+    hashed = await security.get_password_hash_async("secret")
+
+    assert _rounds(hashed) == get_settings().BCRYPT_ROUNDS
+    assert await security.verify_password_async("secret", hashed)
+    assert not await security.verify_password_async("wrong", hashed)
+    # A hash at the current cost is not replaced.
+    assert await security.verify_and_update_password_async("secret", hashed) == (True, None)
+
+
+async def test_login_upgrades_an_outdated_hash(
+    api_client: httpx.AsyncClient, session: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    outdated = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("secret")
+    session.add(User(email=EMAIL, hashed_password=outdated))
+    await session.commit()
+
+    async def stored_hash() -> str:
+        async with session_factory() as fresh:
+            return (await fresh.get(User, 1)).hashed_password
+
+    # A failed login leaves the hash alone.
+    response = await api_client.post("/api/v1/auth/login", json={"email": EMAIL, "password": "wrong"})
+    assert response.status_code == 401
+    assert await stored_hash() == outdated
+
+    response = await api_client.post("/api/v1/auth/login", json={"email": EMAIL, "password": "secret"})
+    assert response.status_code == 200
+    upgraded = await stored_hash()
+    assert _rounds(upgraded) == get_settings().BCRYPT_ROUNDS
+    assert security.verify_password("secret", upgraded)
+
+    # The upgraded hash is kept on later logins.
+    response = await api_client.post("/api/v1/auth/login", json={"email": EMAIL, "password": "secret"})
+    assert response.status_code == 200
+    assert await stored_hash() == upgraded
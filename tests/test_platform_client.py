@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import PlatformApiSettings, get_settings
+from app.core.http import close_http_client, get_http_client
+from app.core.rate_limit import TokenBucket, get_token_bucket
+from app.services.platform_client import PlatformApiError, PlatformClient
+from app.services.platform_sync_service import PlatformSyncService
+from tests.conftest import seed_dates
+
+CONFIG = PlatformApiSettings(base_url="https://ads.test/v1", access_token="token", page_size=2)
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "SYNC_BACKOFF_SECONDS", 0.001)
+    monkeypatch.setattr(get_settings(), "SYNC_MAX_RETRIES", 2)
+
+
+def _client(handler, bucket: TokenBucket | None = None) -> PlatformClient:
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return PlatformClient("meta", http, CONFIG, bucket or TokenBucket(1000, 10))
+
+
+async def test_server_errors_are_retried() -> None:
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"data": [{"id": 1}]})
+
+    assert await _client(handler).get_json("accounts/act/campaigns", {}) == {"data": [{"id": 1}]}
+    assert len(calls) == 2
+    assert calls[1].headers["Authorization"] == "Bearer token"
+
+
+async def test_throttling_drains_the_shared_bucket() -> None:
+    bucket = TokenBucket(1000, 10)
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(429, headers={"Retry-After": "0.05"}) if calls == 1 else httpx.Response(200, json={})
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await _client(handler, bucket).get_json("accounts/act/campaigns", {})
+    assert calls == 2
+    # The retry waited out Retry-After on the bucket, not a private sleep, so
+    # other streams sharing the platform's budget were held back as well.
+    assert loop.time() - started >= 0.04
+
+
+async def test_permanent_errors_and_exhausted_retries_raise() -> None:
+    with pytest.raises(PlatformApiError, match="HTTP 404"):
+        await _client(lambda request: httpx.Response(404)).get_json("accounts/act/campaigns", {})
+
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        raise httpx.ConnectError("refused", request=request)
+
+    with pytest.raises(PlatformApiError, match="refused"):
+        await _client(handler).get_json("accounts/act/campaigns", {})
+    assert calls == 3
+
+
+async def test_pagination_follows_cursors() -> None:
+    seen: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        seen.append(params)
+        cursor = int(params.get("cursor", 0))
+        paging = {"next_cursor": str(cursor + 1)} if cursor < 2 else {}
+        return httpx.Response(200, json={"data": [{"id": cursor}], "paging": paging})
+
+    pages = [page async for page in _client(handler).insights("c1", date(2025, 3, 1), date(2025, 3, 2))]
+
+    assert pages == [[{"id": 0}], [{"id": 1}], [{"id": 2}]]
+    assert [params.get("cursor") for params in seen] == [None, "1", "2"]
+    assert all(params["limit"] == "2" and params["since"] == "2025-03-01" for params in seen)
+
+
+def test_clients_and_buckets_are_scoped_to_their_loop() -> None:
+    async def shared() -> tuple[httpx.AsyncClient, TokenBucket]:
+        client = get_http_client()
+        bucket = get_token_bucket("meta", 10, 1)
+        assert get_http_client() is client and get_token_bucket("meta", 10, 1) is bucket
+        # Contending for the lock binds it to this loop.
+        await asyncio.gather(bucket.acquire(), bucket.acquire())
+        await close_http_client()
+        return client, bucket
+
+    first_client, first_bucket = asyncio.run(shared())
+    second_client, second_bucket = asyncio.run(shared())
+
+    assert first_client is not second_client and first_client.is_closed
+    assert first_bucket is not second_bucket
+
+
+async def test_sync_loads_paginated_insights(session: AsyncSession, monkeypatch: pytest.MonkeyPatch) -> None:
+    await seed_dates(session, date(2025, 3, 1), date(2025, 3, 2))
+    for statement in (
+        "INSERT INTO dim_platform (name) VALUES ('Meta')",
+        "INSERT INTO dim_dma (dma_code, dma_name) VALUES ('501', 'New York')",
+        "INSERT INTO map_platform_dma (platform_id, platform_dma_label, dma_id) VALUES (1, 'NYC', 1)",
+        "INSERT INTO dim_account (platform_id, external_account_id) VALUES (1, 'act')",
+    ):
+        await session.execute(text(statement))
+    await session.commit()
+    monkeypatch.setattr(get_settings(), "PLATFORM_APIS", {"meta": CONFIG})
+
+    throttled = False
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal throttled
+        if request.url.path.endswith("/campaigns"):
+            return httpx.Response(200, json={"data": [{"id": "c1", "name": "Spring"}]})
+        if not throttled:
+            throttled = True
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        day = "2025-03-01" if "cursor" not in request.url.params else "2025-03-02"
+        row = {"date": day, "adset_id": "s1", "ad_id": "a1", "dma": "NYC", "spend": "2.50"}
+        paging = {} if "cursor" in request.url.params else {"next_cursor": "next"}
+        return httpx.Response(200, json={"data": [row], "paging": paging})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        result = await PlatformSyncService(session, http_client=http).sync(1, date(2025, 3, 1), date(2025, 3, 2))
+
+    assert (result.accounts, result.pages, result.records_fetched, result.rows_written) == (1, 2, 2, 2)
+    rows = await session.execute(text("SELECT date_id, dma_id, spend FROM fact_marketing_daily ORDER BY date_id"))
+    assert [tuple(row) for row in rows] == [(20250301, 1, 2.5), (20250302, 1, 2.5)]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.repositories.platform_load import LOAD_COLUMNS, PlatformLoadRepository
+from tests.conftest import seed_dates
+
+
+def _record(day: date, ad: str, *, dma_label: str | None = None, country: str | None = None) -> tuple:
+    values = dict.fromkeys(LOAD_COLUMNS)
+    values.update(
+        account_id=1,
+        date_id=int(day.strftime("%Y%m%d")),
+        external_campaign_id="c",
+        external_adset_id="s",
+        external_ad_id=ad,
+        dma_label=dma_label,
+        country_iso2=country,
+        spend=1,
+    )
+    return tuple(values[column] for column in LOAD_COLUMNS)
+
+
+async def _seed(session: AsyncSession) -> None:
+    await seed_dates(session, date(2025, 3, 1), date(2025, 3, 2))
+    for statement in (
+        "INSERT INTO dim_platform (name) VALUES ('meta')",
+        "INSERT INTO dim_account (platform_id, external_account_id) VALUES (1, 'act')",
+        "INSERT INTO dim_dma (dma_code, dma_name) VALUES ('501', 'New York'), ('803', 'Los Angeles')",
+        # Neither lookup is keyed uniquely; duplicates must not multiply facts.
+        "INSERT INTO map_platform_dma (platform_id, platform_dma_label, dma_id) VALUES (1, 'NYC', 1), (1, 'NYC', 2)",
+        "INSERT INTO dim_country (iso2, country_name) VALUES ('US', 'United States'), ('us', 'USA')",
+    ):
+        await session.execute(text(statement))
+    await session.commit()
+
+
+async def test_concurrent_loads_share_one_hierarchy(
+    session: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    await _seed(session)
+    loaded = asyncio.Barrier(2)
+
+    async def load(day: date) -> int:
+        async with session_factory() as load_session:
+            repo = PlatformLoadRepository(load_session)
+            await repo.create_load_table()
+            await repo.copy_records([_record(day, "a1", dma_label="NYC", country="US"), _record(day, "a2")])
+            # Both chunks insert the same new campaign, ad set and ads at once.
+            await loaded.wait()
+            await repo.upsert_hierarchy()
+            written = await repo.replace_facts(1, [1], day, day)
+            await load_session.commit()
+            return written
+
+    assert await asyncio.gather(load(date(2025, 3, 1)), load(date(2025, 3, 2))) == [2, 2]
+
+    counts = await session.execute(
+        text(
+            "SELECT (SELECT count(*) FROM dim_campaign), (SELECT count(*) FROM dim_adset_or_adgroup),"
+            " (SELECT count(*) FROM dim_ad), (SELECT count(*) FROM fact_marketing_daily)"
+        )
+    )
+    assert tuple(counts.one()) == (1, 1, 2, 4)
+    resolved = await session.execute(
+        text("SELECT DISTINCT country_id, dma_id FROM fact_marketing_daily WHERE dma_id IS NOT NULL")
+    )
+    assert [tuple(row) for row in resolved] == [(1, 1)]
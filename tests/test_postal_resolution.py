@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.services.postal_resolution_service import PostalResolutionService
+from app.services.shopify_ingestion_service import ShopifyIngestionService
+from app.tasks.etl import _plan
+
+
+async def _seed(session: AsyncSession) -> None:
+    for statement in (
+        "INSERT INTO dim_platform (name) VALUES ('shopify')",
+        "INSERT INTO dim_account (platform_id, external_account_id) VALUES (1, 'shop')",
+        "INSERT INTO dim_country (iso2, country_name) VALUES ('US', 'United States')",
+        "INSERT INTO dim_region (country_id, region_name, iso_subdivision) VALUES (1, 'New York', 'US-NY')",
+        "INSERT INTO dim_city (region_id, city_name) VALUES (1, 'New York'), (1, 'Buffalo')",
+        "INSERT INTO map_postal_city_state (postal_code, city_name, state_code) VALUES ('10001', 'New York', 'NY')",
+    ):
+        await session.execute(text(statement))
+    await session.commit()
+
+
+async def _mapping(session: AsyncSession) -> list[tuple]:
+    rows = await session.execute(text("SELECT postal_code, city_id FROM map_postal_city_state ORDER BY id"))
+    return [tuple(row) for row in rows]
+
+
+async def test_city_ids_are_backfilled_once_per_run(
+    session: AsyncSession, database_url: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await _seed(session)
+    export = tmp_path / "1" / "orders.csv"
+    export.parent.mkdir()
+    export.write_text("day,zip,total_orders,gross_sales\n2025-03-01,10001,2,40\n")
+    monkeypatch.setattr(get_settings(), "DATABASE_URL", database_url)
+    monkeypatch.setattr(get_settings(), "SHOPIFY_EXPORT_DIR", str(tmp_path))
+
+    plan = await _plan(date(2025, 3, 2))
+    assert [Path(item.path) for item in plan.shopify_exports] == [export]
+    assert await _mapping(session) == [("10001", 1)]
+
+    # Mapping rows added after planning wait for the next run's backfill.
+    await session.execute(
+        text("INSERT INTO map_postal_city_state (postal_code, city_name, state_code) VALUES ('14201', 'Buffalo', 'NY')")
+    )
+    await session.commit()
+    result = await ShopifyIngestionService(session).ingest_file(export, platform_id=1, account_id=1)
+
+    assert result.rows_read == 1
+    assert await _mapping(session) == [("10001", 1), ("14201", None)]
+    staged = await session.execute(text("SELECT country_iso2, region_code, city_name_norm FROM stg_shopify_daily_city"))
+    assert [tuple(row) for row in staged] == [("US", "NY", "new york")]
+    postals = await session.execute(text("SELECT city_id, postal_code FROM dim_postal"))
+    assert [tuple(row) for row in postals] == [(1, "10001")]
+
+
+async def test_index_follows_mapping_changes(session: AsyncSession) -> None:
+    await _seed(session)
+    service = PostalResolutionService(session)
+    index = await service.index()
+    assert index.resolve("10001").city_id is None
+    assert await service.index() is index
+
+    await service.backfill_city_ids()
+    await session.commit()
+    rebuilt = await service.index()
+    assert rebuilt is not index and rebuilt.resolve("10001").city_id == 1
+    # A backfill that resolves nothing leaves the version, and so the index, alone.
+    await service.backfill_city_ids()
+    await session.commit()
+    assert await service.index() is rebuilt
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import get_settings
+from app.db import replica
+from app.db import session as db_session
+from app.db.replica import ReplicaLagGuard
+
+UNREACHABLE_URL = "postgresql+asyncpg://postgres@/satest?host=/nonexistent"
+
+
+class _FixedGuard:
+    """Stands in for :class:`ReplicaLagGuard`, counting how often reads are routed."""
+
+    def __init__(self, healthy: bool) -> None:
+        self._healthy = healthy
+        self.calls = 0
+
+    async def healthy(self) -> bool:
+        self.calls += 1
+        return self._healthy
+
+
+async def test_primary_counts_as_a_replica_without_lag(engine: AsyncEngine) -> None:
+    guard = ReplicaLagGuard(engine, max_lag_seconds=30, check_interval=60)
+    measured = 0
+    measure = guard._measure
+
+    async def counting_measure() -> float | None:
+        nonlocal measured
+        measured += 1
+        return await measure()
+
+    guard._measure = counting_measure
+
+    assert await guard.healthy() and await guard.healthy()
+    assert guard.lag_seconds == 0
+    # The second call reused the first measurement.
+    assert measured == 1
+
+
+@pytest.mark.parametrize(
+    ("lag_sql", "healthy"),
+    [("SELECT 12.5", True), ("SELECT 45", False), ("SELECT NULL", False)],
+    ids=["within-limit", "over-limit", "unknown"],
+)
+async def test_lag_is_compared_with_the_limit(
+    engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch, lag_sql: str, healthy: bool
+) -> None:
+    monkeypatch.setattr(replica, "_LAG_SQL", text(lag_sql))
+    guard = ReplicaLagGuard(engine, max_lag_seconds=30, check_interval=0)
+
+    assert await guard.healthy() is healthy
+
+
+async def test_unreachable_replica_counts_as_lagging() -> None:
+    unreachable = create_async_engine(UNREACHABLE_URL, poolclass=NullPool)
+    try:
+        guard = ReplicaLagGuard(unreachable, max_lag_seconds=30, check_interval=0)
+        assert not await guard.healthy()
+        assert guard.lag_seconds is None
+    finally:
+        await unreachable.dispose()
+
+
+@pytest.mark.parametrize(
+    ("guard", "target"),
+    [(None, "ReadSessionLocal"), (_FixedGuard(True), "ReadSessionLocal"), (_FixedGuard(False), "SessionLocal")],
+    ids=["no-replica", "healthy", "lagging"],
+)
+async def test_reads_fall_back_to_the_primary_while_lagging(
+    monkeypatch: pytest.MonkeyPatch, guard: _FixedGuard | None, target: str
+) -> None:
+    monkeypatch.setattr(db_session, "replica_guard", guard)
+
+    assert await db_session.read_session_factory() is getattr(db_session, target)
+
+
+async def test_stats_check_the_replica_once_per_request(
+    api_client: httpx.AsyncClient,
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from app.main import app
+
+    monkeypatch.setattr(get_settings(), "DASHBOARD_PRUNE_UNAVAILABLE_METRICS", False)
+    # Route through the real read_session_factory: a lagging replica that
+    # would fail every query, and the test database as the primary.
+    app.dependency_overrides.pop(db_session.read_session_factory)
+    guard = _FixedGuard(False)
+    unreachable = create_async_engine(UNREACHABLE_URL, poolclass=NullPool)
+    monkeypatch.setattr(db_session, "replica_guard", guard)
+    monkeypatch.setattr(db_session, "SessionLocal", session_factory)
+    monkeypatch.setattr(db_session, "ReadSessionLocal", async_sessionmaker(unreachable, class_=AsyncSession))
+    try:
+        response = await api_client.get(
+            "/api/v1/dashboard/stats", params={"start_date": "2025-03-01", "end_date": "2025-03-03"}
+        )
+    finally:
+        await unreachable.dispose()
+
+    assert response.status_code == 200
+    assert guard.calls == 1
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.cache import ResponseCache
+from app.schemas.dashboard import DashboardFilters
+from app.services.dashboard_service import DashboardService
+from tests.conftest import MemoryRedis
+
+
+class _BrokenRedis:
+    def __init__(self, error: Exception) -> None:
+        self._error = error
+
+    async def get(self, key: str):
+        raise self._error
+
+    async def set(self, key: str, value: str, ex: int | None = None):
+        raise self._error
+
+    async def incr(self, key: str):
+        raise self._error
+
+
+async def test_concurrent_misses_share_one_computation() -> None:
+    cache = ResponseCache(MemoryRedis(), ttl_seconds=60)
+    calls = 0
+
+    async def compute() -> dict:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": calls}
+
+    results = await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(5)))
+    assert results == [{"value": 1}] * 5
+    assert await cache.get_or_compute("k", compute) == {"value": 1}
+
+    await cache.invalidate()
+    assert await cache.get_or_compute("k", compute) == {"value": 2}
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        RedisConnectionError("refused"),
+        ConnectionResetError("reset by peer"),
+        TimeoutError("timed out"),
+        RuntimeError("attached to a different loop"),
+    ],
+)
+async def test_cache_failures_degrade_to_computing(error: Exception) -> None:
+    cache = ResponseCache(_BrokenRedis(error), ttl_seconds=60)
+
+    async def compute() -> dict:
+        return {"ok": True}
+
+    assert await cache.get_or_compute("k", compute) == {"ok": True}
+    await cache.invalidate()
+
+
+async def test_undecodable_entry_is_recomputed() -> None:
+    client = MemoryRedis()
+    client.data["k:g0"] = b"{not json"
+    cache = ResponseCache(client, ttl_seconds=60)
+
+    async def compute() -> dict:
+        return {"ok": True}
+
+    assert await cache.get_or_compute("k", compute) == {"ok": True}
+    assert client.data["k:g0"] == b'{"ok": true}'
+
+
+async def test_shared_stats_computation_uses_its_own_session(
+    session: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    opened: list[AsyncSession] = []
+
+    def tracking_factory() -> AsyncSession:
+        opened.append(session_factory())
+        return opened[-1]
+
+    cache = ResponseCache(MemoryRedis(), ttl_seconds=60)
+    filters = DashboardFilters(start_date=date(2025, 1, 1), end_date=date(2025, 1, 31))
+    stats = await DashboardService(session, cache, tracking_factory).get_stats(filters)
+
+    assert stats.spend == 0 and stats.platforms == []
+    assert len(opened) == 1 and opened[0] is not session
+    # A cached hit opens nothing.
+    await DashboardService(session, cache, tracking_factory).get_stats(filters)
+    assert len(opened) == 1
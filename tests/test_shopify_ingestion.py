@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.shopify_ingestion_service import ShopifyIngestionService
+from app.services.shopify_promotion_service import ShopifyPromotionService
+from tests.conftest import seed_dates
+
+
+async def _seed(session: AsyncSession) -> None:
+    await seed_dates(session, date(2025, 3, 1), date(2025, 3, 2))
+    for statement in (
+        "INSERT INTO dim_platform (name) VALUES ('shopify')",
+        "INSERT INTO dim_account (platform_id, external_account_id) VALUES (1, 'shop')",
+        "INSERT INTO dim_country (iso2, country_name) VALUES ('US', 'United States')",
+        "INSERT INTO dim_region (country_id, region_name, iso_subdivision) VALUES (1, 'New York', 'US-NY')",
+        "INSERT INTO dim_city (region_id, city_name) VALUES (1, 'New York'), (1, 'Buffalo')",
+        "INSERT INTO map_postal_city_state (postal_code, city_name, state_code) VALUES ('10001', 'New York', 'NY')",
+    ):
+        await session.execute(text(statement))
+    await session.commit()
+
+
+def _write(path: Path, rows: list) -> Path:
+    path.write_text("\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows) + "\n")
+    return path
+
+
+async def _staged(session: AsyncSession) -> list[tuple]:
+    rows = await session.execute(
+        text(
+            "SELECT date_id, region_code, city_name_norm, orders, gross_sales, refunds"
+            " FROM stg_shopify_daily_city ORDER BY date_id, city_name_norm"
+        )
+    )
+    return [tuple(row) for row in rows]
+
+
+def _ingest(session: AsyncSession, path: Path, chunk_size: int = 2):
+    return ShopifyIngestionService(session, chunk_size=chunk_size).ingest_file(path, platform_id=1, account_id=1)
+
+
+async def test_invalid_rows_are_skipped_and_counted(session: AsyncSession, tmp_path: Path) -> None:
+    await _seed(session)
+    export = _write(
+        tmp_path / "orders.ndjson",
+        [
+            {"day": "2025-03-01", "country_code": "US", "region": "ny", "city": " Buffalo ", "total_orders": 2},
+            # Null geography is filled from the postal code, not staged as "NONE".
+            {"day": "2025-03-01", "country_code": None, "region": "", "city": None, "zip": "10001", "gross_sales": 40},
+            {"day": "2025-03-02", "country_code": "US", "city": "Buffalo"},
+            {"day": "2025-03-02", "country_code": "US", "region": "NY", "city": "Buffalo", "total_orders": "n/a"},
+            {"day": "someday", "country_code": "US", "region": "NY", "city": "Buffalo"},
+            "{not json",
+            {"day": "2025-03-02", "country_code": "US", "region": "NY", "city": "Buffalo", "gross_sales": None},
+        ],
+    )
+
+    result = await _ingest(session, export)
+
+    assert (result.rows_read, result.rows_skipped, result.rows_merged) == (3, 4, 3)
+    assert await _staged(session) == [
+        (date(2025, 3, 1), "NY", "buffalo", 2, None, None),
+        (date(2025, 3, 1), "NY", "new york", None, 40, None),
+        (date(2025, 3, 2), "NY", "buffalo", None, None, None),
+    ]
+
+
+async def test_merge_only_rewrites_changed_rows(session: AsyncSession, tmp_path: Path) -> None:
+    await _seed(session)
+    header = "day,country_code,region,city,total_orders,gross_sales\n"
+    export = tmp_path / "orders.csv"
+    # Within one file the last occurrence of a key wins.
+    export.write_text(
+        header + "2025-03-01,US,NY,Buffalo,1,10\n2025-03-01,US,NY,New York,3,30\n2025-03-01,US,NY,buffalo,2,20\n"
+    )
+    assert (await _ingest(session, export)).rows_merged == 2
+    stamps = dict(
+        (await session.execute(text("SELECT city_name_norm, _ingested_at FROM stg_shopify_daily_city"))).all()
+    )
+    assert (await _staged(session))[0][3:5] == (2, 20)
+
+    # Unchanged rows keep their _ingested_at; only the restated one moves.
+    export.write_text(header + "2025-03-01,US,NY,Buffalo,2,20\n2025-03-01,US,NY,New York,4,40\n")
+    assert (await _ingest(session, export)).rows_merged == 1
+    restamped = dict(
+        (await session.execute(text("SELECT city_name_norm, _ingested_at FROM stg_shopify_daily_city"))).all()
+    )
+    assert restamped["buffalo"] == stamps["buffalo"] and restamped["new york"] > stamps["new york"]
+
+
+async def test_promotion_aggregates_resolved_rows(session: AsyncSession, tmp_path: Path) -> None:
+    await _seed(session)
+    export = tmp_path / "orders.csv"
+    export.write_text(
+        "day,country_code,region,city,total_orders,gross_sales,refunds\n"
+        "2025-03-01,US,NY,Buffalo,2.6,50,5\n"
+        "2025-03-02,US,NY,New York,1,10,\n"
+        "2025-03-02,US,NY,Atlantis,9,90,0\n"
+    )
+    await _ingest(session, export)
+
+    results = await ShopifyPromotionService(session).promote(date(2025, 3, 1), date(2025, 3, 2), batch_days=1)
+
+    # Atlantis resolves to its country and region but no city.
+    assert [(r.start_date.day, r.rows_resolved, r.postals_created, r.facts_upserted) for r in results] == [
+        (1, 1, 1, 1),
+        (2, 2, 1, 1),
+    ]
+    facts = await session.execute(
+        text(
+            "SELECT f.date_id, c.city_name, p.postal_code, f.orders, f.revenue FROM fact_shopify_daily f"
+            " JOIN dim_city c USING (city_id) JOIN dim_postal p USING (postal_id) ORDER BY f.date_id"
+        )
+    )
+    # The unknown city stays in staging, unpromoted.
+    assert [tuple(row) for row in facts] == [(20250301, "Buffalo", "*", 3, 45), (20250302, "New York", "*", 1, 10)]
+    unresolved = await session.execute(text("SELECT city_name_norm FROM stg_shopify_daily_city WHERE city_id IS NULL"))
+    assert unresolved.scalars().all() == ["atlantis"]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from datetime import date
+
+import httpx
+import pytest
+import respx
+from celery.contrib.testing.worker import start_worker
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import ResponseCache, get_response_cache
+from app.core.config import PlatformApiSettings, get_settings
+from app.core.http import get_http_client
+from app.core.rate_limit import TokenBucket, get_token_bucket
+from app.repositories.dimension_cache import get_dimension_cache
+from app.tasks.celery_app import celery_app, run_async
+from app.tasks.etl import refresh_rollups, sync_platform_chunk
+from tests.conftest import seed_dates
+
+BASE_URL = "https://ads.test/v1"
+
+
+@pytest.fixture
+def worker(database_url: str, monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """An in-process worker consuming the in-memory broker configured in conftest."""
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, "DATABASE_URL", database_url)
+    monkeypatch.setattr(settings, "DATABASE_READ_URL", None)
+    # Nothing listens here: every task gets its own Redis client, fails to
+    # reach it and degrades rather than failing after its commits.
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://127.0.0.1:1/0")
+    monkeypatch.setattr(settings, "PLATFORM_APIS", {"meta": PlatformApiSettings(base_url=BASE_URL, burst=1)})
+    with start_worker(celery_app, pool="solo", perform_ping_check=False, shutdown_timeout=30):
+        yield
+
+
+def test_each_run_gets_and_closes_its_own_clients() -> None:
+    async def body() -> tuple[httpx.AsyncClient, TokenBucket, ResponseCache]:
+        client = get_http_client()
+        bucket = get_token_bucket("meta", 50, 1)
+        cache = await get_response_cache()
+        # Contention binds the bucket's and the dimension cache's locks to this loop.
+        await asyncio.gather(bucket.acquire(), bucket.acquire())
+        dimensions = get_dimension_cache()
+        async with dimensions._locks.get():
+            await asyncio.sleep(0)
+        return client, bucket, cache
+
+    first = run_async(body())
+    second = run_async(body())
+
+    assert all(a is not b for a, b in zip(first, second))
+    assert first[0].is_closed and second[0].is_closed
+
+
+async def _seed(session: AsyncSession) -> None:
+    await seed_dates(session, date(2025, 3, 1), date(2025, 3, 31))
+    for statement in (
+        "INSERT INTO dim_platform (name) VALUES ('Meta')",
+        "INSERT INTO dim_dma (dma_code, dma_name) VALUES ('501', 'New York')",
+        "INSERT INTO map_platform_dma (platform_id, platform_dma_label, dma_id) VALUES (1, 'NYC', 1)",
+        "INSERT INTO dim_account (platform_id, external_account_id) VALUES (1, 'act')",
+    ):
+        await session.execute(text(statement))
+    await session.commit()
+
+
+def _insights(request: httpx.Request) -> httpx.Response:
+    row = {"date": request.url.params["since"], "adset_id": "s1", "ad_id": "a1", "dma": "NYC", "spend": "4"}
+    return httpx.Response(200, json={"data": [row]})
+
+
+async def test_etl_tasks_run_back_to_back_in_one_worker(session: AsyncSession, worker: None) -> None:
+    await _seed(session)
+
+    with respx.mock(base_url=BASE_URL, assert_all_called=True) as api:
+        api.get("/accounts/act/campaigns").respond(json={"data": [{"id": "c1", "name": "Spring"}]})
+        api.get("/campaigns/c1/insights").mock(side_effect=_insights)
+        # Each task runs under a fresh event loop in the same worker process.
+        for day in ("2025-03-01", "2025-03-02"):
+            result = sync_platform_chunk.delay("run-1", 1, day, day)
+            assert await asyncio.to_thread(result.get, timeout=30) == 1
+
+    result = refresh_rollups.delay("run-1", "2025-03-01", "2025-03-02")
+    assert await asyncio.to_thread(result.get, timeout=30) > 0
+
+    rows = await session.execute(text("SELECT date_id, dma_id, spend FROM fact_marketing_daily ORDER BY date_id"))
+    assert [tuple(row) for row in rows] == [(20250301, 1, 4), (20250302, 1, 4)]
+    steps = await session.execute(
+        text("SELECT step, status FROM event_ingestion_log WHERE run_id = 'run-1' ORDER BY log_id")
+    )
+    assert [tuple(row) for row in steps] == [
+        ("platform_sync", "success"),
+        ("platform_sync", "success"),
+        ("refresh_rollups", "success"),
+    ]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+from jose import JWTError
+
+from app.core import security
+from app.core.security import TokenClaimsCache, create_access_token, decode_access_token
+
+
+@pytest.fixture
+def verifications(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Tokens whose signatures were checked, with an empty cache to start from."""
+
+    monkeypatch.setattr(security, "_claims_cache", TokenClaimsCache(max_size=2))
+    checked: list[str] = []
+    decode = security.jwt.decode
+
+    def counting_decode(token: str, *args, **kwargs):
+        checked.append(token)
+        return decode(token, *args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    return checked
+
+
+def test_repeated_tokens_skip_verification(verifications: list[str]) -> None:
+    token, _ = create_access_token("1", {"email": "user@example.com"})
+
+    claims = decode_access_token(token)
+    assert decode_access_token(token) is claims
+    assert claims["sub"] == "1" and claims["email"] == "user@example.com"
+    assert verifications == [token]
+
+
+def test_invalid_tokens_are_not_cached(verifications: list[str]) -> None:
+    token, _ = create_access_token("1")
+    tampered = token[:-2] + ("AA" if not token.endswith("AA") else "BB")
+
+    for _ in range(2):
+        with pytest.raises(JWTError):
+            decode_access_token(tampered)
+    assert verifications == [tampered, tampered]
+
+
+def test_entries_are_not_served_past_the_token_expiry(
+    verifications: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    token, expires_in = create_access_token("1")
+    decode_access_token(token)
+
+    now = time.time()
+    monkeypatch.setattr(security.time, "time", lambda: now + expires_in + 1)
+    assert security._claims_cache.get(token) is None
+    # The stale entry is gone, so the token goes back through full verification.
+    decode_access_token(token)
+    assert verifications == [token, token]
+
+
+def test_least_recently_used_entries_are_evicted() -> None:
+    cache = TokenClaimsCache(max_size=2)
+    exp = time.time() + 60
+    for token in ("a", "b"):
+        cache.put(token, {"sub": token, "exp": exp})
+
+    assert cache.get("a") is not None
+    cache.put("c", {"sub": "c", "exp": exp})
+
+    assert cache.get("b") is None
+    assert [cache.get(token)["sub"] for token in ("a", "c")] == ["a", "c"]